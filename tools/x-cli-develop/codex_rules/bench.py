@@ -0,0 +1,402 @@
+"""Synthetic workloads and a scaling benchmark for the codex rules engine.
+
+``generate_workload`` builds a reproducible history of pull requests over a
+set of components and tests.  A number of planted component/test pairs fail
+with a controlled probability when their component is touched, while every
+test also fails at a low background rate, so the association analysis has
+both true signal and noise to sift through.
+
+``run_benchmark`` replays a workload through the same CLI entry points used
+in CI (``record_pr``, ``ingest_tests``, ``analyze`` and ``prune``) against
+each storage backend and times every phase.  Workloads are deterministic for
+a given seed, so reports written by two versions can be compared with
+``compare_reports`` to flag regressions.  ``mapping_benchmark`` times the
+compiled component matcher against a per-glob ``fnmatch`` scan on the same
+paths; its figures go into the report too::
+
+    python -m codex_rules.bench --size 500:20:100 --out bench.json
+    python -m codex_rules.bench --baseline bench.json --out new.json
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import io
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, Type
+
+from .cli import analyze, ingest_tests, prune, record_pr
+from .mapping import ComponentMapping
+from .storage import InMemoryStorage, Storage, StorageProtocol
+
+REPORT_VERSION = 1
+# (PRs, components, tests) for the default benchmark sizes.
+DEFAULT_SIZES: Tuple[Tuple[int, int, int], ...] = (
+    (100, 10, 50),
+    (500, 20, 100),
+    (2000, 40, 200),
+)
+BACKENDS: Dict[str, Type[StorageProtocol]] = {
+    "Storage": Storage,
+    "InMemoryStorage": InMemoryStorage,
+}
+PHASES = ("record_pr", "ingest_tests", "analyze", "prune")
+# Thresholds loose enough for planted pairs to surface at small sizes.
+BENCH_CONFIG = {
+    "min_occurrences": 3,
+    "min_confidence": 0.25,
+    "min_lift": 2.0,
+    "alpha": 0.01,
+    "flaky_threshold": 0.5,
+    "min_lift_for_flaky": 3.0,
+    "window_days": 30,
+}
+
+
+def generate_workload(
+    prs: int,
+    components: int,
+    tests: int,
+    *,
+    planted: int | None = None,
+    correlation: float = 0.8,
+    noise: float = 0.01,
+    max_components_per_pr: int = 3,
+    seed: int = 0,
+) -> Dict:
+    """Return a synthetic PR history with controlled failure correlations.
+
+    The first ``planted`` components (default: a quarter of them, at least
+    one) are each paired with a test that fails with probability
+    ``correlation`` whenever a PR touches that component.  Every test also
+    fails with probability ``noise`` regardless of the files touched.  Each
+    PR touches between one and ``max_components_per_pr`` components and runs
+    every test once.  Test ``i`` lives under component ``i mod components``
+    (which is where its failures are attributed), so planted test ``i``
+    belongs to planted component ``i``.
+    """
+    if prs < 1 or components < 1 or tests < 1:
+        raise ValueError("prs, components and tests must be positive")
+    rng = random.Random(seed)
+    if planted is None:
+        planted = max(1, components // 4)
+    planted = min(planted, components, tests)
+    comp_names = [f"comp{i:03d}" for i in range(components)]
+    test_ids = [f"tests/test_{i:04d}.py::test_case" for i in range(tests)]
+    test_files = {
+        t: f"src/{comp_names[i % components]}/tests/test_{i:04d}.py"
+        for i, t in enumerate(test_ids)
+    }
+    pairs = {comp_names[i]: test_ids[i] for i in range(planted)}
+    history: List[Dict] = []
+    for pr_id in range(1, prs + 1):
+        k = rng.randint(1, min(max_components_per_pr, components))
+        touched = rng.sample(comp_names, k)
+        files = [
+            {"path": f"src/{comp}/module_{rng.randrange(5)}.py", "status": "modified"}
+            for comp in touched
+        ]
+        failing = {t for t in test_ids if rng.random() < noise}
+        for comp in touched:
+            if comp in pairs and rng.random() < correlation:
+                failing.add(pairs[comp])
+        results = [
+            {
+                "test_id": test_id,
+                "suite": "synthetic",
+                "status": "failed" if test_id in failing else "passed",
+                "duration_ms": rng.randint(1, 50),
+                "file": test_files[test_id],
+            }
+            for test_id in test_ids
+        ]
+        history.append({"pr_id": pr_id, "files": files, "results": results})
+    return {
+        "components": {name: {"globs": [f"src/{name}/**"]} for name in comp_names},
+        "planted_pairs": sorted(pairs.items()),
+        "prs": history,
+    }
+
+
+def _timed(fn: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000.0
+
+
+def _run_backend(
+    backend: str, workload: Dict, workdir: Path
+) -> Dict[str, float | int]:
+    """Replay *workload* through the CLI handlers and time each phase."""
+    storage_cls = BACKENDS[backend]
+    storage = storage_cls(str(workdir / f"{backend}.db"))
+    mapping_file = workdir / "components.json"
+    if not mapping_file.exists():
+        mapping_file.write_text(
+            json.dumps({"components": workload["components"]}), encoding="utf-8"
+        )
+    mapping = ComponentMapping(mapping_file)
+    config = dict(BENCH_CONFIG, templates_file=str(workdir / "templates.json"))
+    (workdir / "templates.json").write_text("{}", encoding="utf-8")
+
+    # Inputs are written up front so file I/O is not charged to the phases.
+    inputs: List[Tuple[argparse.Namespace, argparse.Namespace]] = []
+    for pr in workload["prs"]:
+        files_json = workdir / f"pr{pr['pr_id']}-files.json"
+        results_json = workdir / f"pr{pr['pr_id']}-results.json"
+        if not files_json.exists():
+            files_json.write_text(json.dumps(pr["files"]), encoding="utf-8")
+            results_json.write_text(json.dumps(pr["results"]), encoding="utf-8")
+        inputs.append(
+            (
+                argparse.Namespace(
+                    pr_id=pr["pr_id"],
+                    files_json=str(files_json),
+                    labels="",
+                    branch="bench",
+                    base="main",
+                ),
+                argparse.Namespace(
+                    pr_id=pr["pr_id"],
+                    run_id=f"bench-{pr['pr_id']}",
+                    commit="",
+                    path=str(results_json),
+                    format="custom",
+                    jobs=1,
+                ),
+            )
+        )
+
+    def do_record() -> None:
+        for rec_args, _ in inputs:
+            record_pr(rec_args, storage, mapping)
+
+    def do_ingest() -> None:
+        for _, inj_args in inputs:
+            ingest_tests(inj_args, storage, mapping)
+
+    def do_analyze() -> None:
+        analyze(argparse.Namespace(), storage, config)
+
+    def do_prune() -> None:
+        with redirect_stdout(io.StringIO()):
+            prune(argparse.Namespace(window_days=None, last_n=None), storage, config)
+
+    timings = {
+        "record_pr": _timed(do_record),
+        "ingest_tests": _timed(do_ingest),
+        "analyze": _timed(do_analyze),
+        "prune": _timed(do_prune),
+    }
+    result: Dict[str, float | int] = {
+        f"{phase}_ms": round(timings[phase], 3) for phase in PHASES
+    }
+    result["guidance_rules"] = len(storage.get_active_guidance())
+    close = getattr(storage, "close", None)
+    if close:
+        close()
+    return result
+
+
+def _fnmatch_component(components: Dict[str, Dict], path: str) -> str:
+    """Resolve *path* the way ``ComponentMapping`` did before it compiled its globs."""
+    norm = path.replace("\\", "/")
+    for comp, spec in components.items():
+        for pat in spec.get("globs", []):
+            if fnmatch.fnmatch(norm, pat):
+                return comp
+    return "unknown"
+
+
+def mapping_benchmark(components: int = 60, paths: int = 2500) -> Dict[str, float | int]:
+    """Time ``ComponentMapping.component_for_path`` against an ``fnmatch`` scan.
+
+    Every path is distinct, so the matcher's lookup cache never hits and the
+    compiled pattern itself is measured.
+    """
+    specs = {
+        f"comp{i}": {"globs": [f"src/comp{i}/**", f"lib/comp{i}/*.py", f"tests/*comp{i}_*.py"]}
+        for i in range(components)
+    }
+    specs["vendor"] = {"globs": ["src/*/vendor/**", "third_party/**"]}
+    names = [f"src/comp{i % components}/vendor/file{i}.c" for i in range(paths)]
+    with tempfile.TemporaryDirectory(prefix="codex-bench-") as tmp:
+        mapping_file = Path(tmp) / "components.json"
+        mapping_file.write_text(json.dumps({"components": specs}), encoding="utf-8")
+        mapping = ComponentMapping(mapping_file)
+    fnmatch_ms = _timed(lambda: [_fnmatch_component(specs, p) for p in names])
+    compiled_ms = _timed(lambda: [mapping.component_for_path(p) for p in names])
+    return {
+        "components": len(specs),
+        "paths": paths,
+        "fnmatch_ms": round(fnmatch_ms, 3),
+        "compiled_ms": round(compiled_ms, 3),
+    }
+
+
+def run_benchmark(
+    sizes: Sequence[Tuple[int, int, int]] = DEFAULT_SIZES,
+    backends: Iterable[str] = tuple(BACKENDS),
+    *,
+    seed: int = 0,
+) -> Dict:
+    """Return a benchmark report for every size on every backend."""
+    backends = list(backends)
+    unknown = [b for b in backends if b not in BACKENDS]
+    if unknown:
+        raise ValueError(f"Unknown backend(s): {', '.join(unknown)}")
+    results: List[Dict] = []
+    for prs, components, tests in sizes:
+        workload = generate_workload(prs, components, tests, seed=seed)
+        with tempfile.TemporaryDirectory(prefix="codex-bench-") as tmp:
+            for backend in backends:
+                entry: Dict = {
+                    "backend": backend,
+                    "prs": prs,
+                    "components": components,
+                    "tests": tests,
+                    "events": prs * tests,
+                    "planted_pairs": len(workload["planted_pairs"]),
+                }
+                entry.update(_run_backend(backend, workload, Path(tmp)))
+                results.append(entry)
+    return {
+        "version": REPORT_VERSION,
+        "seed": seed,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "mapping": mapping_benchmark(),
+    }
+
+
+def _key(entry: Dict) -> Tuple:
+    return (entry["backend"], entry["prs"], entry["components"], entry["tests"])
+
+
+def compare_reports(
+    baseline: Dict, current: Dict, *, tolerance: float = 0.25, min_delta_ms: float = 5.0
+) -> List[str]:
+    """Return a description of every phase that got slower than *baseline*.
+
+    A phase regresses when it is more than ``tolerance`` (relative) and
+    ``min_delta_ms`` (absolute) slower than the same backend and size in the
+    baseline.  A change in the number of guidance rules found is reported
+    too, since it means the two versions disagree on the analysis itself.
+    The component matcher is held to the same rule, and is also reported
+    when it is no faster than the ``fnmatch`` scan it replaced.
+    """
+    previous = {_key(e): e for e in baseline.get("results", [])}
+    regressions: List[str] = []
+    for entry in current.get("results", []):
+        old = previous.get(_key(entry))
+        if old is None:
+            continue
+        label = "{} prs={} components={} tests={}".format(*_key(entry))
+        for phase in PHASES:
+            before = old.get(f"{phase}_ms")
+            after = entry.get(f"{phase}_ms")
+            if before is None or after is None:
+                continue
+            if after - before > min_delta_ms and after > before * (1 + tolerance):
+                regressions.append(
+                    f"{label}: {phase} {before:.1f} ms -> {after:.1f} ms"
+                )
+        if old.get("guidance_rules") != entry.get("guidance_rules"):
+            regressions.append(
+                f"{label}: guidance_rules {old.get('guidance_rules')} -> "
+                f"{entry.get('guidance_rules')}"
+            )
+    mapping = current.get("mapping")
+    if mapping:
+        before = baseline.get("mapping", {}).get("compiled_ms")
+        after = mapping["compiled_ms"]
+        if (
+            before is not None
+            and after - before > min_delta_ms
+            and after > before * (1 + tolerance)
+        ):
+            regressions.append(f"mapping: compiled {before:.1f} ms -> {after:.1f} ms")
+        if after >= mapping["fnmatch_ms"]:
+            regressions.append(
+                f"mapping: compiled {after:.1f} ms is no faster than "
+                f"fnmatch {mapping['fnmatch_ms']:.1f} ms"
+            )
+    return regressions
+
+
+def _parse_size(text: str) -> Tuple[int, int, int]:
+    try:
+        prs, components, tests = (int(part) for part in text.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"size must be PRS:COMPONENTS:TESTS, got {text!r}"
+        ) from None
+    return prs, components, tests
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Run the benchmark and write the JSON report."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the codex rules engine on synthetic workloads"
+    )
+    parser.add_argument(
+        "--size",
+        action="append",
+        type=_parse_size,
+        dest="sizes",
+        help="Workload size as PRS:COMPONENTS:TESTS (repeatable)",
+    )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=sorted(BACKENDS),
+        dest="backends",
+        help="Storage backend to benchmark (repeatable; default: all)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench.json", help="Report output path")
+    parser.add_argument(
+        "--baseline", help="Previous report to compare against; exit 1 on regression"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative slowdown allowed before a phase counts as a regression",
+    )
+    args = parser.parse_args(argv)
+    report = run_benchmark(
+        args.sizes or DEFAULT_SIZES, args.backends or tuple(BACKENDS), seed=args.seed
+    )
+    Path(args.out).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    for entry in report["results"]:
+        phases = ", ".join(f"{p} {entry[f'{p}_ms']:.1f} ms" for p in PHASES)
+        print(
+            f"[codex-bench] {entry['backend']} prs={entry['prs']} "
+            f"components={entry['components']} tests={entry['tests']}: {phases}"
+        )
+    mapping = report["mapping"]
+    print(
+        f"[codex-bench] mapping paths={mapping['paths']}: "
+        f"compiled {mapping['compiled_ms']:.1f} ms, fnmatch {mapping['fnmatch_ms']:.1f} ms"
+    )
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_reports(baseline, report, tolerance=args.tolerance)
+        for line in regressions:
+            print(f"[codex-bench] regression: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
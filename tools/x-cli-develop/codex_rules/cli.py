@@ -9,7 +9,12 @@ The CLI exposes subcommands that mirror the high‑level workflow:
   - ``emit-warnings``: print warnings when a PR touches components with active
     guidance.
   - ``prune``: mark stale guidance rules inactive.
-  - ``export``: export guidance or stats as JSON for debugging.
+  - ``compact``: roll up old test events per day and expire those outside
+    every analysis window.
+  - ``durations``: report per-test p50/p95 durations, the slowest tests per
+    component and PRs whose runs regressed a test's duration.
+  - ``export``: export guidance or stats as JSON for debugging, or the full
+    history as column files for offline analysis.
 
 The engine is fully self‑contained and does not require GitHub Actions.
 """
@@ -23,28 +28,25 @@ import subprocess
 import sys
 from datetime import datetime, timezone
 from glob import glob
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Type
+from typing import Dict, Iterable, Iterator, List, Tuple, Type
 
 from .config import load_config
 from .mapping import ComponentMapping
-from .storage import Storage, StorageProtocol
-from .ingest.junit import parse_junit
-from .ingest.pytest_json import parse_pytest_json
-from .ingest.jest_json import parse_jest_json
-from .correlate import compute_candidates
-from .guidance import (
-    create_guidance_entries,
-    update_agents_md,
-)
-from .warnings import build_warnings
-from .compliance import load_manifest as load_exec_manifest, check as check_compliance
-from .memory import (
-    REPO_ROOT,
-    MEMORY_PATH,  # absolute path to memory file
-    append_entry as memory_append_entry,  # for writing to persistent memory
-)
-from .telemetry import record_telemetry_entry
+from .storage import InMemoryStorage, Storage, StorageProtocol
+
+# Subcommand dependencies (ingestors, correlation, guidance, compliance,
+# telemetry, memory) are imported inside the handlers that use them so that
+# hook invocations such as ``emit-warnings`` only pay for what they run.
+
+# Snapshot file used when the config selects ``storage.backend: memory``.
+DEFAULT_SNAPSHOT_PATH = ".codex/cache/rules_engine.snapshot"
+# Number of parsed test events written per storage transaction.
+INGEST_CHUNK_SIZE = 5000
+INGEST_FORMATS = ("junit", "pytest-json", "jest-json", "custom")
+# Days of raw test events kept by ``compact`` unless ``retention.raw_days`` is set.
+DEFAULT_RAW_DAYS = 7
 
 
 def _git_env() -> Dict[str, str]:
@@ -55,9 +57,11 @@ def _git_env() -> Dict[str, str]:
 
 
 def _stage_memory_file() -> None:
+    from . import memory
+
     try:
         subprocess.run(
-            ["git", "-C", str(REPO_ROOT), "add", "--", ".codex/memory.json"],
+            ["git", "-C", str(memory.REPO_ROOT), "add", "--", ".codex/memory.json"],
             check=True,
             env=_git_env(),
         )
@@ -70,13 +74,38 @@ def _stage_memory_file() -> None:
         raise SystemExit(code) from exc
 
 
+def open_storage(
+    config: Dict, storage_cls: Type[StorageProtocol] = Storage
+) -> Tuple[StorageProtocol, str | None]:
+    """Open the configured storage backend.
+
+    Returns the storage and, for ``storage.backend: memory``, the snapshot
+    path it should be saved to after writes (otherwise ``None``).
+    """
+    storage_cfg = config["storage"]
+    if storage_cls is Storage and storage_cfg.get("backend") == "memory":
+        # Keep the data in an InMemoryStorage snapshot instead of SQLite
+        # (for ephemeral CI runners).
+        snapshot_path = storage_cfg.get("snapshot_path", DEFAULT_SNAPSHOT_PATH)
+        if Path(snapshot_path).exists():
+            return InMemoryStorage.restore(snapshot_path), snapshot_path
+        return InMemoryStorage(snapshot_path), snapshot_path
+    return storage_cls(storage_cfg["sqlite_path"]), None
+
+
 def main(
     argv: List[str] | None = None,
     *,
     storage_cls: Type[StorageProtocol] = Storage,
     storage: StorageProtocol | None = None,
+    config: Dict | None = None,
+    mapping: ComponentMapping | None = None,
 ) -> None:
-    """Entry point for the CLI."""
+    """Entry point for the CLI.
+
+    ``storage``, ``config`` and ``mapping`` may be supplied by a long-lived
+    caller (see :mod:`codex_rules.daemon`) to skip loading them per call.
+    """
     argv = argv or sys.argv[1:]
     parser = argparse.ArgumentParser(
         description="codex rules engine", allow_abbrev=False
@@ -102,7 +131,7 @@ def main(
     )
     inj.add_argument(
         "--format",
-        choices=["junit", "pytest-json", "jest-json", "custom"],
+        choices=INGEST_FORMATS,
         default="junit",
         help="Input format",
     )
@@ -121,6 +150,12 @@ def main(
         default="",
         help="Unique run identifier (optional)",
     )
+    inj.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse result files in N worker processes (default: 1)",
+    )
 
     # analyze
     ana = sub.add_parser(
@@ -221,17 +256,92 @@ def main(
         help="Deactivate rules with fewer than this many recent PRs",
     )
 
+    # compact
+    cmp_ = sub.add_parser(
+        "compact",
+        help="Roll up old test events per day and expire those outside every window",
+    )
+    cmp_.add_argument(
+        "--raw-days",
+        type=int,
+        default=None,
+        help="Days of raw events to keep (default: retention.raw_days or "
+        f"{DEFAULT_RAW_DAYS})",
+    )
+    cmp_.add_argument(
+        "--window-days",
+        type=int,
+        default=None,
+        help="Largest analysis window to keep (overrides config)",
+    )
+    cmp_.add_argument(
+        "--no-vacuum",
+        dest="vacuum",
+        action="store_false",
+        help="Skip VACUUM; freed pages are reused but the file does not shrink",
+    )
+
+    # durations
+    dur = sub.add_parser(
+        "durations",
+        help="Report slow tests per component and duration regressions per PR",
+    )
+    dur.add_argument(
+        "--window-days",
+        type=int,
+        default=None,
+        help="Days of test events to analyse (overrides config)",
+    )
+    dur.add_argument(
+        "--top", type=int, default=10, help="Slowest tests listed per component"
+    )
+    dur.add_argument(
+        "--rank-by",
+        choices=["p95", "total"],
+        default="p95",
+        help="Rank slow tests by p95 duration or by total time spent",
+    )
+    dur.add_argument(
+        "--pr",
+        dest="pr_id",
+        type=int,
+        default=None,
+        help="Only report regressions of this PR",
+    )
+    dur.add_argument(
+        "--factor",
+        type=float,
+        default=None,
+        help="Flag runs slower than this multiple of the test's p95 "
+        "(default: durations.regression_factor)",
+    )
+    dur.add_argument(
+        "--min-samples",
+        type=int,
+        default=None,
+        help="Earlier runs a test needs before it can regress "
+        "(default: durations.min_samples)",
+    )
+    dur.add_argument("--out", help="Also write the full report as JSON to this file")
+
     # export
     exp = sub.add_parser(
-        "export", help="Export guidance or stats to JSON for debugging"
+        "export", help="Export guidance or stats to JSON, or the history as columns"
     )
     exp.add_argument(
         "--what",
         choices=["guidance", "stats"],
-        required=True,
-        help="Which data to export",
+        default=None,
+        help="Which data to export (required for --format json)",
     )
-    exp.add_argument("--out", required=True, help="Output JSON file")
+    exp.add_argument(
+        "--format",
+        choices=["json", "columnar"],
+        default="json",
+        help="columnar writes events, PR files and guidance as column files "
+        "into the --out directory",
+    )
+    exp.add_argument("--out", required=True, help="Output JSON file or directory")
 
     # check-compliance (explicit gate)
     gate = sub.add_parser(
@@ -291,7 +401,7 @@ def main(
     )
     run.add_argument(
         "--format",
-        choices=["junit", "pytest-json", "jest-json", "custom"],
+        choices=INGEST_FORMATS,
         default="junit",
         help="Test results format",
     )
@@ -304,6 +414,12 @@ def main(
         "--commit", default="", help="Commit SHA for the test run (optional)"
     )
     run.add_argument("--run-id", default="", help="Unique run identifier (optional)")
+    run.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse result files in N worker processes (default: 1)",
+    )
     run.add_argument(
         "--manifest",
         default=None,
@@ -373,83 +489,105 @@ def main(
     )
 
     args = parser.parse_args(argv)
-    config = load_config()
+    # Copy a shared config so per-call overrides do not leak between calls.
+    config = dict(config) if config is not None else load_config()
     # Optionally override window_days on CLI
     if getattr(args, "window_days", None):
         config["window_days"] = args.window_days
-    db_path = config["storage"]["sqlite_path"]
-    storage_obj = storage or storage_cls(db_path)
-    mapping = ComponentMapping(config.get("components_file", ".codex/components.yml"))
-
-    if args.command == "record-pr":
-        record_pr(args, storage_obj, mapping)
-    elif args.command == "ingest-tests":
-        ingest_tests(args, storage_obj, mapping)
-    elif args.command == "analyze":
-        analyze(args, storage_obj, config)
-    elif args.command == "update-docs":
-        update_docs(args, storage_obj, config)
-    elif args.command == "emit-warnings":
-        if args.agent_feedback and not args.record_telemetry:
-            print(
-                "[codex-rules] --agent-feedback requires --record-telemetry",
-                file=sys.stderr,
-            )
-            sys.exit(2)
-        emit_warnings(args, storage_obj, config)
-        if args.record_telemetry:
-            components = storage_obj.get_components_for_pr(args.pr_id)
-            guidance = storage_obj.get_active_guidance_by_component(components)
-            required = sorted({g["command"] for g in guidance})
-            checks_skipped: List[str] = []
-            if args.manifest:
-                executed = load_exec_manifest(args.manifest)
-                ok, missing = check_compliance(
-                    required, executed, mode="any" if args.require_any else "all"
-                )
-                if not ok:
-                    checks_skipped = missing
-            entry = {
-                "pr_id": args.pr_id,
-                "modules_inspected": components,
-                "checks_skipped": checks_skipped,
-            }
-            if args.ci_log_paths:
-                entry["ci_log_paths"] = args.ci_log_paths
-            if args.failing_tests:
-                entry["failing_tests"] = args.failing_tests
-            try:
-                record_telemetry_entry(
-                    entry,
-                    agent_feedback=args.agent_feedback,
-                    srs_ids=args.srs_ids,
-                )
-                subprocess.run(
-                    ["git", "add", ".codex/telemetry.json", "telemetry/summary.json"],
-                    check=False,
-                )
-            except Exception as exc:
+    snapshot_path = None
+    if storage is None:
+        storage, snapshot_path = open_storage(config, storage_cls)
+    storage_obj = storage
+    if mapping is None:
+        mapping = ComponentMapping(config.get("components_file", ".codex/components.yml"))
+
+    try:
+        if args.command == "record-pr":
+            record_pr(args, storage_obj, mapping)
+        elif args.command == "ingest-tests":
+            ingest_tests(args, storage_obj, mapping)
+        elif args.command == "analyze":
+            analyze(args, storage_obj, config)
+        elif args.command == "update-docs":
+            update_docs(args, storage_obj, config)
+        elif args.command == "emit-warnings":
+            if args.agent_feedback and not args.record_telemetry:
                 print(
-                    f"[codex-rules] Error recording telemetry for PR {args.pr_id}: {exc}",
+                    "[codex-rules] --agent-feedback requires --record-telemetry",
                     file=sys.stderr,
                 )
-    elif args.command == "prune":
-        prune(args, storage_obj, config)
-    elif args.command == "export":
-        export_data(args, storage_obj)
-    elif args.command == "check-compliance":
-        gate_compliance(args, storage_obj, config)
-    elif args.command == "run-workflow":
-        run_workflow(args, storage_obj, mapping, config)
-    elif args.command == "memory":
-        if args.memory_cmd == "read":
-            memory_read(args, config)
-        elif args.memory_cmd == "append":
-            memory_append(args, config)
+                sys.exit(2)
+            emit_warnings(args, storage_obj, config)
+            if args.record_telemetry:
+                from .compliance import (
+                    load_manifest_index as load_exec_manifest,
+                    check as check_compliance,
+                )
+                from .telemetry import record_telemetry_entry
+
+                components = storage_obj.get_components_for_pr(args.pr_id)
+                guidance = storage_obj.get_active_guidance_by_component(components)
+                required = sorted({g["command"] for g in guidance})
+                checks_skipped: List[str] = []
+                if args.manifest:
+                    executed = load_exec_manifest(args.manifest)
+                    ok, missing = check_compliance(
+                        required, executed, mode="any" if args.require_any else "all"
+                    )
+                    if not ok:
+                        checks_skipped = missing
+                entry = {
+                    "pr_id": args.pr_id,
+                    "modules_inspected": components,
+                    "checks_skipped": checks_skipped,
+                }
+                if args.ci_log_paths:
+                    entry["ci_log_paths"] = args.ci_log_paths
+                if args.failing_tests:
+                    entry["failing_tests"] = args.failing_tests
+                try:
+                    record_telemetry_entry(
+                        entry,
+                        agent_feedback=args.agent_feedback,
+                        srs_ids=args.srs_ids,
+                    )
+                    subprocess.run(
+                        ["git", "add", ".codex/telemetry.json", "telemetry/summary.json"],
+                        check=False,
+                    )
+                except Exception as exc:
+                    print(
+                        f"[codex-rules] Error recording telemetry for PR {args.pr_id}: {exc}",
+                        file=sys.stderr,
+                    )
+        elif args.command == "prune":
+            prune(args, storage_obj, config)
+        elif args.command == "compact":
+            compact(args, storage_obj, config)
+        elif args.command == "durations":
+            durations(args, storage_obj, config)
+        elif args.command == "export":
+            if args.format == "json" and not args.what:
+                parser.error("export --format json requires --what")
+            export_data(args, storage_obj)
+        elif args.command == "check-compliance":
+            gate_compliance(args, storage_obj, config)
+        elif args.command == "run-workflow":
+            run_workflow(args, storage_obj, mapping, config)
+        elif args.command == "memory":
+            if args.memory_cmd == "read":
+                memory_read(args, config)
+            elif args.memory_cmd == "append":
+                memory_append(args, config)
+            else:
+                parser.error("Unknown memory subcommand")
         else:
-            parser.error("Unknown memory subcommand")
-    else:
-        parser.error(f"Unknown command {args.command!r}")
+            parser.error(f"Unknown command {args.command!r}")
+    finally:
+        # Handlers may sys.exit() after writing; save before exiting.
+        # Read-only commands leave the snapshot untouched.
+        if snapshot_path and storage_obj.dirty:
+            storage_obj.snapshot(snapshot_path)
 
 
 def run_workflow(
@@ -514,6 +652,7 @@ def run_workflow(
         path=args.results_path,
         commit=args.commit or "",
         run_id=args.run_id or "",
+        jobs=getattr(args, "jobs", 1),
     )
     ingest_tests(inj_args, storage, mapping)
 
@@ -541,6 +680,12 @@ def run_workflow(
 
     components = storage.get_components_for_pr(pr_id)
     if args.record_telemetry:
+        from .compliance import (
+            load_manifest_index as load_exec_manifest,
+            check as check_compliance,
+        )
+        from .telemetry import record_telemetry_entry
+
         guidance = storage.get_active_guidance_by_component(components)
         required = sorted({g["command"] for g in guidance})
         checks_skipped: List[str] = []
@@ -578,6 +723,8 @@ def run_workflow(
 
     # If a memory summary is provided, append it to memory and stage the file for commit
     if getattr(args, "memory_summary", None):
+        from .memory import append_entry as memory_append_entry
+
         entry = {"summary": args.memory_summary}
         if getattr(args, "memory_author", None):
             entry["author"] = args.memory_author
@@ -617,10 +764,59 @@ def record_pr(
     )
 
 
+def _parse_results(fmt: str, fpath: str) -> Iterable[Dict]:
+    """Return the normalized test records of one result file."""
+    if fmt == "junit":
+        from .ingest.junit import iter_junit
+
+        return iter_junit(fpath)
+    if fmt == "pytest-json":
+        from .ingest.pytest_json import parse_pytest_json
+
+        return parse_pytest_json(fpath)
+    if fmt == "jest-json":
+        from .ingest.jest_json import parse_jest_json
+
+        return parse_jest_json(fpath)
+    if fmt == "custom":
+        with open(fpath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    raise ValueError(f"Unsupported format {fmt}")
+
+
+def _parse_results_list(fmt: str, fpath: str) -> List[Dict]:
+    """Process-pool entry point: parse one file into a picklable list."""
+    return list(_parse_results(fmt, fpath))
+
+
+def _parsed_files(fmt: str, files: List[str], jobs: int) -> Iterator[Iterable[Dict]]:
+    """Yield the records of each file, parsing in ``jobs`` processes if > 1.
+
+    Parallel results are yielded as workers finish, so the caller (the single
+    storage writer) starts consuming while slower files are still parsing.
+    """
+    if jobs <= 1 or len(files) <= 1:
+        for fpath in files:
+            yield _parse_results(fmt, fpath)
+        return
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+        futures = [pool.submit(_parse_results_list, fmt, fpath) for fpath in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
 def ingest_tests(
     args: argparse.Namespace, storage: StorageProtocol, mapping: ComponentMapping
 ) -> None:
-    """Ingest test results for a PR and record failing events."""
+    """Ingest test results for a PR and record failing events.
+
+    Parsed events are written through ``storage.record_test_events`` in
+    chunks of ``INGEST_CHUNK_SIZE`` so each chunk is one transaction.  With
+    ``--jobs N`` files are parsed in a process pool while this process stays
+    the only writer.
+    """
     pr_id = args.pr_id
     run_id = args.run_id or f"run-{datetime.now(timezone.utc).isoformat()}"
     commit_sha = args.commit or ""
@@ -629,40 +825,40 @@ def ingest_tests(
     if not files:
         print(f"No files match {args.path!r}", file=sys.stderr)
         return
-    for fpath in files:
-        if args.format == "junit":
-            events = parse_junit(fpath)
-        elif args.format == "pytest-json":
-            events = parse_pytest_json(fpath)
-        elif args.format == "jest-json":
-            events = parse_jest_json(fpath)
-        elif args.format == "custom":
-            with open(fpath, "r", encoding="utf-8") as f:
-                events = json.load(f)
-        else:
-            raise ValueError(f"Unsupported format {args.format}")
-        for evt in events:
-            # Determine component based on file hint or fallback to 'unknown'
-            hint = evt.get("file")
-            comp = "unknown"
-            if hint:
-                comp = mapping.component_for_path(hint)
-            storage.record_test_event(
-                run_id=run_id,
-                pr_id=pr_id,
-                commit_sha=commit_sha,
-                test_id=evt.get("test_id"),
-                suite=evt.get("suite"),
-                status=evt.get("status"),
-                duration_ms=evt.get("duration_ms", 0),
-                component=comp,
-                file_hint=hint or "",
-                ts=datetime.now(timezone.utc).isoformat(),
-            )
+    if args.format not in INGEST_FORMATS:
+        raise ValueError(f"Unsupported format {args.format}")
+
+    def records() -> Iterator[Dict]:
+        for events in _parsed_files(args.format, files, getattr(args, "jobs", 1) or 1):
+            for evt in events:
+                # Determine component based on file hint or fallback to 'unknown'
+                hint = evt.get("file")
+                comp = "unknown"
+                if hint:
+                    comp = mapping.component_for_path(hint)
+                yield {
+                    "run_id": run_id,
+                    "pr_id": pr_id,
+                    "commit_sha": commit_sha,
+                    "test_id": evt.get("test_id"),
+                    "suite": evt.get("suite"),
+                    "status": evt.get("status"),
+                    "duration_ms": evt.get("duration_ms", 0),
+                    "component": comp,
+                    "file_hint": hint or "",
+                    "ts": datetime.now(timezone.utc).isoformat(),
+                }
+
+    stream = records()
+    while chunk := list(islice(stream, INGEST_CHUNK_SIZE)):
+        storage.record_test_events(chunk)
 
 
 def analyze(args: argparse.Namespace, storage: StorageProtocol, config: Dict) -> None:
     """Compute component/test correlations and update guidance table."""
+    from .correlate import compute_candidates
+    from .guidance import create_guidance_entries
+
     # Retrieve thresholds from config
     thresh = {
         "min_occurrences": config.get("min_occurrences", 3),
@@ -695,6 +891,8 @@ def update_docs(
     args: argparse.Namespace, storage: StorageProtocol, config: Dict
 ) -> None:
     """Rewrite the AGENTS.md file with the current guidance rules."""
+    from .guidance import update_agents_md
+
     doc_file = args.file or config["docs"]["file"]
     # Read active guidance from storage
     guidance = storage.get_active_guidance()
@@ -712,6 +910,8 @@ def emit_warnings(
     guidance = storage.get_active_guidance_by_component(components)
     if not guidance:
         return
+    from .warnings import build_warnings
+
     messages = build_warnings(components, guidance)
     if args.stdout:
         for line in messages:
@@ -721,10 +921,12 @@ def emit_warnings(
         "manifest_path"
     )
     if manifest_path:
-        executed = load_exec_manifest(manifest_path)
+        from .compliance import load_manifest_index, check
+
+        executed = load_manifest_index(manifest_path)
         required = sorted({g["command"] for g in guidance})
         mode = "any" if args.require_any else "all"
-        ok, missing = check_compliance(required, executed, mode=mode)
+        ok, missing = check(required, executed, mode=mode)
         if not ok:
             sys.stdout.write(
                 "[codex-rules] Compliance violation: missing required pre‑emptive commands:\n"
@@ -744,7 +946,75 @@ def prune(args: argparse.Namespace, storage: StorageProtocol, config: Dict) -> N
     """Mark stale guidance rules as inactive."""
     window_days = args.window_days or config.get("window_days", 30)
     last_n = args.last_n
-    storage.prune_guidance(window_days, last_n)
+    report = storage.prune_guidance(window_days, last_n)
+    if report:
+        print(
+            f"[codex-rules] Pruned guidance: {report['deactivated']} of "
+            f"{report['evaluated']} active rules deactivated in "
+            f"{report['duration_ms']:.1f} ms."
+        )
+
+
+def compact(args: argparse.Namespace, storage: StorageProtocol, config: Dict) -> None:
+    """Roll up and expire old test events, reporting the space reclaimed."""
+    retention = config.get("retention") or {}
+    raw_days = args.raw_days or retention.get("raw_days", DEFAULT_RAW_DAYS)
+    window_days = args.window_days or config.get("window_days", 30)
+    report = storage.compact(raw_days, window_days, vacuum=args.vacuum)
+    line = (
+        f"[codex-rules] Compacted {report['compacted']} events into "
+        f"{report['rollup_rows']} daily rows and expired {report['expired']} rows"
+    )
+    if report["bytes_before"] is not None:
+        reclaimed = report["bytes_before"] - report["bytes_after"]
+        line += f"; reclaimed {reclaimed} bytes ({report['bytes_after']} bytes remain)"
+    print(f"{line} in {report['duration_ms']:.1f} ms.")
+
+
+def durations(args: argparse.Namespace, storage: StorageProtocol, config: Dict) -> None:
+    """Print slow tests per component and duration regressions per PR."""
+    from .durations import (
+        DEFAULT_FACTOR,
+        DEFAULT_MIN_DELTA_MS,
+        DEFAULT_MIN_SAMPLES,
+        analyze_durations,
+    )
+
+    settings = config.get("durations") or {}
+    window_days = args.window_days or config.get("window_days", 30)
+    report = analyze_durations(
+        storage.duration_samples(window_days),
+        top=args.top,
+        rank_by=args.rank_by,
+        factor=args.factor or settings.get("regression_factor", DEFAULT_FACTOR),
+        min_samples=args.min_samples or settings.get("min_samples", DEFAULT_MIN_SAMPLES),
+        min_delta_ms=settings.get("min_delta_ms", DEFAULT_MIN_DELTA_MS),
+    )
+    if args.pr_id is not None:
+        report["regressions"] = [r for r in report["regressions"] if r["pr_id"] == args.pr_id]
+    report["window_days"] = window_days
+    print(
+        f"[codex-rules] Analysed {report['samples']} durations of "
+        f"{len(report['tests'])} tests over {window_days} days."
+    )
+    for component, tests in report["slowest"].items():
+        print(f"{component or '(no component)'}:")
+        for t in tests:
+            print(
+                f"  {t['test_id']}  p50 {t['p50_ms']:.1f} ms  p95 {t['p95_ms']:.1f} ms  "
+                f"total {t['total_ms']:.1f} ms  ({t['count']} runs)"
+            )
+    if report["regressions"]:
+        print("Regressions:")
+        for r in report["regressions"]:
+            print(
+                f"  PR {r['pr_id']}: {r['test_id']} took {r['duration_ms']:.1f} ms, "
+                f"{r['ratio']:.2f}x its p95 of {r['baseline_p95_ms']:.1f} ms"
+            )
+    else:
+        print("No duration regressions.")
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
 
 
 def memory_read(args: argparse.Namespace, config: Dict) -> None:
@@ -787,7 +1057,14 @@ def memory_append(args: argparse.Namespace, config: Dict) -> None:
 
 
 def export_data(args: argparse.Namespace, storage: StorageProtocol) -> None:
-    """Export guidance or stats to a JSON file."""
+    """Export guidance or stats to a JSON file, or the history as columns."""
+    if getattr(args, "format", "json") == "columnar":
+        from .columnar import export_columnar
+
+        manifest = export_columnar(storage, args.out)
+        counts = ", ".join(f"{t} {info['rows']}" for t, info in manifest["tables"].items())
+        print(f"[codex-rules] Exported columnar history to {args.out} ({counts} rows).")
+        return
     if args.what == "guidance":
         data = storage.get_active_guidance()
     elif args.what == "stats":
@@ -817,10 +1094,12 @@ def gate_compliance(
             file=sys.stderr,
         )
         sys.exit(2)
-    executed = load_exec_manifest(manifest_path)
+    from .compliance import load_manifest_index, check
+
+    executed = load_manifest_index(manifest_path)
     required = sorted({g["command"] for g in guidance})
     mode = "any" if args.require_any else "all"
-    ok, missing = check_compliance(required, executed, mode=mode)
+    ok, missing = check(required, executed, mode=mode)
     if not ok:
         print(
             "[codex-rules] Compliance violation: missing required pre‑emptive commands:"
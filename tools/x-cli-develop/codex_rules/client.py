@@ -0,0 +1,93 @@
+"""Thin client for the codex-rules daemon.
+
+``python -m codex_rules.client <command> [args...]`` accepts the same
+arguments as ``python -m codex_rules``.  When a daemon (see
+:mod:`codex_rules.daemon`) is listening on the configured socket, the
+command is executed there and only this module, ``json`` and ``socket`` are
+imported.  Otherwise, or when the daemon declines the request, the command
+runs in-process through :func:`codex_rules.cli.main`.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# Keep in sync with codex_rules.daemon; duplicated so this module stays cheap
+# to import.
+DEFAULT_SOCKET_PATH = ".codex/cache/codex-rules.sock"
+SOCKET_ENV = "CODEX_RULES_SOCKET"
+CONNECT_TIMEOUT = 0.5
+
+
+class DaemonUnavailable(Exception):
+    """The daemon could not be reached or did not execute the request."""
+
+
+def request(payload: Dict, path: str | None = None) -> Dict:
+    """Send *payload* to the daemon and return its response.
+
+    Raises :class:`DaemonUnavailable` if no daemon accepts the connection.
+    Errors after the request was sent propagate as ``OSError`` because the
+    daemon may already have executed it.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonUnavailable("Unix domain sockets are not supported")
+    path = str(Path(path or os.environ.get(SOCKET_ENV) or DEFAULT_SOCKET_PATH).resolve())
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(path)
+        except OSError as exc:
+            raise DaemonUnavailable(str(exc)) from exc
+        sock.settimeout(None)
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as fh:
+            line = fh.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise OSError("codex-rules daemon closed the connection without replying")
+    return json.loads(line)
+
+
+def run(argv: List[str], path: str | None = None) -> int:
+    """Run a CLI command via the daemon, falling back to in-process."""
+    try:
+        response = request({"argv": argv, "cwd": os.getcwd()}, path)
+        if "error" in response:
+            raise DaemonUnavailable(response["error"])
+    except DaemonUnavailable:
+        return _run_in_process(argv)
+    except OSError as exc:
+        print(f"[codex-rules] daemon request failed: {exc}", file=sys.stderr)
+        return 1
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return int(response.get("code", 1))
+
+
+def _run_in_process(argv: List[str]) -> int:
+    from .cli import main as cli_main
+
+    try:
+        cli_main(argv)
+    except SystemExit as exc:
+        if isinstance(exc.code, int) or exc.code is None:
+            return exc.code or 0
+        print(exc.code, file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: List[str] | None = None) -> None:
+    """Entry point for ``python -m codex_rules.client``."""
+    sys.exit(run(list(sys.argv[1:] if argv is None else argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Column-oriented export of the rules engine history for offline analysis.
+
+``export_columnar`` streams ``test_events``, ``test_event_days``,
+``pr_files`` and ``guidance`` from a storage backend into a directory with
+one binary file per column plus ``manifest.json``::
+
+    history/
+      manifest.json
+      test_events/status.bin        dictionary codes (int32)
+      test_events/status.dict.json  the dictionary
+      test_events/ts.bin            microseconds since the epoch (int64)
+      ...
+
+Column files are raw little-endian arrays, so they load without parsing:
+``read_columnar`` returns :class:`array.array` columns, and
+``numpy.fromfile(path, "<i4")`` (or ``"<i8"``/``"<f8"``) works on them too.
+String columns are dictionary-encoded, which makes group-bys and filters
+integer operations over the codes.  Column types:
+
+``str``
+    int32 codes into the dictionary; ``-1`` is NULL.
+``int``
+    int64; NULL is stored as 0.
+``float``
+    float64; NULL is NaN.
+``time``
+    int64 microseconds since the Unix epoch (UTC); NULL or unparsable
+    timestamps are ``TIME_NULL``.
+"""
+from __future__ import annotations
+
+import json
+import math
+import sys
+from array import array
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, NamedTuple, Tuple
+
+from .storage import EXPORT_COLUMNS, StorageProtocol
+
+FORMAT = "codex-rules-columnar"
+FORMAT_VERSION = 1
+# Rows buffered per column before they are appended to the column files.
+CHUNK_ROWS = 65536
+TIME_NULL = -(2**63)
+_TYPECODES = {"str": "i", "int": "q", "float": "d", "time": "q"}
+
+# Column types; every other exported column is a dictionary-encoded string.
+COLUMN_TYPES: Dict[str, Dict[str, str]] = {
+    "test_events": {"pr_id": "int", "duration_ms": "float", "ts": "time"},
+    "test_event_days": {
+        "pr_id": "int",
+        "runs": "int",
+        "failed": "int",
+        "duration_ms": "float",
+        "max_duration_ms": "float",
+        "ts": "time",
+        "failed_ts": "time",
+    },
+    "pr_files": {"pr_id": "int"},
+    "guidance": {
+        "support_prs": "int",
+        "confidence": "float",
+        "baseline": "float",
+        "lift": "float",
+        "p_value": "float",
+        "active": "int",
+        "last_seen": "time",
+        "created_at": "time",
+    },
+}
+
+
+class DictColumn(NamedTuple):
+    """A dictionary-encoded string column."""
+
+    codes: array
+    values: List[str]
+
+    def decode(self) -> List[str | None]:
+        values = self.values + [None]  # code -1 is NULL
+        return [values[code] for code in self.codes]
+
+
+def _epoch_us(value: str | None) -> int:
+    if not value:
+        return TIME_NULL
+    try:
+        ts = datetime.fromisoformat(value)
+    except ValueError:
+        return TIME_NULL
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    delta = ts - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+class _ColumnWriter:
+    def __init__(self, kind: str, fh: BinaryIO) -> None:
+        self.kind = kind
+        self.fh = fh
+        self.dictionary: Dict[str, int] = {}
+
+    def encode(self, values: Iterable) -> array:
+        if self.kind == "str":
+            lookup = self.dictionary
+            return array(
+                "i",
+                (-1 if v is None else lookup.setdefault(str(v), len(lookup)) for v in values),
+            )
+        if self.kind == "int":
+            return array("q", (int(v or 0) for v in values))
+        if self.kind == "float":
+            return array("d", (math.nan if v is None else float(v) for v in values))
+        return array("q", (_epoch_us(v) for v in values))
+
+    def write(self, values: Iterable) -> None:
+        column = self.encode(values)
+        if sys.byteorder == "big":  # pragma: no cover - big-endian hosts
+            column.byteswap()
+        column.tofile(self.fh)
+
+
+def _export_table(rows: Iterable[Tuple], table: str, out: Path) -> Dict:
+    names = EXPORT_COLUMNS[table]
+    types = COLUMN_TYPES[table]
+    (out / table).mkdir(parents=True, exist_ok=True)
+    writers = {
+        name: _ColumnWriter(types.get(name, "str"), (out / table / f"{name}.bin").open("wb"))
+        for name in names
+    }
+    count = 0
+    try:
+        rows = iter(rows)
+        while chunk := list(islice(rows, CHUNK_ROWS)):
+            count += len(chunk)
+            for name, values in zip(names, zip(*chunk)):
+                writers[name].write(values)
+    finally:
+        for writer in writers.values():
+            writer.fh.close()
+    columns = {}
+    for name, writer in writers.items():
+        meta = {"type": writer.kind, "file": f"{table}/{name}.bin"}
+        if writer.kind == "str":
+            meta["dictionary"] = f"{table}/{name}.dict.json"
+            (out / meta["dictionary"]).write_text(
+                json.dumps(list(writer.dictionary)), encoding="utf-8"
+            )
+        columns[name] = meta
+    return {"rows": count, "columns": columns}
+
+
+def export_columnar(
+    storage: StorageProtocol, out: str | Path, tables: Iterable[str] = tuple(EXPORT_COLUMNS)
+) -> Dict:
+    """Write *tables* of *storage* under the directory *out*; return the manifest."""
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "byteorder": "little",
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "tables": {
+            table: _export_table(storage.export_rows(table), table, out) for table in tables
+        },
+    }
+    (out / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+def read_columnar(
+    path: str | Path, table: str, columns: Iterable[str] | None = None
+) -> Dict[str, array | DictColumn]:
+    """Load *columns* (default: all) of *table* from an export directory.
+
+    Raises ``ValueError`` if *path* is not a columnar export this version
+    can read or does not contain *table*.
+    """
+    path = Path(path)
+    manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+    if manifest.get("format") != FORMAT or manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a {FORMAT} v{FORMAT_VERSION} export")
+    if table not in manifest["tables"]:
+        raise ValueError(f"{path} has no table {table!r}")
+    info = manifest["tables"][table]
+    result: Dict[str, array | DictColumn] = {}
+    for name in columns or info["columns"]:
+        meta = info["columns"][name]
+        column = array(_TYPECODES[meta["type"]])
+        column.frombytes((path / meta["file"]).read_bytes())
+        if sys.byteorder == "big":  # pragma: no cover - big-endian hosts
+            column.byteswap()
+        if meta["type"] == "str":
+            values = json.loads((path / meta["dictionary"]).read_text(encoding="utf-8"))
+            result[name] = DictColumn(column, values)
+        else:
+            result[name] = column
+    return result
@@ -2,60 +2,84 @@
 
 Compares the set of *required* commands (from active guidance for components
 touched in a PR) with the set of commands the agent claims it actually ran,
-loaded from a manifest file.
+loaded from a manifest file.  Executed commands are normalized once into a
+sorted-prefix index so each required command is checked with one bisection.
 """
 from __future__ import annotations
 
 import json
+from bisect import bisect_left
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
 
 def _norm(cmd: str) -> str:
     return " ".join((cmd or "").strip().lower().split())
 
 
-def load_manifest(path: str) -> List[str]:
-    """Load executed commands from a manifest file.
+def _iter_lines(first: str, rest: Iterable[str]) -> Iterator[str]:
+    """Yield commands from NDJSON / plain-text lines."""
+    for line in chain([first], rest):
+        s = line.strip()
+        if not s or s.startswith("#"):
+            continue
+        try:
+            obj = json.loads(s)
+            if isinstance(obj, dict) and obj.get("cmd"):
+                yield str(obj["cmd"])
+        except Exception:
+            # Treat as plain text
+            yield s
 
-    Accepted formats:
-      - JSON object: {"ran": ["...","..."]} or {"commands": ["..."]}
-      - JSON array: ["...","..."]
-      - NDJSON: each line is a JSON object containing {"cmd": "..."}
-      - Plain text: newline-separated commands; lines starting with '#' ignored
+
+def _ndjson_record(line: str) -> bool:
+    try:
+        obj = json.loads(line)
+    except Exception:
+        return False
+    return isinstance(obj, dict) and "cmd" in obj
+
+
+def iter_manifest(path: str) -> Iterator[str]:
+    """Yield the raw executed commands recorded in a manifest file.
+
+    NDJSON and plain-text manifests are streamed line by line, so long
+    agent sessions are never held in memory at once.  A file is parsed as
+    a single JSON document only when its first line does not look like an
+    NDJSON record; if that parse fails the lines are streamed instead.
     """
     p = Path(path)
     if not p.exists():
-        return []
-    text = p.read_text(encoding="utf-8")
-    cmds: List[str] = []
+        return
+    with p.open("r", encoding="utf-8") as fh:
+        first = ""
+        for first in fh:
+            if first.strip():
+                break
+        head = first.strip()
+        if not head.startswith(("{", "[")) or _ndjson_record(head):
+            yield from _iter_lines(first, fh)
+            return
+        text = first + fh.read()
     try:
         data = json.loads(text)
-        if isinstance(data, dict):
-            arr = data.get("ran") or data.get("commands") or []
-            if isinstance(arr, list):
-                cmds = [str(x) for x in arr]
-        elif isinstance(data, list):
-            cmds = [str(x) for x in data]
-        else:
-            cmds = []
     except Exception:
-        # Try NDJSON
-        for line in text.splitlines():
-            s = line.strip()
-            if not s or s.startswith("#"):
-                continue
-            try:
-                obj = json.loads(s)
-                if isinstance(obj, dict) and obj.get("cmd"):
-                    cmds.append(str(obj["cmd"]))
-            except Exception:
-                # Treat as plain text
-                cmds.append(s)
-    # Normalize and de-duplicate while preserving order
+        yield from _iter_lines("", text.splitlines())
+        return
+    if isinstance(data, dict):
+        arr = data.get("ran") or data.get("commands") or []
+        if isinstance(arr, list):
+            yield from (str(x) for x in arr)
+    elif isinstance(data, list):
+        yield from (str(x) for x in data)
+
+
+def _unique_normalized(commands: Iterable[str]) -> List[str]:
+    """Normalize and de-duplicate while preserving order."""
     seen = set()
     out: List[str] = []
-    for c in cmds:
+    for c in commands:
         n = _norm(c)
         if n and n not in seen:
             seen.add(n)
@@ -63,23 +87,74 @@ def load_manifest(path: str) -> List[str]:
     return out
 
 
-def check(required_commands: Iterable[str], executed_commands: Iterable[str], mode: str = "all") -> Tuple[bool, List[str]]:
+def load_manifest(path: str) -> List[str]:
+    """Load executed commands from a manifest file.
+
+    Accepted formats:
+      - JSON object: {"ran": ["...","..."]} or {"commands": ["..."]}
+      - JSON array: ["...","..."]
+      - NDJSON: each line is a JSON object containing {"cmd": "..."}
+      - Plain text: newline-separated commands; lines starting with '#' ignored
+    """
+    return _unique_normalized(iter_manifest(path))
+
+
+class CommandIndex:
+    """Sorted-prefix index over normalized executed commands.
+
+    Commands are normalized once when the index is built.  Because every
+    string sharing a prefix sorts into one contiguous run, a required command
+    is satisfied iff the first executed command not less than it starts
+    with it, which is a single ``bisect`` per lookup.
+    """
+
+    def __init__(
+        self, executed_commands: Iterable[str], *, normalized: bool = False
+    ) -> None:
+        commands = (
+            executed_commands if normalized else (_norm(e) for e in executed_commands)
+        )
+        self._sorted = sorted({c for c in commands if c})
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def satisfies(self, required: str) -> bool:
+        """Return True if any executed command has *required* as a prefix."""
+        i = bisect_left(self._sorted, required)
+        return i < len(self._sorted) and self._sorted[i].startswith(required)
+
+
+def load_manifest_index(path: str) -> CommandIndex:
+    """Stream a manifest into a :class:`CommandIndex`."""
+    return CommandIndex(_unique_normalized(iter_manifest(path)), normalized=True)
+
+
+def check(
+    required_commands: Iterable[str],
+    executed_commands: Iterable[str] | CommandIndex,
+    mode: str = "all",
+) -> Tuple[bool, List[str]]:
     """Return (compliant, missing) given required and executed command sets.
 
     Matching rule: a required command is considered satisfied if *any* executed
     command has it as a **prefix** (case-insensitive, whitespace-normalized).
+    ``executed_commands`` may be a prebuilt :class:`CommandIndex`, e.g. from
+    :func:`load_manifest_index`; otherwise one is built for this call.
 
     mode:
       - "all": every required command must be satisfied
       - "any": at least one required command must be satisfied
     """
-    req = [_norm(r) for r in required_commands if _norm(r)]
-    exe = [_norm(e) for e in executed_commands if _norm(e)]
+    req = [n for n in (_norm(r) for r in required_commands) if n]
     if not req:
         return True, []
-    def satisfied(r: str) -> bool:
-        return any(e.startswith(r) for e in exe)
-    missing = [r for r in req if not satisfied(r)]
+    index = (
+        executed_commands
+        if isinstance(executed_commands, CommandIndex)
+        else CommandIndex(executed_commands)
+    )
+    missing = [r for r in req if not index.satisfies(r)]
     if mode == "any":
         return (len(missing) < len(req)), missing
     return (len(missing) == 0), missing
@@ -36,6 +36,8 @@ def load_config(path: str | None = None) -> Dict:
         },
         "provider": {"type": "none"},
         "storage": {"sqlite_path": ".codex/cache/rules_engine.sqlite"},
+        "retention": {"raw_days": 7},
+        "durations": {"regression_factor": 1.5, "min_samples": 5, "min_delta_ms": 50},
         "components_file": ".codex/components.yml",
         "templates_file": ".codex/guidance_templates.yml",
     }
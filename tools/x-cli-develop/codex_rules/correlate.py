@@ -4,11 +4,15 @@ This module computes candidate guidance rules by building contingency tables
 for each (component, test) pair and evaluating statistical metrics such as
 confidence, baseline, lift and Fisher’s exact p‑value.  Thresholds defined in
 the configuration filter out weak or flaky associations.
+
+Storages that implement ``contingency_tables`` are analysed in a single
+batched pass; others fall back to one ``contingency`` call per pair.
 """
 from __future__ import annotations
 
 import math
-from typing import Dict, Iterable, List
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
 
 from .storage import StorageProtocol
 
@@ -34,8 +38,7 @@ def compute_candidates(storage: StorageProtocol, thresh: Dict) -> List[Dict]:
     min_lift_flaky = thresh.get("min_lift_for_flaky", 3.0)
 
     results: List[Dict] = []
-    for component, test_id in storage.distinct_pairs(window_days):
-        A, B, C, D = storage.contingency(component, test_id, window_days)
+    for (component, test_id), (A, B, C, D) in _iter_tables(storage, window_days):
         total_prs = A + B + C + D
         if total_prs == 0:
             continue
@@ -71,6 +74,18 @@ def compute_candidates(storage: StorageProtocol, thresh: Dict) -> List[Dict]:
     return results
 
 
+def _iter_tables(
+    storage: StorageProtocol, window_days: int
+) -> Iterable[Tuple[Tuple[str, str], Tuple[int, int, int, int]]]:
+    """Yield ``((component, test_id), (A, B, C, D))`` for each pair in the window."""
+    batched = getattr(storage, "contingency_tables", None)
+    if callable(batched):
+        yield from batched(window_days).items()
+        return
+    for component, test_id in storage.distinct_pairs(window_days):
+        yield (component, test_id), storage.contingency(component, test_id, window_days)
+
+
 def fisher_exact_right_tail(a: int, b: int, c: int, d: int) -> float:
     """Compute the one‑sided Fisher exact test p‑value for a 2x2 table.
 
@@ -78,25 +93,65 @@ def fisher_exact_right_tail(a: int, b: int, c: int, d: int) -> float:
         | a  b |
         | c  d |
     This returns the right‑tail probability P(X ≥ a) given fixed marginals.
+    Results are memoized on the marginals, so pairs sharing a table within a
+    ``compute_candidates`` run are only evaluated once.
     """
-    # Compute marginal totals
+    return _right_tail(a, a + b, c + d, a + c)
+
+
+@lru_cache(maxsize=65536)
+def _right_tail(a: int, row1: int, row2: int, col1: int) -> float:
+    """Sum hypergeometric terms in log space using the term-to-term ratio.
+
+    Only the side of the distribution that decreases away from the mode is
+    summed; when ``a`` lies at or below the mode the left tail is summed and
+    subtracted from one.  Summation stops once terms no longer change the
+    total, so long tails over large PR universes stay cheap.
+    """
+    n = row1 + row2
+    min_x = max(0, col1 - row2)
+    max_x = min(row1, col1)
+    if a > max_x:
+        return 0.0
+    if a <= min_x:
+        return 1.0
+    log_denom = _log_comb(n, col1)
+
+    def pmf(x: int) -> float:
+        return math.exp(_log_comb(row1, x) + _log_comb(row2, col1 - x) - log_denom)
+
+    mode = (row1 + 1) * (col1 + 1) // (n + 2)
+    if a > mode:
+        # P(X=x+1)/P(X=x) = (row1-x)(col1-x) / ((x+1)(row2-col1+x+1))
+        term = total = pmf(a)
+        for x in range(a, max_x):
+            term *= (row1 - x) * (col1 - x) / ((x + 1) * (row2 - col1 + x + 1))
+            if term <= total * 1e-17:
+                break
+            total += term
+        return min(1.0, total)
+    # P(X=x-1)/P(X=x) = x(row2-col1+x) / ((row1-x+1)(col1-x+1))
+    term = left = pmf(a - 1)
+    for x in range(a - 1, min_x, -1):
+        term *= x * (row2 - col1 + x) / ((row1 - x + 1) * (col1 - x + 1))
+        if term <= left * 1e-17:
+            break
+        left += term
+    return min(1.0, max(0.0, 1.0 - left))
+
+
+def _log_comb(n: int, k: int) -> float:
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def _exact_right_tail(a: int, b: int, c: int, d: int) -> float:
+    """Reference big-integer implementation of :func:`fisher_exact_right_tail`."""
     row1 = a + b
     row2 = c + d
     col1 = a + c
-    col2 = b + d
     n = row1 + row2
-
-    def hypergeom(x: int) -> float:
-        return (
-            math.comb(row1, x)
-            * math.comb(row2, col1 - x)
-            / math.comb(n, col1)
-        )
-
-    # Enumerate all possible values ≥ a that satisfy the marginals
-    min_x = max(0, col1 - row2)
     max_x = min(row1, col1)
-    p = 0.0
-    for x in range(a, max_x + 1):
-        p += hypergeom(x)
-    return min(1.0, p)
+    num = sum(
+        math.comb(row1, x) * math.comb(row2, col1 - x) for x in range(a, max_x + 1)
+    )
+    return min(1.0, num / math.comb(n, col1))
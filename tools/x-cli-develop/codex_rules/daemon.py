@@ -0,0 +1,217 @@
+"""Resident codex-rules server for low-latency hook calls.
+
+Every ``python -m codex_rules`` invocation pays for interpreter startup,
+argument parsing, configuration and YAML loading and opening SQLite.  The
+daemon pays those once: it keeps the configuration, the storage backend and
+the component mapping warm and serves CLI invocations over a Unix domain
+socket.  Use :mod:`codex_rules.client` to talk to it; the client runs the
+command in-process whenever no daemon is available.
+
+Only the commands hooks call repeatedly are served (``SERVED_COMMANDS``).
+Requests are handled one at a time, so the daemon is the single writer of
+its storage.  It serves the working directory it was started in and rejects
+requests from elsewhere, which makes the client fall back.  Restart it after
+changing ``.codex/rules.yml`` or the component mapping.
+
+With ``storage.backend: memory`` the snapshot may also be written by
+commands run outside the daemon (``analyze``, ``prune``, ``compact``...).
+The daemon reloads it whenever it changed on disk since the daemon last
+read or wrote it, before serving a command, and saves it after commands
+that changed the storage.
+
+Protocol: the client sends one JSON line ``{"argv": [...], "cwd": "..."}``
+and receives ``{"code": int, "stdout": str, "stderr": str}``, or
+``{"error": str}`` when the request was not executed.  ``{"op": "ping"}`` and
+``{"op": "shutdown"}`` are also understood.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Dict, List
+
+from .cli import main as cli_main, open_storage
+from .config import load_config
+from .mapping import ComponentMapping
+from .storage import InMemoryStorage
+
+# Socket used when neither --socket nor CODEX_RULES_SOCKET is given.
+DEFAULT_SOCKET_PATH = ".codex/cache/codex-rules.sock"
+SOCKET_ENV = "CODEX_RULES_SOCKET"
+SERVED_COMMANDS = frozenset(
+    {"emit-warnings", "check-compliance", "record-pr", "ingest-tests"}
+)
+
+
+def socket_path(path: str | None = None) -> str:
+    """Return the socket path from *path*, the environment or the default."""
+    return str(Path(path or os.environ.get(SOCKET_ENV) or DEFAULT_SOCKET_PATH).resolve())
+
+
+class RulesDaemon:
+    """Warm engine state plus request dispatch, independent of the transport."""
+
+    def __init__(self, config: Dict | None = None) -> None:
+        self.cwd = os.getcwd()
+        self.config = config if config is not None else load_config()
+        self.storage, self.snapshot_path = open_storage(self.config)
+        self._snapshot_seen = self._snapshot_stamp()
+        self.mapping = ComponentMapping(
+            self.config.get("components_file", ".codex/components.yml")
+        )
+        self.stopping = False
+
+    def _snapshot_stamp(self) -> tuple | None:
+        if not self.snapshot_path:
+            return None
+        try:
+            st = os.stat(self.snapshot_path)
+        except OSError:
+            return None
+        # Snapshots are replaced atomically, so the inode changes too.
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _refresh_snapshot(self) -> None:
+        """Reload the in-memory storage if another process rewrote its snapshot."""
+        stamp = self._snapshot_stamp()
+        if stamp == self._snapshot_seen:
+            return
+        if stamp is None:
+            self.storage = InMemoryStorage(self.snapshot_path)
+        else:
+            self.storage = InMemoryStorage.restore(self.snapshot_path)
+        self._snapshot_seen = stamp
+
+    def dispatch(self, request: Dict) -> Dict:
+        """Execute one request and return the response object."""
+        op = request.get("op", "run")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "cwd": self.cwd}
+        if op == "shutdown":
+            self.stopping = True
+            return {"ok": True}
+        argv = request.get("argv")
+        if op != "run" or not isinstance(argv, list) or not argv:
+            return {"error": f"malformed request: {request!r}"}
+        if argv[0] not in SERVED_COMMANDS:
+            return {"error": f"command {argv[0]!r} is not served by the daemon"}
+        if request.get("cwd") != self.cwd:
+            return {"error": f"daemon serves {self.cwd}, not {request.get('cwd')}"}
+        if self.snapshot_path:
+            try:
+                self._refresh_snapshot()
+            except (OSError, ValueError) as exc:
+                return {"error": f"cannot reload {self.snapshot_path}: {exc}"}
+        out, err = io.StringIO(), io.StringIO()
+        code = 0
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                cli_main(
+                    [str(a) for a in argv],
+                    storage=self.storage,
+                    config=self.config,
+                    mapping=self.mapping,
+                )
+            except SystemExit as exc:
+                if isinstance(exc.code, int) or exc.code is None:
+                    code = exc.code or 0
+                else:
+                    print(exc.code, file=sys.stderr)
+                    code = 1
+            except Exception:
+                traceback.print_exc()
+                code = 1
+        if self.snapshot_path and self.storage.dirty:
+            self.storage.snapshot(self.snapshot_path)
+            self._snapshot_seen = self._snapshot_stamp()
+        return {"code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+        except ValueError:
+            response: Dict = {"error": "request is not valid JSON"}
+        else:
+            response = self.server.rules.dispatch(request)  # type: ignore[attr-defined]
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class RulesServer(socketserver.UnixStreamServer):
+    """Unix socket server handling one request at a time."""
+
+    def __init__(self, path: str, rules: RulesDaemon) -> None:
+        self.rules = rules
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        _remove_stale_socket(path)
+        # Create the socket owner-only (0600) at bind time, rather than
+        # chmod-ing it after it was already reachable.
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Delete *path* if it is a socket nobody is listening on."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"a codex-rules daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def serve(path: str | None = None, config: Dict | None = None) -> None:
+    """Serve requests on the Unix socket at *path* until shut down."""
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("the codex-rules daemon requires Unix domain sockets")
+    rules = RulesDaemon(config)
+    server = RulesServer(socket_path(path), rules)
+    try:
+        while not rules.stopping:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv: List[str] | None = None) -> None:
+    """Start the daemon in the current working directory."""
+    parser = argparse.ArgumentParser(description="codex rules engine daemon")
+    parser.add_argument(
+        "--socket",
+        help=f"Unix socket path (default: ${SOCKET_ENV} or {DEFAULT_SOCKET_PATH})",
+    )
+    args = parser.parse_args(argv)
+    path = socket_path(args.socket)
+    print(f"[codex-rules] daemon listening on {path}", file=sys.stderr)
+    serve(path)
+
+
+if __name__ == "__main__":
+    main()
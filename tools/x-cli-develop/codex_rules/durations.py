@@ -0,0 +1,193 @@
+"""Test-duration analytics over the stored test events.
+
+``analyze_durations`` makes one pass over the duration samples of a window,
+in time order, and keeps a streaming P² quantile sketch per test for the
+median and the 95th percentile (five markers each, however long the
+history).  From them it reports:
+
+* per-test p50/p95 with the run count, maximum and total time;
+* the slowest tests of every component, ranked by p95 or total time;
+* duration regressions: runs in a PR that took more than ``factor`` times
+  the test's p95 over the samples *before* that run, once the test has at
+  least ``min_samples`` runs.  ``min_delta_ms`` ignores slowdowns too
+  small to matter for the pipeline.
+
+The sketches follow Jain & Chlamtac, "The P² algorithm for dynamic
+calculation of quantiles and histograms without storing observations"
+(CACM 28(10), 1985).
+
+A sample may stand for several runs (a day compacted by
+``Storage.compact``): it then adds its ``runs`` to the count, ``runs``
+times its mean to the total time and its maximum to the maximum, while the
+sketches see its mean once.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right, insort
+from typing import Dict, Iterable, List, Tuple
+
+# Defaults for the ``durations`` section of the config.
+DEFAULT_FACTOR = 1.5
+DEFAULT_MIN_SAMPLES = 5
+DEFAULT_MIN_DELTA_MS = 50.0
+RANK_KEYS = ("p95", "total")
+
+
+class P2Quantile:
+    """Streaming estimate of the *p*-quantile in constant memory."""
+
+    __slots__ = ("p", "count", "_q", "_n", "_want", "_step")
+
+    def __init__(self, p: float) -> None:
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"quantile must be in (0, 1), got {p}")
+        self.p = p
+        self.count = 0
+        self._q: List[float] = []  # marker heights
+        self._n = [0, 1, 2, 3, 4]  # marker positions
+        self._want = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]  # desired positions
+        self._step = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        q = self._q
+        if self.count <= 5:
+            insort(q, x)
+            return
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = bisect_right(q, x) - 1
+        n = self._n
+        for i in range(k + 1, 5):
+            n[i] += 1
+        want = self._want
+        for i in range(5):
+            want[i] += self._step[i]
+        for i in (1, 2, 3):
+            d = want[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                height = self._parabolic(i, s)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                q[i] = height
+                n[i] += s
+
+    def _parabolic(self, i: int, s: int) -> float:
+        q, n = self._q, self._n
+        return q[i] + s / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float | None:
+        """Return the estimate, exact (interpolated) for up to five samples."""
+        if not self.count:
+            return None
+        if self.count > 5:
+            return self._q[2]
+        q = self._q
+        pos = self.p * (len(q) - 1)
+        lo = int(pos)
+        hi = min(lo + 1, len(q) - 1)
+        return q[lo] + (q[hi] - q[lo]) * (pos - lo)
+
+
+class _TestDurations:
+    __slots__ = ("component", "p50", "p95", "count", "max_ms", "total_ms")
+
+    def __init__(self) -> None:
+        self.component: str | None = None
+        self.p50 = P2Quantile(0.5)
+        self.p95 = P2Quantile(0.95)
+        self.count = 0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+
+    def add(self, duration_ms: float, component: str | None, runs: int, max_ms: float) -> None:
+        self.p50.add(duration_ms)
+        self.p95.add(duration_ms)
+        self.count += runs
+        self.max_ms = max(self.max_ms, max_ms)
+        self.total_ms += duration_ms * runs
+        if component:
+            self.component = component
+
+    def summary(self) -> Dict:
+        return {
+            "component": self.component,
+            "count": self.count,
+            "p50_ms": round(self.p50.value(), 3),
+            "p95_ms": round(self.p95.value(), 3),
+            "max_ms": round(self.max_ms, 3),
+            "total_ms": round(self.total_ms, 3),
+        }
+
+
+def analyze_durations(
+    samples: Iterable[Tuple],
+    *,
+    top: int = 10,
+    rank_by: str = "p95",
+    factor: float = DEFAULT_FACTOR,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> Dict:
+    """Summarize ``(ts, pr_id, test_id, component, duration_ms, runs, max_ms)``
+    samples, where ``duration_ms`` is the mean of ``runs`` runs.
+
+    *samples* must be in time order (see ``StorageProtocol.duration_samples``).
+    Returns ``samples`` (runs seen), ``tests`` (per-test summaries),
+    ``slowest`` (component -> the *top* tests by *rank_by*) and
+    ``regressions`` (ordered by PR, then by ``ratio`` descending).
+    """
+    if rank_by not in RANK_KEYS:
+        raise ValueError(f"rank_by must be one of {RANK_KEYS}, got {rank_by!r}")
+    tests: Dict[str, _TestDurations] = {}
+    # (pr_id, test_id) -> worst regressing run of that test in the PR.
+    worst: Dict[Tuple[int, str], Dict] = {}
+    count = 0
+    for _ts, pr_id, test_id, component, duration_ms, runs, max_ms in samples:
+        count += runs
+        stats = tests.get(test_id)
+        if stats is None:
+            stats = tests[test_id] = _TestDurations()
+        if stats.count >= min_samples:
+            baseline = stats.p95.value()
+            if duration_ms > baseline * factor and duration_ms - baseline >= min_delta_ms:
+                # Sub-millisecond baselines count as 1 ms to keep ratios finite.
+                ratio = duration_ms / max(baseline, 1.0)
+                key = (pr_id, test_id)
+                if key not in worst or ratio > worst[key]["ratio"]:
+                    worst[key] = {
+                        "pr_id": pr_id,
+                        "test_id": test_id,
+                        "component": component,
+                        "duration_ms": round(duration_ms, 3),
+                        "baseline_p95_ms": round(baseline, 3),
+                        "ratio": round(ratio, 3),
+                    }
+        stats.add(duration_ms, component, runs, max_ms)
+
+    summaries = {test_id: stats.summary() for test_id, stats in tests.items()}
+    by_component: Dict[str, List[Tuple[str, Dict]]] = {}
+    for test_id, summary in summaries.items():
+        by_component.setdefault(summary["component"] or "", []).append((test_id, summary))
+    slowest = {}
+    for component in sorted(by_component):
+        ranked = sorted(
+            by_component[component], key=lambda item: (-item[1][f"{rank_by}_ms"], item[0])
+        )
+        slowest[component] = [{"test_id": t, **s} for t, s in ranked[:top]]
+    regressions = sorted(worst.values(), key=lambda r: (r["pr_id"], -r["ratio"], r["test_id"]))
+    return {
+        "samples": count,
+        "tests": summaries,
+        "slowest": slowest,
+        "regressions": regressions,
+    }
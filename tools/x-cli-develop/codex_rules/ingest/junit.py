@@ -1,13 +1,14 @@
 """JUnit XML ingestor for the codex rules engine.
 
 Parses JUnit XML files (as produced by Maven/Surefire, pytest‑junit, etc.) and
-emits a list of normalized test case records.  Only failing test cases are
-relevant for rule generation; however, passed tests are included for completeness.
+emits normalized test case records, either as a list (``parse_junit``) or
+lazily (``iter_junit``).  Only failing test cases are relevant for rule
+generation; however, passed tests are included for completeness.
 """
 from __future__ import annotations
 
 import xml.etree.ElementTree as ET
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
 
 def parse_junit(path: str) -> List[Dict]:
@@ -20,37 +21,55 @@ def parse_junit(path: str) -> List[Dict]:
       - duration_ms: runtime in milliseconds (if provided)
       - file: file hint (if provided in the testcase attributes)
     """
-    results: List[Dict] = []
-    tree = ET.parse(path)
-    root = tree.getroot()
-    for tc in root.iter("testcase"):
-        class_name = tc.attrib.get("classname", "")
-        name = tc.attrib.get("name", "")
-        test_id = f"{class_name}#{name}"
-        suite = class_name
-        # duration in seconds; convert to ms
-        dur_ms = 0
-        if "time" in tc.attrib:
-            try:
-                dur_ms = int(float(tc.attrib["time"]) * 1000)
-            except ValueError:
-                pass
-        # Determine file hint if present
-        file_hint = tc.attrib.get("file", "")
-        status = "passed"
-        # Check for failures or errors
-        for child in tc:
-            tag = child.tag.lower()
-            if tag in {"failure", "error"}:
-                status = "failed"
-                break
-        results.append(
-            {
-                "test_id": test_id,
-                "suite": suite,
-                "status": status,
-                "duration_ms": dur_ms,
-                "file": file_hint,
-            }
-        )
-    return results
+    return list(iter_junit(path))
+
+
+def iter_junit(path: str) -> Iterator[Dict]:
+    """Yield the records of :func:`parse_junit` while streaming the file.
+
+    The XML is read with ``iterparse`` and every ``testcase`` element is
+    detached from its parent once converted, so memory use stays flat no
+    matter how large the report is.
+    """
+    stack: List[ET.Element] = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag != "testcase":
+            continue
+        yield _testcase_record(elem)
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+
+def _testcase_record(tc: ET.Element) -> Dict:
+    class_name = tc.attrib.get("classname", "")
+    name = tc.attrib.get("name", "")
+    test_id = f"{class_name}#{name}"
+    suite = class_name
+    # duration in seconds; convert to ms
+    dur_ms = 0
+    if "time" in tc.attrib:
+        try:
+            dur_ms = int(float(tc.attrib["time"]) * 1000)
+        except ValueError:
+            pass
+    # Determine file hint if present
+    file_hint = tc.attrib.get("file", "")
+    status = "passed"
+    # Check for failures or errors
+    for child in tc:
+        tag = child.tag.lower()
+        if tag in {"failure", "error"}:
+            status = "failed"
+            break
+    return {
+        "test_id": test_id,
+        "suite": suite,
+        "status": status,
+        "duration_ms": dur_ms,
+        "file": file_hint,
+    }
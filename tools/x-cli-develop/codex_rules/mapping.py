@@ -3,13 +3,23 @@
 Component mapping is defined in `.codex/components.yml`.  Each component
 specifies a list of globs that match files belonging to that component.  The
 mapping also supports retrieving a default pre‑emptive command and owners.
+
+All globs are compiled once into a single alternation whose branches keep
+the declaration order, so one regex match replaces the per-glob ``fnmatch``
+loop while preserving first-match semantics.  Resolved paths are memoized.
 """
 from __future__ import annotations
 
 import fnmatch
 import json
+import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Pattern, Tuple
+
+# Upper bound on memoized path lookups per mapping.
+PATH_CACHE_SIZE = 65536
 
 
 class ComponentMapping:
@@ -26,6 +36,8 @@ class ComponentMapping:
             except Exception:
                 data = json.loads(content)
             self.components = data.get("components", {})
+        self._matcher, self._owners = _compile(self.components)
+        self._resolve = lru_cache(maxsize=PATH_CACHE_SIZE)(self._match)
 
     def component_for_path(self, path: str) -> str:
         """Return the component name for the given file path.
@@ -33,12 +45,14 @@ class ComponentMapping:
         The first component whose glob matches the path is returned.  If no
         mapping matches, ``unknown`` is returned.
         """
-        norm = path.replace("\\", "/")
-        for comp, spec in self.components.items():
-            for pat in spec.get("globs", []):
-                if fnmatch.fnmatch(norm, pat):
-                    return comp
-        return "unknown"
+        return self._resolve(path)
+
+    def _match(self, path: str) -> str:
+        if self._matcher is None:
+            return "unknown"
+        # Normalize like fnmatch.fnmatch (case/separators on Windows).
+        m = self._matcher.match(os.path.normcase(path.replace("\\", "/")))
+        return self._owners[m.lastgroup] if m else "unknown"
 
     def default_command_for(self, component: str) -> Optional[str]:
         """Return the default pre‑emptive command for the component."""
@@ -46,3 +60,21 @@ class ComponentMapping:
         if comp:
             return comp.get("default_preempt_command")
         return None
+
+
+def _compile(components: Dict[str, Dict]) -> Tuple[Optional[Pattern[str]], Dict[str, str]]:
+    """Return one regex matching any glob plus a group-name -> component map.
+
+    Each glob becomes a named branch; regex alternation tries branches left
+    to right, so the first declared glob that matches still wins.
+    """
+    branches: List[str] = []
+    owners: Dict[str, str] = {}
+    for comp, spec in components.items():
+        for pat in spec.get("globs", []):
+            name = f"glob{len(branches)}"
+            owners[name] = comp
+            branches.append(f"(?P<{name}>{fnmatch.translate(os.path.normcase(pat))})")
+    if not branches:
+        return None, owners
+    return re.compile("|".join(branches)), owners
@@ -35,16 +35,40 @@ def _detect_repo_root() -> Path:
         return Path.cwd()
 
 
-REPO_ROOT = _detect_repo_root()
-MEMORY_PATH = REPO_ROOT / ".codex" / "memory.json"
+# ``REPO_ROOT`` and ``MEMORY_PATH`` are resolved on first access (which runs
+# ``git``) and then cached as module globals; assigning them overrides the
+# detected values.  Reloading the module forgets both.
+_LAZY_PATHS = ("REPO_ROOT", "MEMORY_PATH")
+for _name in _LAZY_PATHS:
+    globals().pop(_name, None)
+
+
+def _resolve(name: str) -> Path:
+    try:
+        return globals()[name]
+    except KeyError:
+        pass
+    if name == "REPO_ROOT":
+        value = _detect_repo_root()
+    else:
+        value = _resolve("REPO_ROOT") / ".codex" / "memory.json"
+    globals()[name] = value
+    return value
+
+
+def __getattr__(name: str) -> Path:
+    if name in _LAZY_PATHS:
+        return _resolve(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def load_memory() -> List[Dict[str, Any]]:
     """Return the list of memory entries (empty list if file missing)."""
-    if not MEMORY_PATH.exists():
+    memory_path = _resolve("MEMORY_PATH")
+    if not memory_path.exists():
         return []
     try:
-        data = json.loads(MEMORY_PATH.read_text(encoding="utf-8"))
+        data = json.loads(memory_path.read_text(encoding="utf-8"))
     except Exception:
         return []
     entries = data.get("entries", [])
@@ -67,6 +91,7 @@ def append_entry(entry: Dict[str, Any]) -> None:
         else:
             entry["timestamp"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
     memory.append(entry)
-    MEMORY_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with MEMORY_PATH.open("w", encoding="utf-8") as f:
+    memory_path = _resolve("MEMORY_PATH")
+    memory_path.parent.mkdir(parents=True, exist_ok=True)
+    with memory_path.open("w", encoding="utf-8") as f:
         json.dump({"entries": memory}, f, indent=2)
@@ -4,15 +4,113 @@ This module manages the underlying SQLite database used by the engine.  It
 stores PR metadata, touched files, test events, and guidance rules.  It
 provides methods to record events, query statistics, and perform basic
 aggregation for association analysis.
+
+Association counts are materialized incrementally: every recorded PR and
+test event updates per-window counters (``pair_windows`` and friends), and
+moving a window forward only decrements the events that slid out of it.
+
+Concurrent writers are tolerated: connections wait up to
+``BUSY_TIMEOUT_S`` for the write lock, write transactions start with
+``BEGIN IMMEDIATE`` (retried with backoff), and test events go through a
+:class:`~codex_rules.write_queue.WriteQueue` that merges the batches of
+concurrent ingest processes into shared transactions.
+
+Raw test events are kept for ``raw_days``; :meth:`Storage.compact` rolls
+older ones up into one ``test_event_days`` row per day, PR, test and
+component, and expires everything older than the largest analysis window.
+
+:class:`InMemoryStorage` implements the same protocol without SQLite, using
+PR bitsets, and can snapshot itself to a compact binary file.
 """
 from __future__ import annotations
 
 import json
 import os
+import random
 import sqlite3
+import struct
+import time
+import zlib
+from array import array
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple, Protocol
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Protocol
+
+from .write_queue import Batch, WriteQueue
+
+# Bumped whenever _init_schema learns a new migration; stored in user_version.
+SCHEMA_VERSION = 3
+STATUS_PASSED = 0
+STATUS_FAILED = 1
+# InMemoryStorage snapshot header; bump the version when the layout changes.
+SNAPSHOT_MAGIC = b"CXRULES\x00"
+SNAPSHOT_VERSION = 1
+# Seconds a connection waits for another writer's lock before failing.
+BUSY_TIMEOUT_S = 30.0
+# Attempts to start a write transaction when the lock stays busy.
+WRITE_RETRIES = 5
+
+_EVENT_FIELDS = (
+    "run_id",
+    "pr_id",
+    "commit_sha",
+    "test_id",
+    "suite",
+    "status",
+    "duration_ms",
+    "component",
+    "file_hint",
+    "ts",
+)
+_EVENT_NUMERIC = frozenset({"pr_id", "duration_ms"})
+_GUIDANCE_FIELDS = (
+    "rule_id",
+    "component",
+    "test_id",
+    "support_prs",
+    "confidence",
+    "baseline",
+    "lift",
+    "p_value",
+    "template",
+    "command",
+)
+
+# Column order of the rows yielded by ``export_rows`` for each table.
+EXPORT_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "test_events": _EVENT_FIELDS,
+    "test_event_days": (
+        "day",
+        "pr_id",
+        "test_id",
+        "component",
+        "runs",
+        "failed",
+        "duration_ms",
+        "max_duration_ms",
+        "ts",
+        "failed_ts",
+    ),
+    "pr_files": ("pr_id", "path", "status", "component"),
+    "guidance": _GUIDANCE_FIELDS + ("active", "last_seen", "created_at"),
+}
+
+
+def _as_number(value: float) -> int | float:
+    """Return *value* as an int when it has no fractional part."""
+    return int(value) if value.is_integer() else value
+
+
+def _is_busy(exc: sqlite3.OperationalError) -> bool:
+    message = str(exc)
+    return "locked" in message or "busy" in message
+
+
+def _cutoff(window_days: int) -> str:
+    """Return the ISO timestamp marking the start of a ``window_days`` window."""
+    return (datetime.now(timezone.utc) - timedelta(days=window_days)).isoformat()
 
 
 class StorageProtocol(Protocol):
@@ -43,12 +141,18 @@ class StorageProtocol(Protocol):
         ts: str,
     ) -> None: ...
 
+    def record_test_events(self, events: Iterable[Dict]) -> None: ...
+
     def distinct_pairs(self, window_days: int) -> Iterable[Tuple[str, str]]: ...
 
     def contingency(
         self, component: str, test_id: str, window_days: int
     ) -> Tuple[int, int, int, int]: ...
 
+    def contingency_tables(
+        self, window_days: int
+    ) -> Dict[Tuple[str, str], Tuple[int, int, int, int]]: ...
+
     def upsert_guidance(self, rule: Dict) -> None: ...
 
     def get_components_for_pr(self, pr_id: int) -> List[str]: ...
@@ -59,10 +163,35 @@ class StorageProtocol(Protocol):
 
     def get_active_guidance(self) -> List[Dict]: ...
 
-    def prune_guidance(self, window_days: int, last_n: int | None) -> None: ...
+    def prune_guidance(self, window_days: int, last_n: int | None) -> Dict: ...
+
+    def compact(self, raw_days: int, window_days: int, *, vacuum: bool = True) -> Dict: ...
 
     def export_stats(self) -> Dict: ...
 
+    def export_rows(self, table: str) -> Iterator[Tuple]: ...
+
+    def duration_samples(self, window_days: int) -> Iterator[Tuple]: ...
+
+
+class _GuidanceSnapshot:
+    """Active guidance rules in table order, indexed by component."""
+
+    def __init__(self, stamp: Tuple[str, int], rules: List[Dict]) -> None:
+        self.stamp = stamp
+        # Same order as ``ORDER BY component, lift DESC`` (NULL lifts last).
+        self.ordered = sorted(
+            rules,
+            key=lambda r: (r["component"], r["lift"] is None, -(r["lift"] or 0)),
+        )
+        self.by_component: Dict[str, List[Tuple[int, Dict]]] = {}
+        for pos, rule in enumerate(rules):
+            self.by_component.setdefault(rule["component"], []).append((pos, rule))
+
+
+# Per-process guidance snapshots keyed by resolved database path.
+_GUIDANCE_SNAPSHOTS: Dict[str, _GuidanceSnapshot] = {}
+
 
 class Storage:
     """Encapsulates an SQLite database used by the rules engine."""
@@ -72,12 +201,16 @@ class Storage:
         # Ensure parent directory exists
         self.path.parent.mkdir(parents=True, exist_ok=True)
         # Enable WAL to avoid locking issues under concurrent writes
-        self.conn = sqlite3.connect(self.path.as_posix(), isolation_level=None)
+        self.conn = sqlite3.connect(
+            self.path.as_posix(), isolation_level=None, timeout=BUSY_TIMEOUT_S
+        )
         self.conn.execute("PRAGMA journal_mode=WAL;")
         self._init_schema()
+        self._queue = WriteQueue(self)
 
     def _init_schema(self) -> None:
-        """Create tables if they do not exist."""
+        """Create tables if they do not exist and migrate older layouts."""
+        self._dims: Dict[str, Dict[str, int]] = {}
         cur = self.conn.cursor()
         cur.executescript(
             """
@@ -97,20 +230,64 @@ class Storage:
                 PRIMARY KEY (pr_id, path)
             );
 
-            CREATE TABLE IF NOT EXISTS test_events (
+            -- Interned dimensions referenced by test_event_rows.
+            CREATE TABLE IF NOT EXISTS dim_test (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE
+            );
+
+            CREATE TABLE IF NOT EXISTS dim_suite (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE
+            );
+
+            CREATE TABLE IF NOT EXISTS dim_component (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE
+            );
+
+            CREATE TABLE IF NOT EXISTS dim_status (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE
+            );
+            INSERT OR IGNORE INTO dim_status (id, name) VALUES (0, 'passed'), (1, 'failed');
+
+            CREATE TABLE IF NOT EXISTS test_event_rows (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 run_id TEXT,
                 pr_id INTEGER,
                 commit_sha TEXT,
-                test_id TEXT,
-                suite TEXT,
-                status TEXT,
+                test_key INTEGER REFERENCES dim_test (id),
+                suite_key INTEGER REFERENCES dim_suite (id),
+                status_code INTEGER REFERENCES dim_status (id),
                 duration_ms INTEGER,
-                component TEXT,
+                component_key INTEGER REFERENCES dim_component (id),
                 file_hint TEXT,
                 ts TEXT
             );
 
+            -- Per-day rollups of compacted test_event_rows.  ``ts`` and
+            -- ``failed_ts`` keep the latest (failing) event, so window
+            -- membership (``ts >= cutoff``) is the same as for the raw rows.
+            CREATE TABLE IF NOT EXISTS test_event_days (
+                day TEXT,
+                pr_id INTEGER,
+                test_key INTEGER REFERENCES dim_test (id),
+                component_key INTEGER REFERENCES dim_component (id),
+                runs INTEGER,
+                failed INTEGER,
+                duration_ms INTEGER,
+                max_duration_ms INTEGER,
+                ts TEXT,
+                failed_ts TEXT,
+                PRIMARY KEY (day, pr_id, test_key, component_key)
+            );
+
+            -- Spooled write-queue batches committed but not yet cleaned up.
+            CREATE TABLE IF NOT EXISTS ingest_batches (
+                batch_id TEXT PRIMARY KEY
+            );
+
             CREATE TABLE IF NOT EXISTS guidance (
                 rule_id TEXT PRIMARY KEY,
                 component TEXT,
@@ -127,47 +304,254 @@ class Storage:
                 command TEXT
             );
 
-            CREATE INDEX IF NOT EXISTS idx_test_events_pr ON test_events (pr_id);
-            CREATE INDEX IF NOT EXISTS idx_test_events_component ON test_events (component);
-            CREATE INDEX IF NOT EXISTS idx_test_events_test ON test_events (test_id, status);
+            -- Bumped on every guidance write so cached snapshots can be
+            -- validated without reading the guidance table; the token tells
+            -- apart databases recreated at the same path.
+            CREATE TABLE IF NOT EXISTS guidance_version (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                token TEXT NOT NULL,
+                version INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO guidance_version (id, token, version)
+            VALUES (0, lower(hex(randomblob(8))), 0);
+            CREATE TRIGGER IF NOT EXISTS guidance_version_insert AFTER INSERT ON guidance
+            BEGIN UPDATE guidance_version SET version = version + 1; END;
+            CREATE TRIGGER IF NOT EXISTS guidance_version_update AFTER UPDATE ON guidance
+            BEGIN UPDATE guidance_version SET version = version + 1; END;
+            CREATE TRIGGER IF NOT EXISTS guidance_version_delete AFTER DELETE ON guidance
+            BEGIN UPDATE guidance_version SET version = version + 1; END;
+
+            -- Latest event per PR / failure per (PR, test) / failing pair;
+            -- window membership is decided by comparing these to a cutoff.
+            CREATE TABLE IF NOT EXISTS pr_last_event (
+                pr_id INTEGER PRIMARY KEY,
+                ts TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS pr_test_failures (
+                pr_id INTEGER,
+                test_id TEXT,
+                ts TEXT,
+                PRIMARY KEY (pr_id, test_id)
+            );
+
+            CREATE TABLE IF NOT EXISTS failing_pairs (
+                component TEXT,
+                test_id TEXT,
+                ts TEXT,
+                PRIMARY KEY (component, test_id)
+            );
+
+            -- Materialized contingency counters, one set per window length.
+            CREATE TABLE IF NOT EXISTS pair_windows (
+                window_days INTEGER PRIMARY KEY,
+                cutoff TEXT,
+                universe INTEGER
+            );
+
+            CREATE TABLE IF NOT EXISTS pair_window_components (
+                window_days INTEGER,
+                component TEXT,
+                touched INTEGER,
+                touched_window INTEGER,
+                PRIMARY KEY (window_days, component)
+            );
+
+            CREATE TABLE IF NOT EXISTS pair_window_tests (
+                window_days INTEGER,
+                test_id TEXT,
+                failed INTEGER,
+                PRIMARY KEY (window_days, test_id)
+            );
+
+            CREATE TABLE IF NOT EXISTS pair_counts (
+                window_days INTEGER,
+                component TEXT,
+                test_id TEXT,
+                a INTEGER,
+                PRIMARY KEY (window_days, component, test_id)
+            );
+
+            -- Covering indexes for the windowed scans: failures by time,
+            -- failures of one test, and PRs seen since a cutoff.
+            CREATE INDEX IF NOT EXISTS idx_event_rows_failed
+              ON test_event_rows (status_code, ts, component_key, test_key, pr_id);
+            CREATE INDEX IF NOT EXISTS idx_event_rows_test
+              ON test_event_rows (test_key, status_code, ts, pr_id);
+            CREATE INDEX IF NOT EXISTS idx_event_rows_ts ON test_event_rows (ts, pr_id);
+            CREATE INDEX IF NOT EXISTS idx_event_rows_pr ON test_event_rows (pr_id);
+            CREATE INDEX IF NOT EXISTS idx_event_days_ts ON test_event_days (ts, pr_id);
+            CREATE INDEX IF NOT EXISTS idx_event_days_failed
+              ON test_event_days (failed_ts, component_key, test_key, pr_id);
             CREATE INDEX IF NOT EXISTS idx_pr_files_component ON pr_files (component);
+            CREATE INDEX IF NOT EXISTS idx_pr_last_event_ts ON pr_last_event (ts);
+            CREATE INDEX IF NOT EXISTS idx_pr_test_failures_ts ON pr_test_failures (ts);
+            CREATE INDEX IF NOT EXISTS idx_failing_pairs_ts ON failing_pairs (ts);
             """
         )
 
-        # --- Migration: rename reserved 'commit' column to 'commit_sha' ---
-        cur.execute("PRAGMA table_info(test_events)")
-        cols = [row[1] for row in cur.fetchall()]
-        if "commit" in cols and "commit_sha" not in cols:
+        cur.execute("SELECT type FROM sqlite_master WHERE name = 'test_events'")
+        row = cur.fetchone()
+        if row and row[0] == "table":
+            # --- Migration: rename reserved 'commit' column to 'commit_sha' ---
+            cur.execute("PRAGMA table_info(test_events)")
+            cols = [row[1] for row in cur.fetchall()]
+            if "commit" in cols and "commit_sha" not in cols:
+                try:
+                    cur.execute("ALTER TABLE test_events RENAME COLUMN commit TO commit_sha")
+                except sqlite3.OperationalError:
+                    # Fallback for old SQLite versions without RENAME COLUMN
+                    cur.executescript(
+                        """
+                        CREATE TABLE IF NOT EXISTS test_events_new (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            run_id TEXT,
+                            pr_id INTEGER,
+                            commit_sha TEXT,
+                            test_id TEXT,
+                            suite TEXT,
+                            status TEXT,
+                            duration_ms INTEGER,
+                            component TEXT,
+                            file_hint TEXT,
+                            ts TEXT
+                        );
+                        INSERT INTO test_events_new
+                            (id, run_id, pr_id, commit_sha, test_id, suite, status, duration_ms, component, file_hint, ts)
+                        SELECT id, run_id, pr_id, "commit", test_id, suite, status, duration_ms, component, file_hint, ts
+                        FROM test_events;
+                        DROP TABLE test_events;
+                        ALTER TABLE test_events_new RENAME TO test_events;
+                        CREATE INDEX IF NOT EXISTS idx_test_events_pr ON test_events (pr_id);
+                        CREATE INDEX IF NOT EXISTS idx_test_events_component ON test_events (component);
+                        CREATE INDEX IF NOT EXISTS idx_test_events_test ON test_events (test_id, status);
+                        """
+                    )
+
+            # --- Migration: intern the legacy TEXT columns (schema 2) ---
+            cur.executescript(
+                """
+                BEGIN;
+                INSERT OR IGNORE INTO dim_test (name)
+                  SELECT DISTINCT test_id FROM test_events WHERE test_id IS NOT NULL;
+                INSERT OR IGNORE INTO dim_suite (name)
+                  SELECT DISTINCT suite FROM test_events WHERE suite IS NOT NULL;
+                INSERT OR IGNORE INTO dim_component (name)
+                  SELECT DISTINCT component FROM test_events WHERE component IS NOT NULL;
+                INSERT OR IGNORE INTO dim_status (name)
+                  SELECT DISTINCT status FROM test_events WHERE status IS NOT NULL;
+                INSERT INTO test_event_rows
+                  (id, run_id, pr_id, commit_sha, test_key, suite_key, status_code,
+                   duration_ms, component_key, file_hint, ts)
+                SELECT e.id, e.run_id, e.pr_id, e.commit_sha, t.id, s.id, st.id,
+                       e.duration_ms, c.id, e.file_hint, e.ts
+                FROM test_events e
+                LEFT JOIN dim_test t ON t.name = e.test_id
+                LEFT JOIN dim_suite s ON s.name = e.suite
+                LEFT JOIN dim_status st ON st.name = e.status
+                LEFT JOIN dim_component c ON c.name = e.component
+                ORDER BY e.id;
+                DROP TABLE test_events;
+                COMMIT;
+                """
+            )
+
+        # Read-only view with the original column layout.
+        cur.execute(
+            """
+            CREATE VIEW IF NOT EXISTS test_events AS
+            SELECT e.id, e.run_id, e.pr_id, e.commit_sha, t.name AS test_id,
+                   s.name AS suite, st.name AS status, e.duration_ms,
+                   c.name AS component, e.file_hint, e.ts
+            FROM test_event_rows e
+            LEFT JOIN dim_test t ON t.id = e.test_key
+            LEFT JOIN dim_suite s ON s.id = e.suite_key
+            LEFT JOIN dim_status st ON st.id = e.status_code
+            LEFT JOIN dim_component c ON c.id = e.component_key
+            """
+        )
+        # --- Migration: per-day maximum duration of rollups (schema 3) ---
+        cur.execute("PRAGMA table_info(test_event_days)")
+        if "max_duration_ms" not in [row[1] for row in cur.fetchall()]:
+            cur.execute("ALTER TABLE test_event_days ADD COLUMN max_duration_ms INTEGER")
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        # --- Migration: backfill incremental summaries for existing databases ---
+        cur.execute("SELECT EXISTS (SELECT 1 FROM pr_last_event)")
+        has_summary = cur.fetchone()[0]
+        cur.execute("SELECT EXISTS (SELECT 1 FROM test_event_rows)")
+        has_events = cur.fetchone()[0]
+        if has_events and not has_summary:
+            cur.executescript(
+                """
+                INSERT OR REPLACE INTO pr_last_event (pr_id, ts)
+                SELECT pr_id, MAX(ts) FROM test_events GROUP BY pr_id;
+                INSERT OR REPLACE INTO pr_test_failures (pr_id, test_id, ts)
+                SELECT pr_id, test_id, MAX(ts) FROM test_events
+                WHERE status = 'failed' GROUP BY pr_id, test_id;
+                INSERT OR REPLACE INTO failing_pairs (component, test_id, ts)
+                SELECT component, test_id, MAX(ts) FROM test_events
+                WHERE status = 'failed' AND component != 'unknown'
+                GROUP BY component, test_id;
+                DELETE FROM pair_windows;
+                """
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Run the enclosed statements in a single transaction (re-entrant)."""
+        if self.conn.in_transaction:
+            yield
+            return
+        self._begin()
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            # Interned ids handed out inside the transaction are gone too.
+            self._dims.clear()
+            raise
+        self.conn.execute("COMMIT")
+
+    def _begin(self) -> None:
+        """Start a write transaction, retrying while the database stays busy.
+
+        ``BEGIN IMMEDIATE`` takes the write lock up front (waiting up to
+        ``BUSY_TIMEOUT_S``), so a transaction never fails half-way because
+        another process committed first.
+        """
+        delay = 0.05
+        for attempt in range(WRITE_RETRIES):
             try:
-                cur.execute("ALTER TABLE test_events RENAME COLUMN commit TO commit_sha")
-            except sqlite3.OperationalError:
-                # Fallback for old SQLite versions without RENAME COLUMN
-                cur.executescript(
-                    """
-                    CREATE TABLE IF NOT EXISTS test_events_new (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        run_id TEXT,
-                        pr_id INTEGER,
-                        commit_sha TEXT,
-                        test_id TEXT,
-                        suite TEXT,
-                        status TEXT,
-                        duration_ms INTEGER,
-                        component TEXT,
-                        file_hint TEXT,
-                        ts TEXT
-                    );
-                    INSERT INTO test_events_new
-                        (id, run_id, pr_id, commit_sha, test_id, suite, status, duration_ms, component, file_hint, ts)
-                    SELECT id, run_id, pr_id, "commit", test_id, suite, status, duration_ms, component, file_hint, ts
-                    FROM test_events;
-                    DROP TABLE test_events;
-                    ALTER TABLE test_events_new RENAME TO test_events;
-                    CREATE INDEX IF NOT EXISTS idx_test_events_pr ON test_events (pr_id);
-                    CREATE INDEX IF NOT EXISTS idx_test_events_component ON test_events (component);
-                    CREATE INDEX IF NOT EXISTS idx_test_events_test ON test_events (test_id, status);
-                    """
-                )
+                self.conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as exc:
+                if not _is_busy(exc) or attempt == WRITE_RETRIES - 1:
+                    raise
+            time.sleep(delay * (1 + random.random()))
+            delay *= 2
+
+    def _intern(self, table: str, name: str | None) -> int | None:
+        """Return the id of ``name`` in dimension ``table``, inserting it if new."""
+        if name is None:
+            return None
+        cache = self._dims.setdefault(table, {})
+        key = cache.get(name)
+        if key is None:
+            cur = self.conn.cursor()
+            cur.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+            cur.execute(f"SELECT id FROM {table} WHERE name = ?", (name,))
+            key = cache[name] = cur.fetchone()[0]
+        return key
+
+    def _lookup(self, table: str, name: str) -> int | None:
+        """Return the id of ``name`` in dimension ``table`` without inserting."""
+        key = self._dims.get(table, {}).get(name)
+        if key is None:
+            row = self.conn.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()
+            if row:
+                key = self._dims.setdefault(table, {})[name] = row[0]
+        return key
 
     # -------------------------- PR Metadata --------------------------- #
     def record_pr(
@@ -180,22 +564,25 @@ class Storage:
     ) -> None:
         """Record metadata and touched files for a pull request."""
         ts = datetime.now(timezone.utc).isoformat()
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            INSERT OR REPLACE INTO prs (pr_id, branch, base, labels, created_at)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (pr_id, branch, base, json.dumps(list(labels)), ts),
-        )
-        for f in files:
+        with self._transaction():
+            before = self._components_of(pr_id)
+            cur = self.conn.cursor()
             cur.execute(
                 """
-                INSERT OR REPLACE INTO pr_files (pr_id, path, status, component)
-                VALUES (?, ?, ?, ?)
+                INSERT OR REPLACE INTO prs (pr_id, branch, base, labels, created_at)
+                VALUES (?, ?, ?, ?, ?)
                 """,
-                (pr_id, f["path"], f.get("status", ""), f.get("component", "unknown")),
+                (pr_id, branch, base, json.dumps(list(labels)), ts),
             )
+            for f in files:
+                cur.execute(
+                    """
+                    INSERT OR REPLACE INTO pr_files (pr_id, path, status, component)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (pr_id, f["path"], f.get("status", ""), f.get("component", "unknown")),
+                )
+            self._track_components(pr_id, before, self._components_of(pr_id))
 
     # ------------------------- Test Events ---------------------------- #
     def record_test_event(
@@ -212,38 +599,381 @@ class Storage:
         ts: str,
     ) -> None:
         """Record a single test event for a given PR."""
-        self.conn.execute(
+        self.record_test_events(
+            [
+                {
+                    "run_id": run_id,
+                    "pr_id": pr_id,
+                    "commit_sha": commit_sha,
+                    "test_id": test_id,
+                    "suite": suite,
+                    "status": status,
+                    "duration_ms": duration_ms,
+                    "component": component,
+                    "file_hint": file_hint,
+                    "ts": ts,
+                }
+            ]
+        )
+
+    def record_test_events(self, events: Iterable[Dict]) -> None:
+        """Record a batch of test events in a single transaction.
+
+        Each event carries the same keys as the keyword arguments of
+        :meth:`record_test_event`.  Outside a caller's transaction the batch
+        goes through the write queue, which may commit it together with the
+        batches of concurrent writers.
+        """
+        events = list(events)
+        if not events:
+            return
+        if self.conn.in_transaction:
+            self._insert_events(events)
+        else:
+            self._queue.submit(events)
+
+    def _commit_batches(self, batches: List[Batch]) -> None:
+        """Insert the events of *batches* in one transaction (write queue).
+
+        Batches with an id are recorded in ``ingest_batches`` and skipped if
+        already committed.
+        """
+        events: List[Dict] = []
+        with self._transaction():
+            cur = self.conn.cursor()
+            for batch_id, batch in batches:
+                if batch_id is not None:
+                    cur.execute(
+                        "INSERT OR IGNORE INTO ingest_batches (batch_id) VALUES (?)",
+                        (batch_id,),
+                    )
+                    if not cur.rowcount:
+                        continue
+                events.extend(batch)
+            if events:
+                self._insert_events(events)
+
+    def _forget_batches(self, batch_ids: List[str]) -> None:
+        """Drop committed batch ids once their spool files are gone."""
+        self.conn.executemany(
+            "DELETE FROM ingest_batches WHERE batch_id = ?", [(b,) for b in batch_ids]
+        )
+
+    def _insert_events(self, events: List[Dict]) -> None:
+        """Insert rows with ``executemany`` and update the counters once."""
+        with self._transaction():
+            self.conn.executemany(
+                """
+                INSERT INTO test_event_rows
+                  (run_id, pr_id, commit_sha, test_key, suite_key, status_code,
+                   duration_ms, component_key, file_hint, ts)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        e["run_id"],
+                        e["pr_id"],
+                        e["commit_sha"],
+                        self._intern("dim_test", e["test_id"]),
+                        self._intern("dim_suite", e["suite"]),
+                        self._intern("dim_status", e["status"]),
+                        e["duration_ms"],
+                        self._intern("dim_component", e["component"]),
+                        e["file_hint"],
+                        e["ts"],
+                    )
+                    for e in events
+                ],
+            )
+            self._track_events(
+                [(e["pr_id"], e["test_id"], e["status"], e["component"], e["ts"]) for e in events]
+            )
+
+    # ---------------------- Incremental Counters ---------------------- #
+    def _components_of(self, pr_id: int) -> Set[str]:
+        cur = self.conn.execute(
+            "SELECT DISTINCT component FROM pr_files WHERE pr_id = ?", (pr_id,)
+        )
+        return {row[0] for row in cur.fetchall() if row[0] != "unknown"}
+
+    def _windows(self) -> List[Tuple[int, str]]:
+        return self.conn.execute("SELECT window_days, cutoff FROM pair_windows").fetchall()
+
+    def _bump_window(
+        self,
+        window_days: int,
+        *,
+        universe: int = 0,
+        touched: Counter | None = None,
+        touched_window: Counter | None = None,
+        failed: Counter | None = None,
+        pairs: Counter | None = None,
+    ) -> None:
+        """Add signed deltas to the counters of one materialized window."""
+        cur = self.conn.cursor()
+        if universe:
+            cur.execute(
+                "UPDATE pair_windows SET universe = universe + ? WHERE window_days = ?",
+                (universe, window_days),
+            )
+        touched = touched or Counter()
+        touched_window = touched_window or Counter()
+        comps = set(touched) | set(touched_window)
+        if comps:
+            cur.executemany(
+                """
+                INSERT INTO pair_window_components (window_days, component, touched, touched_window)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(window_days, component) DO UPDATE SET
+                  touched = touched + excluded.touched,
+                  touched_window = touched_window + excluded.touched_window
+                """,
+                [(window_days, c, touched[c], touched_window[c]) for c in comps],
+            )
+        if failed:
+            cur.executemany(
+                """
+                INSERT INTO pair_window_tests (window_days, test_id, failed)
+                VALUES (?, ?, ?)
+                ON CONFLICT(window_days, test_id) DO UPDATE SET failed = failed + excluded.failed
+                """,
+                [(window_days, t, n) for t, n in failed.items()],
+            )
+        if pairs:
+            cur.executemany(
+                """
+                INSERT INTO pair_counts (window_days, component, test_id, a)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(window_days, component, test_id) DO UPDATE SET a = a + excluded.a
+                """,
+                [(window_days, c, t, n) for (c, t), n in pairs.items()],
+            )
+
+    def _track_events(self, events: List[Tuple[int, str, str, str, str]]) -> None:
+        """Fold ``(pr_id, test_id, status, component, ts)`` tuples into the
+        summaries and every materialized window."""
+        seen: Dict[int, str] = {}
+        failed: Dict[Tuple[int, str], str] = {}
+        pairs: Dict[Tuple[str, str], str] = {}
+        for pr_id, test_id, status, component, ts in events:
+            seen[pr_id] = max(ts, seen.get(pr_id, ts))
+            if status == "failed":
+                failed[(pr_id, test_id)] = max(ts, failed.get((pr_id, test_id), ts))
+                if component != "unknown":
+                    pairs[(component, test_id)] = max(ts, pairs.get((component, test_id), ts))
+        cur = self.conn.cursor()
+        windows = self._windows()
+        # Previous summaries decide which PRs/failures newly enter a window.
+        last_seen: Dict[int, str] = {}
+        last_failed: Dict[Tuple[int, str], str] = {}
+        if windows:
+            for pr_id in seen:
+                cur.execute("SELECT ts FROM pr_last_event WHERE pr_id = ?", (pr_id,))
+                row = cur.fetchone()
+                if row:
+                    last_seen[pr_id] = row[0]
+            for pr_id in {pr_id for pr_id, _ in failed}:
+                cur.execute(
+                    "SELECT test_id, ts FROM pr_test_failures WHERE pr_id = ?", (pr_id,)
+                )
+                for test_id, ts in cur.fetchall():
+                    last_failed[(pr_id, test_id)] = ts
+        cur.executemany(
             """
-            INSERT INTO test_events
-              (run_id, pr_id, commit_sha, test_id, suite, status, duration_ms, component, file_hint, ts)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO pr_last_event (pr_id, ts) VALUES (?, ?)
+            ON CONFLICT(pr_id) DO UPDATE SET ts = max(ts, excluded.ts)
             """,
-            (
-                run_id,
-                pr_id,
-                commit_sha,
-                test_id,
-                suite,
-                status,
-                duration_ms,
-                component,
-                file_hint,
-                ts,
-            ),
+            list(seen.items()),
         )
+        cur.executemany(
+            """
+            INSERT INTO pr_test_failures (pr_id, test_id, ts) VALUES (?, ?, ?)
+            ON CONFLICT(pr_id, test_id) DO UPDATE SET ts = max(ts, excluded.ts)
+            """,
+            [(pr_id, test_id, ts) for (pr_id, test_id), ts in failed.items()],
+        )
+        cur.executemany(
+            """
+            INSERT INTO failing_pairs (component, test_id, ts) VALUES (?, ?, ?)
+            ON CONFLICT(component, test_id) DO UPDATE SET ts = max(ts, excluded.ts)
+            """,
+            [(component, test_id, ts) for (component, test_id), ts in pairs.items()],
+        )
+        comps: Dict[int, Set[str]] = {}
+
+        def comps_of(pr_id: int) -> Set[str]:
+            if pr_id not in comps:
+                comps[pr_id] = self._components_of(pr_id)
+            return comps[pr_id]
+
+        for window_days, cutoff in windows:
+            universe = 0
+            touched_window: Counter = Counter()
+            failed_delta: Counter = Counter()
+            pair_delta: Counter = Counter()
+            for pr_id, ts in seen.items():
+                prev = last_seen.get(pr_id)
+                if ts >= cutoff and (prev is None or prev < cutoff):
+                    universe += 1
+                    touched_window.update(comps_of(pr_id))
+            for (pr_id, test_id), ts in failed.items():
+                prev = last_failed.get((pr_id, test_id))
+                if ts >= cutoff and (prev is None or prev < cutoff):
+                    failed_delta[test_id] += 1
+                    pair_delta.update((c, test_id) for c in comps_of(pr_id))
+            self._bump_window(
+                window_days,
+                universe=universe,
+                touched_window=touched_window,
+                failed=failed_delta,
+                pairs=pair_delta,
+            )
+
+    def _track_components(self, pr_id: int, before: Set[str], after: Set[str]) -> None:
+        """Apply a change in the set of components touched by ``pr_id``."""
+        if before == after:
+            return
+        cur = self.conn.cursor()
+        cur.execute("SELECT ts FROM pr_last_event WHERE pr_id = ?", (pr_id,))
+        row = cur.fetchone()
+        last_seen = row[0] if row else None
+        cur.execute("SELECT test_id, ts FROM pr_test_failures WHERE pr_id = ?", (pr_id,))
+        failures = cur.fetchall()
+        delta = Counter({c: 1 for c in after - before})
+        delta.subtract({c: 1 for c in before - after})
+        for window_days, cutoff in self._windows():
+            in_window = last_seen is not None and last_seen >= cutoff
+            pairs: Counter = Counter()
+            for test_id, ts in failures:
+                if ts >= cutoff:
+                    for c, n in delta.items():
+                        pairs[(c, test_id)] += n
+            self._bump_window(
+                window_days,
+                touched=delta,
+                touched_window=delta if in_window else None,
+                pairs=pairs,
+            )
+
+    def _advance_window(self, window_days: int, old: str, new: str) -> None:
+        """Slide a materialized window forward, decrementing expired events."""
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT pr_id FROM pr_last_event WHERE ts >= ? AND ts < ?", (old, new)
+        )
+        left = [row[0] for row in cur.fetchall()]
+        cur.execute(
+            "SELECT pr_id, test_id FROM pr_test_failures WHERE ts >= ? AND ts < ?",
+            (old, new),
+        )
+        expired = cur.fetchall()
+        comps: Dict[int, Set[str]] = {}
+
+        def comps_of(pr_id: int) -> Set[str]:
+            if pr_id not in comps:
+                comps[pr_id] = self._components_of(pr_id)
+            return comps[pr_id]
+
+        touched_window: Counter = Counter()
+        failed: Counter = Counter()
+        pairs: Counter = Counter()
+        for pr_id in left:
+            touched_window.subtract(comps_of(pr_id))
+        for pr_id, test_id in expired:
+            failed[test_id] -= 1
+            for c in comps_of(pr_id):
+                pairs[(c, test_id)] -= 1
+        self._bump_window(
+            window_days,
+            universe=-len(left),
+            touched_window=touched_window,
+            failed=failed,
+            pairs=pairs,
+        )
+        cur.execute(
+            "UPDATE pair_windows SET cutoff = ? WHERE window_days = ?", (new, window_days)
+        )
+        cur.execute("DELETE FROM pair_counts WHERE window_days = ? AND a <= 0", (window_days,))
+        cur.execute(
+            "DELETE FROM pair_window_tests WHERE window_days = ? AND failed <= 0",
+            (window_days,),
+        )
+
+    def _rebuild_window(self, window_days: int, cutoff: str) -> None:
+        """Materialize the counters of one window from the summary tables."""
+        cur = self.conn.cursor()
+        for table in ("pair_windows", "pair_window_components", "pair_window_tests", "pair_counts"):
+            cur.execute(f"DELETE FROM {table} WHERE window_days = ?", (window_days,))
+        cur.execute(
+            """
+            INSERT INTO pair_windows (window_days, cutoff, universe)
+            SELECT ?, ?, COUNT(*) FROM pr_last_event WHERE ts >= ?
+            """,
+            (window_days, cutoff, cutoff),
+        )
+        cur.execute(
+            """
+            INSERT INTO pair_window_components (window_days, component, touched, touched_window)
+            SELECT ?, f.component, COUNT(DISTINCT f.pr_id),
+                   COUNT(DISTINCT CASE WHEN e.ts >= ? THEN f.pr_id END)
+            FROM pr_files f LEFT JOIN pr_last_event e ON e.pr_id = f.pr_id
+            WHERE f.component != 'unknown'
+            GROUP BY f.component
+            """,
+            (window_days, cutoff),
+        )
+        cur.execute(
+            """
+            INSERT INTO pair_window_tests (window_days, test_id, failed)
+            SELECT ?, test_id, COUNT(*) FROM pr_test_failures
+            WHERE ts >= ? GROUP BY test_id
+            """,
+            (window_days, cutoff),
+        )
+        cur.execute(
+            """
+            INSERT INTO pair_counts (window_days, component, test_id, a)
+            SELECT ?, f.component, p.test_id, COUNT(*)
+            FROM pr_test_failures p
+            JOIN (SELECT DISTINCT pr_id, component FROM pr_files) f ON f.pr_id = p.pr_id
+            WHERE p.ts >= ? AND f.component != 'unknown'
+            GROUP BY f.component, p.test_id
+            """,
+            (window_days, cutoff),
+        )
+
+    def _sync_window(self, window_days: int, cutoff: str) -> None:
+        """Bring the counters of one window to ``cutoff``, building them if new."""
+        row = self.conn.execute(
+            "SELECT cutoff FROM pair_windows WHERE window_days = ?", (window_days,)
+        ).fetchone()
+        if row is None or cutoff < row[0]:
+            self._rebuild_window(window_days, cutoff)
+        elif cutoff > row[0]:
+            self._advance_window(window_days, row[0], cutoff)
 
     # ------------------------- Association Stats ---------------------- #
     def distinct_pairs(self, window_days: int) -> List[Tuple[str, str]]:
         """Return distinct (component, test_id) pairs in the window."""
-        cutoff = (datetime.now(timezone.utc) - timedelta(days=window_days)).isoformat()
+        cutoff = _cutoff(window_days)
         cur = self.conn.cursor()
         cur.execute(
             """
-            SELECT DISTINCT component, test_id
-            FROM test_events
-            WHERE ts >= ? AND status = 'failed'
+            SELECT c.name, t.name
+            FROM (
+                SELECT component_key, test_key
+                FROM test_event_rows
+                WHERE status_code = ? AND ts >= ?
+                UNION
+                SELECT component_key, test_key
+                FROM test_event_days
+                WHERE failed_ts >= ?
+            ) e
+            -- Events without a component or test still form a pair (with None).
+            LEFT JOIN dim_component c ON c.id = e.component_key
+            LEFT JOIN dim_test t ON t.id = e.test_key
             """,
-            (cutoff,),
+            (STATUS_FAILED, cutoff, cutoff),
         )
         return [(c, t) for c, t in cur.fetchall() if c != "unknown"]
 
@@ -257,7 +987,7 @@ class Storage:
         C: PRs that did NOT touch component BUT failed the test.
         D: PRs that neither touched component nor failed the test.
         """
-        cutoff = (datetime.now(timezone.utc) - timedelta(days=window_days)).isoformat()
+        cutoff = _cutoff(window_days)
         cur = self.conn.cursor()
         # PRs that touched the component
         cur.execute(
@@ -270,23 +1000,28 @@ class Storage:
         )
         touched = {row[0] for row in cur.fetchall()}
         # PRs that failed this test
+        test_key = self._lookup("dim_test", test_id)
         cur.execute(
             """
-            SELECT DISTINCT pr_id
-            FROM test_events
-            WHERE ts >= ? AND test_id = ? AND status = 'failed'
+            SELECT pr_id
+            FROM test_event_rows
+            WHERE test_key = ? AND status_code = ? AND ts >= ?
+            UNION
+            SELECT pr_id
+            FROM test_event_days
+            WHERE test_key = ? AND failed_ts >= ?
             """,
-            (cutoff, test_id),
+            (test_key, STATUS_FAILED, cutoff, test_key, cutoff),
         )
         failed = {row[0] for row in cur.fetchall()}
         # Universe: PRs seen in the window (i.e. with test events)
         cur.execute(
             """
-            SELECT DISTINCT pr_id
-            FROM test_events
-            WHERE ts >= ?
+            SELECT pr_id FROM test_event_rows WHERE ts >= ?
+            UNION
+            SELECT pr_id FROM test_event_days WHERE ts >= ?
             """,
-            (cutoff,),
+            (cutoff, cutoff),
         )
         universe = {row[0] for row in cur.fetchall()}
         # Compute counts
@@ -296,6 +1031,48 @@ class Storage:
         D = len(universe - touched - failed)
         return A, B, C, D
 
+    def contingency_tables(
+        self, window_days: int
+    ) -> Dict[Tuple[str, str], Tuple[int, int, int, int]]:
+        """Return (A,B,C,D) for every pair from ``distinct_pairs`` at once.
+
+        Counts are read from the materialized counters for ``window_days``.
+        The first call for a window builds them from the summary tables;
+        later calls only slide the window forward, so the cost tracks the
+        events recorded or expired since the previous analysis.  Results
+        match :meth:`contingency`.
+        """
+        cutoff = _cutoff(window_days)
+        cur = self.conn.cursor()
+        with self._transaction():
+            self._sync_window(window_days, cutoff)
+            cur.execute("SELECT universe FROM pair_windows WHERE window_days = ?", (window_days,))
+            universe = cur.fetchone()[0]
+            cur.execute(
+                """
+                SELECT p.component, p.test_id, COALESCE(n.a, 0), COALESCE(c.touched, 0),
+                       COALESCE(c.touched_window, 0), COALESCE(t.failed, 0)
+                FROM failing_pairs p
+                LEFT JOIN pair_counts n
+                  ON n.window_days = ? AND n.component = p.component AND n.test_id = p.test_id
+                LEFT JOIN pair_window_components c
+                  ON c.window_days = ? AND c.component = p.component
+                LEFT JOIN pair_window_tests t
+                  ON t.window_days = ? AND t.test_id = p.test_id
+                WHERE p.ts >= ?
+                """,
+                (window_days, window_days, window_days, cutoff),
+            )
+            rows = cur.fetchall()
+        tables: Dict[Tuple[str, str], Tuple[int, int, int, int]] = {}
+        for component, test_id, A, touched, touched_window, failed in rows:
+            B = touched - A
+            C = failed - A
+            # Failing PRs are always inside the universe.
+            D = universe - touched_window - C
+            tables[(component, test_id)] = (A, B, C, D)
+        return tables
+
     # -------------------------- Guidance ------------------------------ #
     def upsert_guidance(self, rule: Dict) -> None:
         """Insert or update a guidance record."""
@@ -334,50 +1111,53 @@ class Storage:
             ),
         )
 
-    def get_active_guidance(self) -> List[Dict]:
-        """Return all active guidance rules ordered by component."""
-        cur = self.conn.cursor()
-        cur.execute(
+    def _guidance_snapshot(self) -> "_GuidanceSnapshot":
+        """Return the active guidance, cached per process and database.
+
+        The cache is validated against ``guidance_version``, a one-row table
+        bumped by triggers on every guidance write, so repeated lookups (for
+        example ``emit-warnings`` in a hook loop) do not read the guidance
+        table again until it changes.
+        """
+        token, version = self.conn.execute(
+            "SELECT token, version FROM guidance_version"
+        ).fetchone()
+        key = str(self.path.resolve())
+        cached = _GUIDANCE_SNAPSHOTS.get(key)
+        if cached is not None and cached.stamp == (token, version):
+            return cached
+        rows = self.conn.execute(
             """
             SELECT rule_id, component, test_id, support_prs, confidence, baseline, lift,
                    p_value, template, command
             FROM guidance
             WHERE active = 1
-            ORDER BY component, lift DESC
+            ORDER BY rowid
             """
-        )
-        rows = cur.fetchall()
-        return [
-            {
-                "rule_id": r[0],
-                "component": r[1],
-                "test_id": r[2],
-                "support_prs": r[3],
-                "confidence": r[4],
-                "baseline": r[5],
-                "lift": r[6],
-                "p_value": r[7],
-                "template": r[8],
-                "command": r[9],
-            }
-            for r in rows
-        ]
+        ).fetchall()
+        rules = [dict(zip(_GUIDANCE_FIELDS, row)) for row in rows]
+        snapshot = _GuidanceSnapshot((token, version), rules)
+        _GUIDANCE_SNAPSHOTS[key] = snapshot
+        return snapshot
+
+    def get_active_guidance(self) -> List[Dict]:
+        """Return all active guidance rules ordered by component."""
+        return [dict(rule) for rule in self._guidance_snapshot().ordered]
 
     def get_active_guidance_by_component(self, components: Iterable[str]) -> List[Dict]:
         """Return active guidance filtered by a list of components."""
         if not components:
             return []
-        cur = self.conn.cursor()
-        q = ",".join("?" for _ in components)
-        cur.execute(
-            f"""
-            SELECT component, test_id, command
-            FROM guidance
-            WHERE active = 1 AND component IN ({q})
-            """,
-            tuple(components),
+        by_component = self._guidance_snapshot().by_component
+        hits = sorted(
+            (pos, rule)
+            for comp in set(components)
+            for pos, rule in by_component.get(comp, ())
         )
-        return [{"component": c, "test_id": t, "command": cmd} for c, t, cmd in cur.fetchall()]
+        return [
+            {"component": r["component"], "test_id": r["test_id"], "command": r["command"]}
+            for _, r in hits
+        ]
 
     def get_components_for_pr(self, pr_id: int) -> List[str]:
         """Return a list of distinct components touched by the PR."""
@@ -392,65 +1172,240 @@ class Storage:
         )
         return [row[0] for row in cur.fetchall() if row[0] != "unknown"]
 
-    def prune_guidance(self, window_days: int, last_n: int) -> None:
+    def prune_guidance(self, window_days: int, last_n: int | None) -> Dict:
         """Deactivate guidance rules with insufficient recent evidence.
 
         A rule becomes inactive if:
-          - It has no failures in the last ``last_n`` PRs, OR
+          - It has no failures in the window (its pair is absent from
+            :meth:`contingency_tables`), OR
           - Its lift drops below 1.5 when recomputed with current data.
+
+        All rules are judged against one shared set of contingency counts and
+        deactivated in a single transaction.  Returns a report with the
+        number of rules ``evaluated`` and ``deactivated`` and ``duration_ms``.
+        """
+        start = time.perf_counter()
+        cur = self.conn.cursor()
+        with self._transaction():
+            tables = self.contingency_tables(window_days)
+            cur.execute("SELECT rule_id, component, test_id FROM guidance WHERE active = 1")
+            rows = cur.fetchall()
+            stale: List[Tuple[str]] = []
+            for rule_id, component, test_id in rows:
+                counts = tables.get((component, test_id))
+                if counts is None:
+                    stale.append((rule_id,))
+                    continue
+                A, B, C, D = counts
+                conf = A / max(A + B, 1)
+                base = C / max(C + D, 1)
+                lift = conf / max(base, 1e-6)
+                if lift < 1.5:
+                    stale.append((rule_id,))
+            cur.executemany("UPDATE guidance SET active = 0 WHERE rule_id = ?", stale)
+        return {
+            "evaluated": len(rows),
+            "deactivated": len(stale),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
+    # ------------------------- Retention ------------------------------ #
+    def _size_bytes(self) -> int:
+        cur = self.conn.cursor()
+        pages = cur.execute("PRAGMA page_count").fetchone()[0]
+        free = cur.execute("PRAGMA freelist_count").fetchone()[0]
+        return (pages - free) * cur.execute("PRAGMA page_size").fetchone()[0]
+
+    def compact(self, raw_days: int, window_days: int, *, vacuum: bool = True) -> Dict:
+        """Roll up old test events and expire those outside every window.
+
+        Raw events from days before the last ``raw_days`` are folded into
+        ``test_event_days`` (one row per day, PR, test and component).
+        Events, rollups and summary rows older than the largest of
+        ``window_days`` and every window analysed so far are deleted.  Every
+        materialized window is brought up to date first, so analysis results
+        are unchanged.  PRs and their files are kept: ``B`` counts every PR
+        that touched a component.
+
+        Returns a report with the rows ``compacted``, ``rollup_rows`` written,
+        ``expired`` rows, the database size in ``bytes_before`` and
+        ``bytes_after`` (after ``VACUUM`` if *vacuum*) and ``duration_ms``.
         """
-        cutoff_ts = (datetime.now(timezone.utc) - timedelta(days=window_days)).isoformat()
+        start = time.perf_counter()
+        bytes_before = self._size_bytes()
         cur = self.conn.cursor()
-        # Gather rule IDs
-        cur.execute("SELECT rule_id, component, test_id FROM guidance WHERE active = 1")
-        rows = cur.fetchall()
-        for rule_id, component, test_id in rows:
-            # Count failures in window
+        with self._transaction():
+            windows = [w for w, _ in self._windows()]
+            for w in windows:
+                self._sync_window(w, _cutoff(w))
+            horizon = _cutoff(max([window_days, *windows]))
+            expired = 0
+            for table in ("test_event_rows", "test_event_days"):
+                cur.execute(f"DELETE FROM {table} WHERE ts < ?", (horizon,))
+                expired += cur.rowcount
+            for table in ("pr_last_event", "pr_test_failures", "failing_pairs"):
+                cur.execute(f"DELETE FROM {table} WHERE ts < ?", (horizon,))
+            # Whole days only: raw rows are kept from the start of this day.
+            boundary = _cutoff(raw_days)[:10]
             cur.execute(
                 """
-                SELECT COUNT(DISTINCT pr_id)
-                FROM test_events
-                WHERE ts >= ? AND component = ? AND test_id = ? AND status = 'failed'
+                INSERT INTO test_event_days
+                  (day, pr_id, test_key, component_key, runs, failed, duration_ms,
+                   max_duration_ms, ts, failed_ts)
+                SELECT substr(ts, 1, 10), pr_id, test_key, component_key, COUNT(*),
+                       SUM(status_code = ?), SUM(duration_ms), MAX(duration_ms), MAX(ts),
+                       MAX(CASE WHEN status_code = ? THEN ts END)
+                FROM test_event_rows
+                WHERE ts < ?
+                GROUP BY substr(ts, 1, 10), pr_id, test_key, component_key
+                ON CONFLICT(day, pr_id, test_key, component_key) DO UPDATE SET
+                  runs = runs + excluded.runs,
+                  failed = failed + excluded.failed,
+                  duration_ms = coalesce(duration_ms + excluded.duration_ms,
+                                         duration_ms, excluded.duration_ms),
+                  max_duration_ms = coalesce(max(max_duration_ms, excluded.max_duration_ms),
+                                             max_duration_ms, excluded.max_duration_ms),
+                  ts = max(ts, excluded.ts),
+                  failed_ts = coalesce(max(failed_ts, excluded.failed_ts),
+                                       failed_ts, excluded.failed_ts)
                 """,
-                (cutoff_ts, component, test_id),
+                (STATUS_FAILED, STATUS_FAILED, boundary),
             )
-            cnt = cur.fetchone()[0]
-            if cnt < 1:
-                self.conn.execute(
-                    "UPDATE guidance SET active = 0 WHERE rule_id = ?", (rule_id,)
-                )
-                continue
-            # Recompute lift with current data
-            A, B, C, D = self.contingency(component, test_id, window_days)
-            conf = A / max(A + B, 1)
-            base = C / max(C + D, 1)
-            lift = conf / max(base, 1e-6)
-            if lift < 1.5:
-                self.conn.execute(
-                    "UPDATE guidance SET active = 0 WHERE rule_id = ?", (rule_id,)
-                )
+            rollup_rows = cur.rowcount
+            cur.execute("DELETE FROM test_event_rows WHERE ts < ?", (boundary,))
+            compacted = cur.rowcount
+        if vacuum:
+            self.conn.execute("VACUUM")
+        return {
+            "compacted": compacted,
+            "rollup_rows": rollup_rows,
+            "expired": expired,
+            "bytes_before": bytes_before,
+            "bytes_after": self._size_bytes(),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
 
     # -------------------------- Export ------------------------------- #
     def export_stats(self) -> Dict:
-        """Return basic statistics about test events and guidance."""
+        """Return basic statistics about test events and guidance.
+
+        Compacted events are counted through their daily rollups.
+        """
         cur = self.conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM test_events WHERE status='failed'")
+        cur.execute(
+            """
+            SELECT (SELECT COUNT(*) FROM test_event_rows WHERE status_code = ?)
+                 + (SELECT IFNULL(SUM(failed), 0) FROM test_event_days)
+            """,
+            (STATUS_FAILED,),
+        )
         failed = cur.fetchone()[0]
-        cur.execute("SELECT COUNT(*) FROM test_events")
+        cur.execute(
+            """
+            SELECT (SELECT COUNT(*) FROM test_event_rows)
+                 + (SELECT IFNULL(SUM(runs), 0) FROM test_event_days)
+            """
+        )
         total = cur.fetchone()[0]
         cur.execute("SELECT COUNT(*) FROM guidance WHERE active=1")
         active = cur.fetchone()[0]
         return {"events_total": total, "events_failed": failed, "guidance_active": active}
 
+    def export_rows(self, table: str) -> Iterator[Tuple]:
+        """Stream the rows of *table* in ``EXPORT_COLUMNS[table]`` order."""
+        queries = {
+            "test_events": f"SELECT {', '.join(_EVENT_FIELDS)} FROM test_events ORDER BY id",
+            "test_event_days": """
+                SELECT d.day, d.pr_id, t.name, c.name, d.runs, d.failed, d.duration_ms,
+                       d.max_duration_ms, d.ts, d.failed_ts
+                FROM test_event_days d
+                LEFT JOIN dim_test t ON t.id = d.test_key
+                LEFT JOIN dim_component c ON c.id = d.component_key
+                ORDER BY d.day, d.pr_id
+            """,
+            "pr_files": "SELECT pr_id, path, status, component FROM pr_files ORDER BY pr_id, path",
+            "guidance": f"SELECT {', '.join(EXPORT_COLUMNS['guidance'])} FROM guidance ORDER BY rowid",
+        }
+        if table not in queries:
+            raise ValueError(f"Unknown export table {table}")
+        # A separate cursor is iterated lazily, so rows are never all in memory.
+        yield from self.conn.execute(queries[table])
+
+    def duration_samples(self, window_days: int) -> Iterator[Tuple]:
+        """Stream ``(ts, pr_id, test_id, component, duration_ms, runs, max_ms)``
+        in time order.
+
+        Covers the events of the last ``window_days`` that have a duration.
+        A raw event is one run (``max_ms`` is its duration); a compacted day
+        is one sample of its ``runs`` with their mean and maximum duration.
+        """
+        cutoff = _cutoff(window_days)
+        yield from self.conn.execute(
+            """
+            SELECT ts, pr_id, test_id, component, duration_ms, runs, max_ms FROM (
+              SELECT e.ts, e.pr_id, t.name AS test_id, c.name AS component,
+                     e.duration_ms, 1 AS runs, e.duration_ms AS max_ms, e.id AS seq
+              FROM test_event_rows e
+              LEFT JOIN dim_test t ON t.id = e.test_key
+              LEFT JOIN dim_component c ON c.id = e.component_key
+              WHERE e.ts >= ? AND e.duration_ms IS NOT NULL
+              UNION ALL
+              SELECT d.ts, d.pr_id, t.name, c.name,
+                     CAST(d.duration_ms AS REAL) / d.runs, d.runs,
+                     -- Rollups written before schema 3 have no maximum.
+                     coalesce(d.max_duration_ms, CAST(d.duration_ms AS REAL) / d.runs), 0
+              FROM test_event_days d
+              LEFT JOIN dim_test t ON t.id = d.test_key
+              LEFT JOIN dim_component c ON c.id = d.component_key
+              WHERE d.ts >= ? AND d.duration_ms IS NOT NULL AND d.runs > 0
+            )
+            ORDER BY ts, seq
+            """,
+            (cutoff, cutoff),
+        )
+
 
 class InMemoryStorage(StorageProtocol):
-    """Simple in-memory storage used for tests."""
+    """Storage backend that keeps every index in memory.
+
+    Intended for ephemeral CI runs that should not touch SQLite.  PRs are
+    numbered densely as they are first seen and sets of PRs are Python ints
+    used as bitsets: one per component (PRs touching it) and, for each test,
+    the latest failing timestamp per PR.  Window queries build the failing and
+    universe bitsets for the cutoff and count with ``int.bit_count``.  Results
+    match :class:`Storage`.
+
+    :meth:`snapshot` writes the raw PR, event and guidance data to a compact
+    binary file and :meth:`restore` rebuilds the indexes from it.  ``dirty``
+    tells whether anything changed since the last snapshot or restore.
+    """
 
     def __init__(self, path: str | None = None) -> None:
-        self.pr_files: Dict[int, List[Dict]] = {}
-        self.test_events: List[Dict] = []
-        self.guidance: List[Dict] = []
+        self.path = path
+        self.dirty = False
+        self._strings: Dict[str, str] = {}
+        self._prs: Dict[int, Tuple[str, str, List[str], str]] = {}
+        self._pr_files: Dict[int, Dict[str, Tuple[str, str]]] = {}
+        self._events: List[Tuple] = []
+        self._failed_events = 0
+        self._guidance: Dict[str, Dict] = {}
+        # Bitset indexes, keyed by dense PR bit position.
+        self._pr_bit: Dict[int, int] = {}
+        self._touched: Dict[str, int] = {}
+        self._pr_last: Dict[int, str] = {}
+        self._test_failures: Dict[str, Dict[int, str]] = {}
+        self._pair_last: Dict[Tuple[str, str], str] = {}
+
+    def _bit(self, pr_id: int) -> int:
+        bit = self._pr_bit.get(pr_id)
+        if bit is None:
+            bit = self._pr_bit[pr_id] = len(self._pr_bit)
+        return bit
+
+    def _str(self, value: str | None) -> str | None:
+        return value if value is None else self._strings.setdefault(value, value)
 
+    # ------------------------------ PRs ------------------------------- #
     def record_pr(
         self,
         *,
@@ -460,8 +1415,29 @@ class InMemoryStorage(StorageProtocol):
         labels: List[str],
         files: List[Dict],
     ) -> None:
-        self.pr_files[pr_id] = files
+        """Record metadata and touched files for a pull request."""
+        ts = datetime.now(timezone.utc).isoformat()
+        self._prs[pr_id] = (branch, base, list(labels), ts)
+        self._add_files(pr_id, files)
+        self.dirty = True
+
+    def _add_files(self, pr_id: int, files: Iterable[Dict]) -> None:
+        pr_files = self._pr_files.setdefault(pr_id, {})
+        before = {comp for _, comp in pr_files.values()}
+        for f in files:
+            pr_files[self._str(f["path"])] = (
+                self._str(f.get("status", "")),
+                self._str(f.get("component", "unknown")),
+            )
+        after = {comp for _, comp in pr_files.values()}
+        mask = 1 << self._bit(pr_id)
+        for comp in after - before:
+            self._touched[comp] = self._touched.get(comp, 0) | mask
+        # Re-recorded paths may move to another component.
+        for comp in before - after:
+            self._touched[comp] &= ~mask
 
+    # -------------------------- Test Events --------------------------- #
     def record_test_event(
         self,
         *,
@@ -476,49 +1452,322 @@ class InMemoryStorage(StorageProtocol):
         file_hint: str,
         ts: str,
     ) -> None:
-        self.test_events.append(
-            {
-                "run_id": run_id,
-                "pr_id": pr_id,
-                "commit_sha": commit_sha,
-                "test_id": test_id,
-                "suite": suite,
-                "status": status,
-                "duration_ms": duration_ms,
-                "component": component,
-                "file_hint": file_hint,
-                "ts": ts,
-            }
-        )
-
-    def distinct_pairs(self, window_days: int) -> Iterable[Tuple[str, str]]:
-        return []
+        """Record a single test event for a given PR."""
+        self.record_test_events(
+            [
+                {
+                    "run_id": run_id,
+                    "pr_id": pr_id,
+                    "commit_sha": commit_sha,
+                    "test_id": test_id,
+                    "suite": suite,
+                    "status": status,
+                    "duration_ms": duration_ms,
+                    "component": component,
+                    "file_hint": file_hint,
+                    "ts": ts,
+                }
+            ]
+        )
+
+    def record_test_events(self, events: Iterable[Dict]) -> None:
+        """Record a batch of test events and update the indexes."""
+        for e in events:
+            self._add_event(
+                tuple(
+                    e[name] if name in _EVENT_NUMERIC else self._str(e[name])
+                    for name in _EVENT_FIELDS
+                )
+            )
+            self.dirty = True
+
+    def _add_event(self, event: Tuple) -> None:
+        self._events.append(event)
+        _, pr_id, _, test_id, _, status, _, component, _, ts = event
+        bit = self._bit(pr_id)
+        if ts > self._pr_last.get(bit, ""):
+            self._pr_last[bit] = ts
+        if status != "failed":
+            return
+        self._failed_events += 1
+        fails = self._test_failures.setdefault(test_id, {})
+        if ts > fails.get(bit, ""):
+            fails[bit] = ts
+        if component != "unknown":
+            pair = (component, test_id)
+            if ts > self._pair_last.get(pair, ""):
+                self._pair_last[pair] = ts
+
+    # ---------------------------- Analysis ---------------------------- #
+    def _universe(self, cutoff: str) -> int:
+        mask = 0
+        for bit, ts in self._pr_last.items():
+            if ts >= cutoff:
+                mask |= 1 << bit
+        return mask
+
+    def _failed(self, test_id: str, cutoff: str) -> int:
+        mask = 0
+        for bit, ts in self._test_failures.get(test_id, {}).items():
+            if ts >= cutoff:
+                mask |= 1 << bit
+        return mask
+
+    def distinct_pairs(self, window_days: int) -> List[Tuple[str, str]]:
+        """Return distinct (component, test_id) pairs in the window."""
+        cutoff = _cutoff(window_days)
+        return [pair for pair, ts in self._pair_last.items() if ts >= cutoff]
 
     def contingency(
         self, component: str, test_id: str, window_days: int
     ) -> Tuple[int, int, int, int]:
-        return (0, 0, 0, 0)
+        """Compute (A,B,C,D) contingency counts for a component/test pair."""
+        cutoff = _cutoff(window_days)
+        return self._counts(
+            self._touched.get(component, 0),
+            self._failed(test_id, cutoff),
+            self._universe(cutoff),
+        )
+
+    @staticmethod
+    def _counts(touched: int, failed: int, universe: int) -> Tuple[int, int, int, int]:
+        A = (touched & failed).bit_count()
+        B = touched.bit_count() - A
+        C = failed.bit_count() - A
+        # Failing PRs are always inside the universe.
+        D = universe.bit_count() - (universe & touched).bit_count() - C
+        return A, B, C, D
 
+    def contingency_tables(
+        self, window_days: int
+    ) -> Dict[Tuple[str, str], Tuple[int, int, int, int]]:
+        """Return (A,B,C,D) for every pair from ``distinct_pairs`` at once."""
+        cutoff = _cutoff(window_days)
+        universe = self._universe(cutoff)
+        failed: Dict[str, int] = {}
+        tables: Dict[Tuple[str, str], Tuple[int, int, int, int]] = {}
+        for component, test_id in self.distinct_pairs(window_days):
+            if test_id not in failed:
+                failed[test_id] = self._failed(test_id, cutoff)
+            tables[(component, test_id)] = self._counts(
+                self._touched.get(component, 0), failed[test_id], universe
+            )
+        return tables
+
+    # ---------------------------- Guidance ---------------------------- #
     def upsert_guidance(self, rule: Dict) -> None:
-        self.guidance.append(rule)
+        """Insert or update a guidance record."""
+        now = datetime.now(timezone.utc).isoformat()
+        previous = self._guidance.get(rule["rule_id"])
+        stored = {key: rule[key] for key in _GUIDANCE_FIELDS}
+        stored.update(
+            active=True,
+            last_seen=now,
+            created_at=previous["created_at"] if previous else now,
+        )
+        self._guidance[rule["rule_id"]] = stored
+        self.dirty = True
 
-    def get_components_for_pr(self, pr_id: int) -> List[str]:
-        return [f["component"] for f in self.pr_files.get(pr_id, [])]
+    def get_active_guidance(self) -> List[Dict]:
+        """Return all active guidance rules ordered by component."""
+        active = [g for g in self._guidance.values() if g["active"]]
+        # Same order as the SQLite backend: lift descending, NULL lifts last.
+        active.sort(key=lambda g: (g["component"], g["lift"] is None, -(g["lift"] or 0)))
+        return [{key: g[key] for key in _GUIDANCE_FIELDS} for g in active]
 
     def get_active_guidance_by_component(
         self, components: Iterable[str]
     ) -> List[Dict]:
-        return [g for g in self.guidance if g.get("component") in set(components)]
+        """Return active guidance filtered by a list of components."""
+        wanted = set(components)
+        return [
+            {"component": g["component"], "test_id": g["test_id"], "command": g["command"]}
+            for g in self._guidance.values()
+            if g["active"] and g["component"] in wanted
+        ]
 
-    def get_active_guidance(self) -> List[Dict]:
-        return list(self.guidance)
+    def get_components_for_pr(self, pr_id: int) -> List[str]:
+        """Return a list of distinct components touched by the PR."""
+        comps = {comp for _, comp in self._pr_files.get(pr_id, {}).values()}
+        return sorted(comps - {"unknown"})
+
+    def prune_guidance(self, window_days: int, last_n: int | None) -> Dict:
+        """Deactivate guidance rules with insufficient recent evidence.
+
+        Uses the same criteria as :meth:`Storage.prune_guidance`.
+        """
+        start = time.perf_counter()
+        tables = self.contingency_tables(window_days)
+        active = [g for g in self._guidance.values() if g["active"]]
+        deactivated = 0
+        for rule in active:
+            counts = tables.get((rule["component"], rule["test_id"]))
+            if counts is not None:
+                A, B, C, D = counts
+                conf = A / max(A + B, 1)
+                base = C / max(C + D, 1)
+                if conf / max(base, 1e-6) >= 1.5:
+                    continue
+            rule["active"] = False
+            deactivated += 1
+        self.dirty = self.dirty or deactivated > 0
+        return {
+            "evaluated": len(active),
+            "deactivated": deactivated,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
+    def compact(self, raw_days: int, window_days: int, *, vacuum: bool = True) -> Dict:
+        """Expire events older than ``window_days``; see :meth:`Storage.compact`.
 
-    def prune_guidance(self, window_days: int, last_n: int | None) -> None:
-        return None
+        Events are not rolled up (``raw_days`` and ``vacuum`` are accepted for
+        compatibility); the snapshot only shrinks by the expired events.
+        """
+        start = time.perf_counter()
+        horizon = _cutoff(window_days)
+        events = self._events
+        kept = [e for e in events if e[-1] >= horizon]
+        self._events = []
+        self._failed_events = 0
+        self._pr_last = {}
+        self._test_failures = {}
+        self._pair_last = {}
+        for event in kept:
+            self._add_event(event)
+        self.dirty = self.dirty or len(kept) < len(events)
+        return {
+            "compacted": 0,
+            "rollup_rows": 0,
+            "expired": len(events) - len(kept),
+            "bytes_before": None,
+            "bytes_after": None,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
 
     def export_stats(self) -> Dict:
+        """Return basic statistics about test events and guidance."""
         return {
-            "events_total": len(self.test_events),
-            "events_failed": len([e for e in self.test_events if e["status"] == "failed"]),
-            "guidance_active": len(self.guidance),
+            "events_total": len(self._events),
+            "events_failed": self._failed_events,
+            "guidance_active": sum(1 for g in self._guidance.values() if g["active"]),
         }
+
+    def export_rows(self, table: str) -> Iterator[Tuple]:
+        """Stream the rows of *table* in ``EXPORT_COLUMNS[table]`` order."""
+        if table == "test_events":
+            yield from self._events
+        elif table == "test_event_days":
+            return
+        elif table == "pr_files":
+            for pr_id in sorted(self._pr_files):
+                files = self._pr_files[pr_id]
+                for path in sorted(files):
+                    yield (pr_id, path, *files[path])
+        elif table == "guidance":
+            for g in self._guidance.values():
+                yield tuple(int(g[c]) if c == "active" else g[c] for c in EXPORT_COLUMNS[table])
+        else:
+            raise ValueError(f"Unknown export table {table}")
+
+    def duration_samples(self, window_days: int) -> Iterator[Tuple]:
+        """Stream ``(ts, pr_id, test_id, component, duration_ms, runs, max_ms)``
+        in time order; every event is one run."""
+        cutoff = _cutoff(window_days)
+        events = [e for e in self._events if e[9] >= cutoff and e[6] is not None]
+        events.sort(key=lambda e: e[9])
+        for e in events:
+            yield (e[9], e[1], e[3], e[7], e[6], 1, e[6])
+
+    # ---------------------------- Snapshots --------------------------- #
+    def snapshot(self, path: str | Path) -> None:
+        """Write the stored data to *path* as a compact binary snapshot.
+
+        Strings are written once to a shared pool and events are stored
+        column-wise as arrays of pool references, then the whole payload is
+        zlib-compressed.  The file is replaced atomically.
+        """
+        pool: Dict[str | None, int] = {None: -1}
+
+        def ref(value: str | None) -> int:
+            if value not in pool:
+                pool[value] = len(pool) - 1
+            return pool[value]
+
+        columns = {name: array("q") for name in _EVENT_FIELDS}
+        columns["duration_ms"] = array("d")
+        for event in self._events:
+            for name, value in zip(_EVENT_FIELDS, event):
+                if name == "pr_id":
+                    columns[name].append(value)
+                elif name == "duration_ms":
+                    columns[name].append(float("nan") if value is None else value)
+                else:
+                    columns[name].append(ref(value))
+        meta = {
+            "prs": [[pr_id, *info] for pr_id, info in self._prs.items()],
+            "pr_files": [
+                [pr_id, path_, status, comp]
+                for pr_id, files in self._pr_files.items()
+                for path_, (status, comp) in files.items()
+            ],
+            "guidance": list(self._guidance.values()),
+            "events": len(self._events),
+            "strings": [s for s in pool if s is not None],
+        }
+        sections = [json.dumps(meta).encode("utf-8")]
+        sections += [columns[name].tobytes() for name in _EVENT_FIELDS]
+        body = b"".join(struct.pack("<Q", len(sec)) + sec for sec in sections)
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_bytes(
+            SNAPSHOT_MAGIC + struct.pack("<H", SNAPSHOT_VERSION) + zlib.compress(body)
+        )
+        os.replace(tmp, target)
+        self.dirty = False
+
+    @classmethod
+    def restore(cls, path: str | Path) -> "InMemoryStorage":
+        """Return a storage rebuilt from a :meth:`snapshot` file.
+
+        Raises ``ValueError`` if the file is not a snapshot or was written by
+        an unsupported version.
+        """
+        raw = Path(path).read_bytes()
+        header = len(SNAPSHOT_MAGIC) + 2
+        if not raw.startswith(SNAPSHOT_MAGIC):
+            raise ValueError(f"{path} is not a codex-rules snapshot")
+        (version,) = struct.unpack_from("<H", raw, len(SNAPSHOT_MAGIC))
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version} in {path}")
+        body = zlib.decompress(raw[header:])
+        sections: List[bytes] = []
+        offset = 0
+        while offset < len(body):
+            (size,) = struct.unpack_from("<Q", body, offset)
+            offset += 8
+            sections.append(body[offset : offset + size])
+            offset += size
+        meta = json.loads(sections[0])
+        strings: List[str | None] = meta["strings"] + [None]  # index -1 is None
+        columns = []
+        for name, data in zip(_EVENT_FIELDS, sections[1:]):
+            column = array("d" if name == "duration_ms" else "q")
+            column.frombytes(data)
+            if name == "duration_ms":
+                columns.append([None if v != v else _as_number(v) for v in column])
+            elif name == "pr_id":
+                columns.append(column.tolist())
+            else:
+                columns.append([strings[i] for i in column])
+
+        storage = cls(str(path))
+        storage._strings = {value: value for value in meta["strings"]}
+        for pr_id, branch, base, labels, created_at in meta["prs"]:
+            storage._prs[pr_id] = (branch, base, labels, created_at)
+        for pr_id, path_, status, comp in meta["pr_files"]:
+            storage._add_files(pr_id, [{"path": path_, "status": status, "component": comp}])
+        for event in zip(*columns):
+            storage._add_event(event)
+        storage._guidance = {g["rule_id"]: g for g in meta["guidance"]}
+        return storage
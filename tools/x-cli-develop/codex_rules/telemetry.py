@@ -4,25 +4,53 @@ Implements FGC-REQ-TEL-001.
 
 Entries may include optional ``agent_feedback`` summarising the session and
 details about failures via ``exception_type`` and ``exception_message``.
+
+The telemetry file stays a ``{"entries": [...]}`` JSON document, but entries
+are stored one per line so that appending only rewrites the closing trailer.
+Appends run under an exclusive file lock, and the summary counts are kept in
+a small sidecar so recording an entry never re-reads the full history.
 """
 from __future__ import annotations
 
 import json
 import os
 import sys
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Sequence
+from typing import Any, Dict, Iterator, List, Sequence
+
+from .locking import FileLock
 
 TELEMETRY_PATH = Path(".codex/telemetry.json")
 SUMMARY_PATH = Path("telemetry/summary.json")
+SUMMARY_STATE_PATH = Path(".codex/telemetry.summary.json")
+LOCK_PATH = Path(".codex/telemetry.lock")
+
+_HEADER = b'{"entries": [\n'
+_TRAILER = b"\n]}\n"
+
+
+def _salvage_lines(raw: bytes) -> List[Dict[str, Any]]:
+    """Return the intact entries of a line-per-entry file with a torn tail."""
+    entries: List[Dict[str, Any]] = []
+    for line in raw[len(_HEADER):].splitlines():
+        line = line.strip().rstrip(b",")
+        try:
+            item = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(item, dict):
+            entries.append(item)
+    return entries
 
 
 def load_telemetry() -> List[Dict[str, Any]]:
     """Return all telemetry entries from the JSON file."""
     if TELEMETRY_PATH.exists():
+        raw = TELEMETRY_PATH.read_bytes()
         try:
-            data = json.loads(TELEMETRY_PATH.read_text(encoding="utf-8"))
+            data = json.loads(raw)
             if isinstance(data, dict):
                 return list(data.get("entries", []))
         except Exception as exc:
@@ -31,10 +59,65 @@ def load_telemetry() -> List[Dict[str, Any]]:
                 f"({type(exc).__name__})",
                 file=sys.stderr,
             )
+            if raw.startswith(_HEADER):
+                return _salvage_lines(raw)
     return []
 
 
-def append_telemetry_entry(
+@contextmanager
+def _locked() -> Iterator[None]:
+    """Hold an exclusive lock on ``LOCK_PATH`` for the duration of the block."""
+    with FileLock(LOCK_PATH):
+        yield
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace *path* with *data* so readers never observe a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _migrate(entries: List[Dict[str, Any]]) -> None:
+    """Rewrite *entries* using the line-per-entry layout."""
+    body = b",\n".join(json.dumps(e).encode("utf-8") for e in entries)
+    _write_atomic(TELEMETRY_PATH, _HEADER + body + _TRAILER)
+
+
+def _append_line(entry: Dict[str, Any]) -> tuple[int, int]:
+    """Append *entry* to ``TELEMETRY_PATH`` and return its size before and after.
+
+    Must be called with the telemetry lock held. Files that are not in the
+    line-per-entry layout (for example the ``indent=2`` format written by
+    older versions) are migrated once before appending.
+    """
+    TELEMETRY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(entry).encode("utf-8")
+    size = TELEMETRY_PATH.stat().st_size if TELEMETRY_PATH.exists() else 0
+    if size:
+        with TELEMETRY_PATH.open("rb") as fh:
+            head = fh.read(len(_HEADER))
+            fh.seek(max(size - len(_TRAILER), 0))
+            tail = fh.read()
+        if head != _HEADER or tail != _TRAILER:
+            _migrate(load_telemetry())
+            size = TELEMETRY_PATH.stat().st_size
+    if size <= len(_HEADER) + len(_TRAILER):
+        _write_atomic(TELEMETRY_PATH, _HEADER + line + _TRAILER)
+        return size, TELEMETRY_PATH.stat().st_size
+    fd = os.open(TELEMETRY_PATH, os.O_WRONLY)
+    try:
+        # Overwrite the trailer with the new entry and a fresh trailer in a
+        # single write; a torn write is recovered line by line on load.
+        os.lseek(fd, size - len(_TRAILER), os.SEEK_SET)
+        os.write(fd, b",\n" + line + _TRAILER)
+    finally:
+        os.close(fd)
+    return size, TELEMETRY_PATH.stat().st_size
+
+
+def _normalise_entry(
     entry: Dict[str, Any],
     agent_feedback: str | None = None,
     srs_ids: List[str] | None = None,
@@ -43,7 +126,7 @@ def append_telemetry_entry(
     exception_type: str | None = None,
     exception_message: str | None = None,
 ) -> None:
-    """Append a telemetry entry and persist it to disk.
+    """Validate *entry* in place and fill in derived fields.
 
     The entry must contain at least ``modules_inspected`` and ``checks_skipped``.
     Optional fields ``ci_log_paths`` and ``failing_tests`` are normalised to lists.
@@ -120,33 +203,80 @@ def append_telemetry_entry(
         else:
             entry["timestamp"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
 
-    entries = load_telemetry()
-    entries.append(entry)
-    TELEMETRY_PATH.parent.mkdir(parents=True, exist_ok=True)
-    TELEMETRY_PATH.write_text(
-        json.dumps({"entries": entries}, indent=2), encoding="utf-8"
+
+def append_telemetry_entry(
+    entry: Dict[str, Any],
+    agent_feedback: str | None = None,
+    srs_ids: List[str] | None = None,
+    command: Sequence[str] | str | None = None,
+    exit_status: int | None = None,
+    exception_type: str | None = None,
+    exception_message: str | None = None,
+) -> None:
+    """Append a telemetry entry and persist it to disk.
+
+    See :func:`_normalise_entry` for the accepted fields. Only the new entry
+    is written; existing history is neither re-read nor rewritten.
+    """
+    _normalise_entry(
+        entry,
+        agent_feedback=agent_feedback,
+        srs_ids=srs_ids,
+        command=command,
+        exit_status=exit_status,
+        exception_type=exception_type,
+        exception_message=exception_message,
     )
+    with _locked():
+        _append_line(entry)
 
 
-def _write_summary(entries: List[Dict[str, Any]]) -> None:
-    """Write a condensed summary of ``entries`` to ``telemetry/summary.json``."""
-    total = len(entries)
-    omitted = sum(1 for e in entries if e.get("srs_omitted"))
-    srs_ids: List[str] = []
+def _tally(
+    entries: List[Dict[str, Any]], state: Dict[str, Any] | None = None
+) -> Dict[str, Any]:
+    """Fold *entries* into the running summary *state*."""
+    if state is None:
+        state = {"total_entries": 0, "srs_omitted_count": 0, "srs_ids": []}
+    srs_ids = set(state["srs_ids"])
     for e in entries:
-        for sid in e.get("srs_ids", []):
-            if sid not in srs_ids:
-                srs_ids.append(sid)
+        state["total_entries"] += 1
+        if e.get("srs_omitted"):
+            state["srs_omitted_count"] += 1
+        srs_ids.update(e.get("srs_ids", []))
+    state["srs_ids"] = sorted(srs_ids)
+    return state
+
+
+def _load_state() -> Dict[str, Any] | None:
+    """Return the summary sidecar, or ``None`` if it is missing or unreadable."""
+    try:
+        state = json.loads(SUMMARY_STATE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or not isinstance(state.get("size"), int):
+        return None
+    return state
+
+
+def _write_summary_state(state: Dict[str, Any]) -> None:
+    """Write ``telemetry/summary.json`` from a tallied *state*."""
+    total = state["total_entries"]
+    omitted = state["srs_omitted_count"]
     summary = {
         "total_entries": total,
         "srs_omitted_count": omitted,
         "srs_omission_rate": omitted / total if total else 0.0,
-        "srs_ids": sorted(srs_ids),
+        "srs_ids": sorted(state["srs_ids"]),
     }
     SUMMARY_PATH.parent.mkdir(parents=True, exist_ok=True)
     SUMMARY_PATH.write_text(json.dumps(summary, indent=2), encoding="utf-8")
 
 
+def _write_summary(entries: List[Dict[str, Any]]) -> None:
+    """Write a condensed summary of ``entries`` to ``telemetry/summary.json``."""
+    _write_summary_state(_tally(entries))
+
+
 def record_telemetry_entry(
     entry: Dict[str, Any],
     agent_feedback: str | None = None,
@@ -156,8 +286,14 @@ def record_telemetry_entry(
     exception_type: str | None = None,
     exception_message: str | None = None,
 ) -> None:
-    """Append a telemetry entry and update the summary file."""
-    append_telemetry_entry(
+    """Append a telemetry entry and update the summary file.
+
+    The summary is folded forward from ``SUMMARY_STATE_PATH``, which records
+    the telemetry file size it covers. It is rebuilt from the full history
+    only when that size no longer matches, e.g. after a migration or when
+    another writer appended without updating the summary.
+    """
+    _normalise_entry(
         entry,
         agent_feedback=agent_feedback,
         srs_ids=srs_ids,
@@ -166,4 +302,13 @@ def record_telemetry_entry(
         exception_type=exception_type,
         exception_message=exception_message,
     )
-    _write_summary(load_telemetry())
+    with _locked():
+        before, after = _append_line(entry)
+        state = _load_state()
+        if state is None or state["size"] != before:
+            state = _tally(load_telemetry())
+        else:
+            state = _tally([entry], state)
+        state["size"] = after
+        _write_atomic(SUMMARY_STATE_PATH, json.dumps(state).encode("utf-8"))
+        _write_summary_state(state)
@@ -5,17 +5,32 @@ component‑specific tests when touching components with active guidance rules.
 """
 from __future__ import annotations
 
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Mapping
 
 
-def build_warnings(components: Iterable[str], guidance: List[Dict]) -> List[str]:
-    """Return a list of warning strings for the touched components."""
+def index_guidance(guidance: Iterable[Dict]) -> Dict[str, List[Dict]]:
+    """Group guidance rules by component, keeping their order."""
+    by_component: Dict[str, List[Dict]] = {}
+    for rule in guidance:
+        by_component.setdefault(rule["component"], []).append(rule)
+    return by_component
+
+
+def build_warnings(
+    components: Iterable[str], guidance: List[Dict] | Mapping[str, List[Dict]]
+) -> List[str]:
+    """Return a list of warning strings for the touched components.
+
+    ``guidance`` may be a list of rules or an index from
+    :func:`index_guidance`; a list is indexed once, so the cost is linear in
+    the number of rules plus the number of warnings.
+    """
+    by_component = guidance if isinstance(guidance, Mapping) else index_guidance(guidance)
     warnings: List[str] = []
     for comp in components:
-        for rule in guidance:
-            if rule["component"] == comp:
-                warnings.append(
-                    f"[codex-rules] Component '{comp}' touched. "
-                    f"Run: {rule['command']}  (to prevent {rule['test_id']} failures)"
-                )
+        for rule in by_component.get(comp, ()):
+            warnings.append(
+                f"[codex-rules] Component '{comp}' touched. "
+                f"Run: {rule['command']}  (to prevent {rule['test_id']} failures)"
+            )
     return warnings
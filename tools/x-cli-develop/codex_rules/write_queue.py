@@ -0,0 +1,106 @@
+"""Group commit for processes writing test events to one SQLite database.
+
+Parallel CI jobs often run ``ingest-tests`` against the same
+``rules_engine.sqlite``.  Rather than every process competing for the write
+lock with its own transactions, writers coordinate through a lock file next
+to the database:
+
+* A writer that takes the lock straight away commits its batch together with
+  any batches other writers have spooled, in one transaction.
+* A writer that finds the lock taken spools its batch to ``<db>.queue/`` and
+  waits.  When it gets the lock its batch has usually been committed by the
+  previous holder already and it returns at once; otherwise it drains the
+  queue itself.
+
+Spooled batch ids are recorded in ``ingest_batches`` in the same transaction
+as their events, so a batch is applied once even if its committer dies
+before removing the spool file.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from .locking import FileLock
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .storage import Storage
+
+# Spooled batches committed per transaction at most, to bound its size.
+MAX_BATCHES_PER_COMMIT = 64
+
+Batch = Tuple[str | None, List[Dict]]
+
+
+class WriteQueue:
+    """Serialize and merge the test-event writes of one :class:`Storage`."""
+
+    def __init__(self, storage: "Storage") -> None:
+        self.storage = storage
+        self.dir = Path(f"{storage.path}.queue")
+        self.lock = FileLock(self.dir / ".lock")
+
+    def submit(self, events: List[Dict]) -> int:
+        """Commit *events* and return the number of batches this call wrote
+        (0 when another writer committed them)."""
+        if self.lock.acquire(blocking=False):
+            try:
+                return self._drain((None, events), None)
+            finally:
+                self.lock.release()
+        path = self._spool(events)
+        with self.lock:
+            if not path.exists():
+                return 0
+            return self._drain((path.stem, events), path)
+
+    def _spool(self, events: List[Dict]) -> Path:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        batch_id = f"{time.time_ns():020d}-{os.getpid()}-{os.urandom(4).hex()}"
+        path = self.dir / f"{batch_id}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(events), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+    def _pending(self, own_path: Path | None) -> List[Tuple[Path, Batch]]:
+        if not self.dir.exists():
+            return []
+        pending = []
+        for path in sorted(self.dir.glob("*.json"))[:MAX_BATCHES_PER_COMMIT]:
+            if path != own_path:
+                events = json.loads(path.read_text(encoding="utf-8"))
+                pending.append((path, (path.stem, events)))
+        return pending
+
+    def _drain(self, own: Batch, own_path: Path | None) -> int:
+        """Commit *own* and the spooled batches; call with the lock held."""
+        pending = self._pending(own_path)
+        try:
+            self.storage._commit_batches([own] + [batch for _, batch in pending])
+        except sqlite3.Error:
+            if not pending:
+                self._discard(own_path)
+                raise
+            # Do not let someone else's batch fail this writer: commit ours
+            # alone and leave theirs for their owners to retry.
+            pending = []
+            try:
+                self.storage._commit_batches([own])
+            except sqlite3.Error:
+                self._discard(own_path)
+                raise
+        done = [path for path, _ in pending] + ([own_path] if own_path else [])
+        for path in done:
+            path.unlink(missing_ok=True)
+        self.storage._forget_batches([path.stem for path in done])
+        return len(pending) + 1
+
+    @staticmethod
+    def _discard(path: Path | None) -> None:
+        if path is not None:
+            path.unlink(missing_ok=True)
@@ -1,28 +1,22 @@
 #!/usr/bin/env python3
 from pathlib import Path
-import re
+import sys
 from ruamel.yaml import YAML
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from scripts.lib.srs import SrsDoc, load_corpus  # noqa: E402
 SRS = ROOT / "docs" / "srs"; OUT = SRS / "index.yaml"
-# Accept domains with optional hyphen segments (e.g., QA, QA-COV)
-RID = re.compile(r"\b([A-Z]{3}-REQ-([A-Z-]+)-(\d{3}))\b")
-def parse(p: Path):
-    t=p.read_text(errors="ignore")
-    ridm=RID.search(t); title=re.search(r"^#\s+(.+)$", t, re.M)
-    version=re.search(r"^Version:\s*([^\n]+)", t, re.M)
-    owner=re.search(r"^Owner:\s*([^\n]+)", t, re.M)
-    priority=re.search(r"^Priority:\s*([^\n]+)", t, re.M)
-    status=re.search(r"^Status:\s*([^\n]+)", t, re.M)
-    methods=re.findall(r"Method\(s\):\s*([^\n]+)", t)
-    if not ridm: return None
-    rid, domain, num = ridm.group(1), ridm.group(2), int(ridm.group(3))
-    return {"id":rid,"title":title.group(1).strip() if title else p.stem,"domain":domain,"number":num,
-            "version":version.group(1).strip() if version else "","priority":priority.group(1).strip() if priority else "",
-            "owner":owner.group(1).strip() if owner else "","status":status.group(1).strip() if status else "",
-            "verification_methods":[m.strip() for m in methods[-1].split("|")] if methods else [],
+def parse(doc: SrsDoc):
+    # Domains may have optional hyphen segments (e.g., QA, QA-COV)
+    if not doc.req_id: return None
+    p = Path(doc.path)
+    return {"id":doc.req_id,"title":doc.heading or p.stem,"domain":doc.domain,"number":doc.number,
+            "version":doc.meta.get("Version",""),"priority":doc.meta.get("Priority",""),
+            "owner":doc.meta.get("Owner",""),"status":doc.meta.get("Status",""),
+            "verification_methods":doc.methods,
             "file":p.relative_to(ROOT).as_posix()}
 def main():
-    rows=[r for r in (parse(p) for p in sorted(SRS.glob("FGC-REQ-*.md"))) if r]
+    rows=[r for r in (parse(d) for d in load_corpus(SRS)) if r]
     data = {"count": len(rows), "requirements": rows}
     yaml = YAML(typ="safe")
     yaml.default_flow_style = False
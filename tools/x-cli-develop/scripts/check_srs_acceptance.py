@@ -6,26 +6,23 @@ section with at least one `AC` bullet (FGC-REQ-SPEC-001).
 """
 from __future__ import annotations
 
-import re
 import sys
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.lib.srs import load_corpus  # noqa: E402
+from scripts.lib.srs_rules import acceptance_errors  # noqa: E402
+
 SRS_DIR = REPO_ROOT / "docs" / "srs"
-AC_BULLET = re.compile(r"^- AC\d+\. ", re.MULTILINE)
 
 
 def scan() -> list[str]:
     errors: list[str] = []
-    for path in sorted(SRS_DIR.glob("FGC-REQ-*.md")):
-        text = path.read_text(encoding="utf-8")
-        if "Acceptance Criteria:" not in text:
-            rel = path.relative_to(REPO_ROOT).as_posix()
-            errors.append(f"{rel}: missing Acceptance Criteria section")
-            continue
-        if not AC_BULLET.search(text):
-            rel = path.relative_to(REPO_ROOT).as_posix()
-            errors.append(f"{rel}: missing AC bullet")
+    for doc in load_corpus(SRS_DIR):
+        rel = Path(doc.path).relative_to(REPO_ROOT).as_posix()
+        errors.extend(f"{rel}: {err}" for err in acceptance_errors(doc))
     return errors
 
 
@@ -6,26 +6,23 @@ non-zero when found (FGC-REQ-SPEC-001).
 """
 from __future__ import annotations
 
-import re
 import sys
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.lib.srs import load_corpus  # noqa: E402
+from scripts.lib.srs_rules import prohibited_terms  # noqa: E402
+
 SRS_DIR = REPO_ROOT / "docs" / "srs"
-PROHIBITED = re.compile(r"\b(should|must|will)\b", re.IGNORECASE)
 
 
 def scan() -> list[str]:
     errors: list[str] = []
-    for path in sorted(SRS_DIR.glob("*.md")):
-        text = path.read_text(encoding="utf-8").splitlines()
-        for idx, line in enumerate(text, 1):
-            match = PROHIBITED.search(line)
-            if match:
-                rel = path.relative_to(REPO_ROOT).as_posix()
-                errors.append(
-                    f"{rel}:{idx}: contains prohibited term '{match.group(0)}'"
-                )
+    for doc in load_corpus(SRS_DIR, "*.md"):
+        rel = Path(doc.path).relative_to(REPO_ROOT).as_posix()
+        errors.extend(f"{rel}:{err}" for err in prohibited_terms(doc))
     return errors
 
 
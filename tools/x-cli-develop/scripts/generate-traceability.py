@@ -5,6 +5,19 @@ Scans ``docs/srs`` for ``FGC-REQ-*`` identifiers and cross references tests
 across the entire ``tests`` tree as well as git commit metadata. The
 resulting matrix is written to ``telemetry/traceability.json``. Optional
 include/exclude patterns can scope which test files are considered.
+
+The test tree is walked once and a single ``git log`` is streamed, building
+inverted indexes from requirement ID to test files and commit SHAs, so the
+cost does not grow with the number of requirements.
+
+Results are cached in ``.codex/cache/traceability.json``: the IDs found in
+each spec and test file, keyed on the file's blob hash from
+``git ls-files -s`` (or its size and mtime when it is untracked or modified),
+and the commit index as of the last ``HEAD``.  Later runs only re-read
+changed files and only scan the messages of ``git log <last>..HEAD``; the
+merged SHA lists are put back in ``git log`` order (commits brought in by
+a merge may predate ``<last>``).  Pass ``--no-cache`` to rebuild from
+scratch.
 """
 from __future__ import annotations
 
@@ -14,24 +27,91 @@ import subprocess
 from pathlib import Path
 
 ID_RE = re.compile(r"FGC-REQ-[A-Z]+-\d{3}")
+CACHE_PATH = Path(".codex") / "cache" / "traceability.json"
+CACHE_VERSION = 1
+
+def _git(repo: Path, *args: str) -> str | None:
+    """Return the output of ``git *args`` in ``repo``, or None if it fails."""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=repo,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+def _load_cache(path: Path) -> dict:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": CACHE_VERSION}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {"version": CACHE_VERSION}
+    return cache
+
+def _save_cache(path: Path, cache: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache), encoding="utf-8")
+    tmp.replace(path)
 
-def _scan_specs(repo: Path) -> dict[str, str]:
+class _FileIds:
+    """Requirement IDs per file, reused while a file's content key is unchanged.
+
+    Clean tracked files are keyed on their blob hash from ``git ls-files -s``;
+    untracked or locally modified files on their size and mtime.  ``files``
+    holds the entries used this run, so deleted files drop out of the cache.
+    """
+
+    def __init__(self, repo: Path, cached: dict | None = None) -> None:
+        self.repo = repo
+        self.cached: dict[str, dict] = cached or {}
+        self.files: dict[str, dict] = {}
+        self.blobs: dict[str, str] = {}
+        staged = _git(repo, "ls-files", "-s", "-z", "--", "tests", "docs/srs")
+        modified = _git(repo, "ls-files", "-m", "-z", "--", "tests", "docs/srs")
+        if staged is None or modified is None:
+            return
+        for record in staged.split("\0"):
+            if record:
+                info, rel = record.split("\t", 1)
+                self.blobs[rel] = info.split()[1]
+        for rel in modified.split("\0"):
+            self.blobs.pop(rel, None)
+
+    def ids(self, path: Path) -> list[str]:
+        rel = path.relative_to(self.repo).as_posix()
+        key = self.blobs.get(rel)
+        if key is None:
+            st = path.stat()
+            key = f"stat:{st.st_size}:{st.st_mtime_ns}"
+        entry = self.cached.get(rel)
+        if entry is None or entry.get("key") != key:
+            text = path.read_text(encoding="utf-8", errors="ignore")
+            entry = {"key": key, "ids": sorted(set(ID_RE.findall(text)))}
+        self.files[rel] = entry
+        return entry["ids"]
+
+def _scan_specs(repo: Path, file_ids: _FileIds | None = None) -> dict[str, str]:
     """Return mapping of requirement ID to spec path."""
+    file_ids = file_ids or _FileIds(repo)
     srs_dir = repo / "docs" / "srs"
     mapping: dict[str, str] = {}
     for path in srs_dir.rglob("*.md"):
-        text = path.read_text(encoding="utf-8", errors="ignore")
-        for req_id in ID_RE.findall(text):
+        for req_id in file_ids.ids(path):
             mapping[req_id] = path.relative_to(repo).as_posix()
     return mapping
 
-def _tests_for(
+def _test_files(
     repo: Path,
-    req_id: str,
     include: list[str] | None = None,
     exclude: list[str] | None = None,
-) -> list[str]:
-    """Return list of test files referencing ``req_id``.
+) -> list[Path]:
+    """Return the test files to scan, honouring ``.gitignore`` when possible.
 
     Parameters ``include`` and ``exclude`` accept glob patterns relative to the
     ``tests`` directory. Patterns in ``include`` narrow the search, while
@@ -41,79 +121,161 @@ def _tests_for(
     if not test_dir.exists():
         return []
 
-    # ``rg`` (ripgrep) was previously used to efficiently search the ``tests``
-    # tree. Relying on an external binary made the script fragile when the tool
-    # was unavailable (for example in minimal test environments), causing
-    # invocation to fail with ``FileNotFoundError``.  To keep the dependency
-    # surface small we now scan files directly in Python.  While this is slower
-    # than ripgrep on large trees, the simplicity is acceptable for the small
-    # repositories this script targets and ensures the script always works
-    # out-of-the-box.  When ``git`` is available we ask it for the list of test
-    # files so ``.gitignore`` rules are honoured similar to ripgrep's default
-    # behaviour.
+    # Files are scanned directly in Python rather than with ``rg`` so the
+    # script works without external binaries.  When ``git`` is available we
+    # ask it for the list of test files so ``.gitignore`` rules are honoured
+    # similar to ripgrep's default behaviour.
 
     from fnmatch import fnmatch
 
     include = include or []
     exclude = exclude or []
 
-    def iter_files() -> list[Path]:
-        try:
-            result = subprocess.run(
-                [
-                    "git",
-                    "ls-files",
-                    "--cached",
-                    "--others",
-                    "--exclude-standard",
-                    str(test_dir),
-                ],
-                cwd=repo,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-        except FileNotFoundError:
-            result = subprocess.CompletedProcess("git", 1, stdout="", stderr="")
-
-        if result.returncode == 0:
-            return [repo / line for line in result.stdout.splitlines() if line.strip()]
-        return [p for p in test_dir.rglob("*") if p.is_file()]
-
-    matches: list[str] = []
-    for path in iter_files():
+    try:
+        result = subprocess.run(
+            [
+                "git",
+                "ls-files",
+                "--cached",
+                "--others",
+                "--exclude-standard",
+                str(test_dir),
+            ],
+            cwd=repo,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError:
+        result = subprocess.CompletedProcess("git", 1, stdout="", stderr="")
+
+    if result.returncode == 0:
+        candidates = [repo / line for line in result.stdout.splitlines() if line.strip()]
+    else:
+        candidates = [p for p in test_dir.rglob("*") if p.is_file()]
+
+    files: list[Path] = []
+    for path in candidates:
         if not path.is_file():
             continue
         rel = path.relative_to(test_dir).as_posix()
-
         if include and not any(fnmatch(rel, pat) for pat in include):
             continue
         if any(fnmatch(rel, pat) for pat in exclude):
             continue
+        files.append(path)
+    return files
 
+def _index_tests(
+    repo: Path,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    file_ids: _FileIds | None = None,
+) -> dict[str, list[str]]:
+    """Return mapping of requirement ID to the sorted test files citing it.
+
+    Every test file is scanned at most once with ``ID_RE``; files whose
+    cached key in ``file_ids`` still matches are not read at all.
+    """
+    file_ids = file_ids or _FileIds(repo)
+    index: dict[str, list[str]] = {}
+    for path in _test_files(repo, include, exclude):
         try:
-            text = path.read_text(encoding="utf-8", errors="ignore")
+            ids = file_ids.ids(path)
         except OSError:
             continue
-        if req_id in text:
-            matches.append(path.relative_to(repo).as_posix())
+        rel = path.relative_to(repo).as_posix()
+        for req_id in ids:
+            index.setdefault(req_id, []).append(rel)
+    for files in index.values():
+        files.sort()
+    return index
+
+def _tests_for(
+    repo: Path,
+    req_id: str,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+) -> list[str]:
+    """Return list of test files referencing ``req_id``.
 
-    return sorted(matches)
+    Convenience wrapper for a single ID; use ``_index_tests`` for many.
+    """
+    return _index_tests(repo, include, exclude).get(req_id, [])
+
+def _index_commits(repo: Path, cache: dict | None = None) -> dict[str, list[str]]:
+    """Return mapping of requirement ID to the commits mentioning it.
+
+    Streams one ``git log`` over the commit messages; SHAs are listed
+    newest first, as ``git log --grep`` would.  With a ``cache`` from an
+    earlier run whose ``HEAD`` is an ancestor of the current one, only the
+    new commits are scanned and the merged lists are re-sorted by the
+    ``git rev-list HEAD`` order; ``cache["commits"]`` is updated in place.
+    """
+    head = _git(repo, "rev-parse", "--verify", "-q", "HEAD")
+    if head is None:
+        return {}
+    head = head.strip()
+    cached = (cache or {}).get("commits") or {}
+    last = cached.get("head")
+    if last == head:
+        return cached["ids"]
+    base: dict[str, list[str]] = {}
+    rev_range = head
+    if last and _git(repo, "merge-base", "--is-ancestor", last, head) is not None:
+        base = cached["ids"]
+        rev_range = f"{last}..{head}"
+    index = _scan_log(repo, rev_range)
+    if index is None:
+        return {}
+    rank: dict[str, int] | None = None
+    if base and index:
+        order = _git(repo, "rev-list", head)
+        if order is None:
+            return {}
+        # Same default ordering as ``git log``; SHAs no longer reachable sort last.
+        rank = {sha: i for i, sha in enumerate(order.split())}
+    for req_id, shas in base.items():
+        merged = index.setdefault(req_id, [])
+        resort = rank is not None and bool(merged)
+        merged.extend(shas)
+        if resort:
+            merged.sort(key=lambda sha: rank.get(sha, len(rank)))
+    if cache is not None:
+        cache["commits"] = {"head": head, "ids": index}
+    return index
 
-def _commits_for(repo: Path, req_id: str) -> list[str]:
+def _scan_log(repo: Path, rev_range: str) -> dict[str, list[str]] | None:
+    """Map requirement IDs to the commits of ``rev_range``, newest first."""
     try:
-        result = subprocess.run(
-            ["git", "log", "--format=%H", "--grep", req_id],
+        proc = subprocess.Popen(
+            ["git", "log", "--format=%x00%H%n%B", rev_range, "--"],
             cwd=repo,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            check=False,
+            encoding="utf-8",
+            errors="ignore",
         )
     except FileNotFoundError:
-        return []
-    if result.returncode != 0:
-        return []
-    return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+        return None
+    index: dict[str, list[str]] = {}
+    sha = ""
+    seen: set[str] = set()
+    assert proc.stdout is not None
+    with proc.stdout:
+        for line in proc.stdout:
+            if line.startswith("\0"):
+                sha = line[1:].strip()
+                seen = set()
+                continue
+            for req_id in ID_RE.findall(line):
+                if req_id not in seen:
+                    seen.add(req_id)
+                    index.setdefault(req_id, []).append(sha)
+    if proc.wait() != 0:
+        return None
+    return index
 
 def main() -> int:
     from argparse import ArgumentParser
@@ -131,17 +293,29 @@ def main() -> int:
         default=[],
         help="Glob pattern to exclude (relative to tests/)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Ignore and rebuild {CACHE_PATH.as_posix()}",
+    )
     args = parser.parse_args()
 
     repo = Path(__file__).resolve().parent.parent
-    specs = _scan_specs(repo)
+    cache_path = repo / CACHE_PATH
+    cache = {"version": CACHE_VERSION} if args.no_cache else _load_cache(cache_path)
+    file_ids = _FileIds(repo, cache.get("files"))
+    specs = _scan_specs(repo, file_ids)
+    tests = _index_tests(repo, args.include, args.exclude, file_ids)
+    commits = _index_commits(repo, cache)
+    cache["files"] = file_ids.files
+    _save_cache(cache_path, cache)
     matrix = []
     for req_id, spec in sorted(specs.items()):
         entry = {
             "id": req_id,
             "spec": spec,
-            "tests": _tests_for(repo, req_id, args.include, args.exclude),
-            "commits": _commits_for(repo, req_id),
+            "tests": tests.get(req_id, []),
+            "commits": commits.get(req_id, []),
         }
         matrix.append(entry)
     out_path = repo / "telemetry" / "traceability.json"
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+"""Parsed model of the ``docs/srs`` requirement pages.
+
+The SRS checkers (index builder, 29148 linter and compliance report,
+terminology/acceptance/consistency checks, deprecated counter) used to read
+and regex-parse every page on their own.  They now share :class:`SrsDoc`,
+built by one line-oriented pass over each page:
+
+ - header fields: requirement ID, ``# `` heading, ``Version:``/``Status:``
+   style lines and the verification ``Method(s):``;
+ - ``## `` sections (first occurrence wins) and the ``## Attributes`` pairs;
+ - the ``Statement(s)`` bullets and the ``Acceptance Criteria:`` bullets;
+ - whole-page language findings (``shall``, vague terms, TBD placeholders,
+   prohibited should/must/will lines).
+
+Parsed pages are cached in ``.codex/cache/srs_docs.json`` by
+:class:`FileCache`, keyed on each file's size and mtime, falling back to its
+SHA-1 when those changed, so a pipeline that runs several checkers parses
+each page once.  The cache is dropped when this module's source changes.
+Set ``SRS_DOC_CACHE=0`` to bypass it.
+"""
+
+from dataclasses import asdict, dataclass, field, fields
+from hashlib import sha1
+from pathlib import Path
+from typing import Any, Iterable
+import json
+import os
+import re
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CACHE_PATH = REPO_ROOT / ".codex" / "cache" / "srs_docs.json"
+# Bump when the cached model changes shape; source edits are detected anyway.
+PARSER_VERSION = 1
+
+REQ_ID = re.compile(r"\b[A-Z]{3}-REQ-([A-Z-]+)-(\d{3})\b")
+SHALL = re.compile(r"\bshall\b", re.I)
+VAGUE = re.compile(
+    r"\b(easy|user[- ]?friendly|quick|fast|adequate|sufficient|robust|flexible|scalable"
+    r"|typically|generally|approximately|etc\.?)\b",
+    re.I,
+)
+PLACEHOLDER = re.compile(r"\b(TBD|TBS|TBR)\b")
+PROHIBITED = re.compile(r"\b(should|must|will)\b", re.I)
+_HEADING = re.compile(r"^#\s+(.+)$")
+_FIELD = re.compile(r"^(Version|Priority|Owner|Status):\s*(.+)$")
+_METHODS = re.compile(r"Method\(s\):\s*(.+)$")
+
+
+@dataclass
+class SrsDoc:
+    path: str
+    req_id: str | None = None
+    heading: str | None = None
+    # First ``Version:``/``Priority:``/``Owner:``/``Status:`` line anywhere.
+    meta: dict[str, str] = field(default_factory=dict)
+    methods: list[str] = field(default_factory=list)
+    sections: dict[str, str] = field(default_factory=dict)
+    # ``## Attributes`` pairs with lower-cased keys.
+    attributes: dict[str, str] = field(default_factory=dict)
+    statements: list[str] = field(default_factory=list)
+    # Bullets after ``Acceptance Criteria:`` in Verification; None if absent.
+    acceptance: list[str] | None = None
+    has_shall: bool = False
+    vague: bool = False
+    placeholder: bool = False
+    # (line number, term) of the first should/must/will on each line.
+    prohibited: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def status(self) -> str:
+        return self.attributes.get("status", "")
+
+    @property
+    def deprecated(self) -> bool:
+        return self.status.lower() == "deprecated"
+
+    @property
+    def domain(self) -> str | None:
+        m = REQ_ID.fullmatch(self.req_id or "")
+        return m.group(1) if m else None
+
+    @property
+    def number(self) -> int | None:
+        m = REQ_ID.fullmatch(self.req_id or "")
+        return int(m.group(2)) if m else None
+
+
+def parse(path: str | Path, text: str) -> SrsDoc:
+    """Parse the SRS page ``text`` read from ``path``."""
+    doc = SrsDoc(path=str(path))
+    m = REQ_ID.search(text)
+    doc.req_id = m.group(0) if m else None
+    doc.has_shall = SHALL.search(text) is not None
+    doc.vague = VAGUE.search(text) is not None
+    doc.placeholder = PLACEHOLDER.search(text) is not None
+
+    bodies: dict[str, list[str]] = {}
+    current: list[str] | None = None
+    for lineno, line in enumerate(text.splitlines(), 1):
+        term = PROHIBITED.search(line)
+        if term:
+            doc.prohibited.append((lineno, term.group(0)))
+        if line.startswith("## "):
+            name = line[3:].strip()
+            current = None if name in bodies else bodies.setdefault(name, [])
+            continue
+        if current is not None:
+            current.append(line)
+        if doc.heading is None:
+            h = _HEADING.match(line)
+            if h:
+                doc.heading = h.group(1).strip()
+        f = _FIELD.match(line)
+        if f and f.group(1) not in doc.meta:
+            doc.meta[f.group(1)] = f.group(2).strip()
+        methods = _METHODS.search(line)
+        if methods:
+            doc.methods = [x.strip() for x in methods.group(1).split("|")]
+
+    doc.sections = {name: "\n".join(lines).strip() for name, lines in bodies.items()}
+    for ln in doc.sections.get("Attributes", "").splitlines():
+        if ":" in ln:
+            k, v = ln.split(":", 1)
+            doc.attributes.setdefault(k.strip().lower(), v.strip())
+    stm = doc.sections.get("Statement(s)", "")
+    doc.statements = [ln for ln in stm.splitlines() if ln.strip().startswith("-")]
+    ver = doc.sections.get("Verification", "")
+    if "Acceptance Criteria:" in ver:
+        block = ver.split("Acceptance Criteria:", 1)[1]
+        doc.acceptance = [ln for ln in block.splitlines() if ln.strip().startswith("-")]
+    return doc
+
+
+def doc_from_json(data: dict) -> SrsDoc:
+    """Rebuild an :class:`SrsDoc` from its ``dataclasses.asdict`` form."""
+    doc = SrsDoc(**{f.name: data[f.name] for f in fields(SrsDoc)})
+    doc.prohibited = [tuple(p) for p in doc.prohibited]
+    return doc
+
+
+def source_digest(*paths: str | Path) -> str:
+    """SHA-1 over the contents of ``paths``, to stamp caches of derived data."""
+    h = sha1()
+    for p in paths:
+        h.update(Path(p).read_bytes())
+    return h.hexdigest()
+
+
+def cache_enabled(cache: bool = True) -> bool:
+    """``cache`` unless ``SRS_DOC_CACHE`` turns caching off."""
+    return cache and os.environ.get("SRS_DOC_CACHE", "1") not in ("0", "false", "False", "")
+
+
+class FileCache:
+    """JSON file of per-page values, valid while the page is unchanged.
+
+    Entries are keyed on the resolved page path and checked against its size
+    and mtime, then its SHA-1.  Every entry is dropped when ``stamp`` (the
+    version of whatever computed the values) differs from the stored one.
+    A ``path`` of None disables the cache.
+    """
+
+    def __init__(self, path: Path | None, stamp: str) -> None:
+        self.path = path
+        self.stamp = stamp
+        self.entries: dict[str, dict] = {}
+        self._misses: dict[str, dict] = {}
+        self.dirty = False
+        if path is None:
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("stamp") == stamp:
+            self.entries = data.get("files", {})
+
+    def get(self, path: Path) -> tuple[Any, bytes | None]:
+        """Return ``(value, None)`` for an unchanged page, else ``(None, raw)``
+        with its bytes; :meth:`put` then records the value computed from them."""
+        key = str(path.resolve())
+        st = path.stat()
+        entry = self.entries.get(key)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["value"], None
+        raw = path.read_bytes()
+        digest = sha1(raw).hexdigest()
+        if entry and entry["sha1"] == digest:
+            self.entries[key] = dict(entry, size=st.st_size, mtime_ns=st.st_mtime_ns)
+            self.dirty = True
+            return entry["value"], None
+        self._misses[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": digest}
+        return None, raw
+
+    def put(self, path: Path, value: Any) -> None:
+        key = str(path.resolve())
+        self.entries[key] = dict(self._misses.pop(key), value=value)
+        self.dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        files = {k: v for k, v in self.entries.items() if os.path.exists(k)}
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({"stamp": self.stamp, "files": files}), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            # The cache is an optimisation; a read-only checkout still works.
+            pass
+
+
+def doc_cache(cache: bool = True) -> FileCache:
+    """Open the parse cache (disabled when ``cache`` is false)."""
+    stamp = f"{PARSER_VERSION}:{source_digest(__file__)}"
+    return FileCache(CACHE_PATH if cache_enabled(cache) else None, stamp)
+
+
+def load_doc(store: FileCache, path: Path) -> SrsDoc:
+    """Return the parsed page at ``path`` from ``store``, parsing it on a miss."""
+    value, raw = store.get(path)
+    if raw is None:
+        doc = doc_from_json(value)
+        doc.path = str(path)
+    else:
+        doc = parse(path, raw.decode("utf-8", errors="ignore"))
+        store.put(path, asdict(doc))
+    return doc
+
+
+def load_docs(paths: Iterable[Path], *, cache: bool = True) -> list[SrsDoc]:
+    """Return the parsed pages at ``paths``, in order, via the cache."""
+    store = doc_cache(cache)
+    try:
+        return [load_doc(store, Path(p)) for p in paths]
+    finally:
+        store.save()
+
+
+def load_corpus(
+    srs_dir: str | Path, pattern: str = "FGC-REQ-*.md", *, cache: bool = True
+) -> list[SrsDoc]:
+    """Return the parsed pages matching ``pattern`` in ``srs_dir``, sorted by path."""
+    return load_docs(sorted(Path(srs_dir).glob(pattern)), cache=cache)
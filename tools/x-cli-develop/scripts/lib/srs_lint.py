@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+"""Parallel 29148 linting of the ``docs/srs`` pages with a result cache.
+
+``lint_corpus`` returns, for every ``FGC-REQ-*.md`` page, the errors and
+infos of :func:`scripts.lib.srs_rules.lint_29148` and whether the page is
+compliant for ``compute_29148_compliance.py``.  Results are kept in
+``.codex/cache/srs_lint.json`` by :class:`scripts.lib.srs.FileCache`, so
+only edited pages are linted again; the whole cache is dropped when
+``attributes.yaml`` or the source of the parser or the rules changes.
+Pages are taken from the shared parse cache when it has them, and pages
+parsed here are added to it.
+
+Pages that do need linting are spread over a process pool of ``jobs``
+workers once there are at least ``PARALLEL_MIN_FILES`` of them (below that,
+starting the workers costs more than it saves).  The rule patterns are
+compiled once per worker, at import.  Set ``SRS_DOC_CACHE=0`` to bypass the
+caches.
+"""
+
+from dataclasses import asdict
+from hashlib import sha1
+from itertools import repeat
+from pathlib import Path
+from typing import NamedTuple
+import json
+import os
+
+from scripts.lib import srs, srs_rules
+from scripts.lib.srs import FileCache, cache_enabled, doc_cache, doc_from_json, parse, source_digest
+from scripts.lib.srs_rules import is_compliant, lint_29148
+
+CACHE_PATH = srs.REPO_ROOT / ".codex" / "cache" / "srs_lint.json"
+CACHE_VERSION = 2
+PARALLEL_MIN_FILES = 64
+# Editing any of these invalidates every cached result.
+RULE_SOURCES = (srs.__file__, srs_rules.__file__)
+
+
+class FileResult(NamedTuple):
+    path: str
+    errors: list[str]
+    infos: list[str]
+    compliant: bool
+
+
+def _lint_page(path: str, page: str | dict, schema: dict) -> tuple[dict, dict | None]:
+    """Lint ``page`` (its text, or its cached model); also return the model
+    when it had to be parsed."""
+    if isinstance(page, str):
+        doc = parse(path, page)
+        parsed = asdict(doc)
+    else:
+        doc = doc_from_json(page)
+        parsed = None
+    errors, infos = lint_29148(doc, schema)
+    return {"errors": errors, "infos": infos, "compliant": is_compliant(doc)}, parsed
+
+
+def _stamp(schema: dict) -> str:
+    data = json.dumps(
+        [CACHE_VERSION, srs.PARSER_VERSION, source_digest(*RULE_SOURCES), schema],
+        sort_keys=True,
+        default=str,
+    )
+    return sha1(data.encode("utf-8")).hexdigest()
+
+
+def lint_corpus(
+    srs_dir: str | Path,
+    schema: dict,
+    *,
+    jobs: int | None = None,
+    cache: bool = True,
+) -> list[FileResult]:
+    """Lint the ``FGC-REQ-*.md`` pages of ``srs_dir``, sorted by path."""
+    results = FileCache(CACHE_PATH if cache_enabled(cache) else None, _stamp(schema))
+    docs = doc_cache(cache)
+    paths = sorted(Path(srs_dir).glob("FGC-REQ-*.md"))
+    linted: dict[Path, dict] = {}
+    pending: list[tuple[Path, str | dict]] = []
+    for path in paths:
+        result, raw = results.get(path)
+        if raw is None:
+            linted[path] = result
+            continue
+        model, doc_raw = docs.get(path)
+        if doc_raw is not None:
+            model = doc_raw.decode("utf-8", errors="ignore")
+        pending.append((path, model))
+
+    jobs = jobs or os.cpu_count() or 1
+    args = ([str(p) for p, _ in pending], [page for _, page in pending], repeat(schema))
+    if jobs > 1 and len(pending) >= PARALLEL_MIN_FILES:
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = min(jobs, len(pending))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(
+                pool.map(_lint_page, *args, chunksize=max(1, len(pending) // (workers * 4)))
+            )
+    else:
+        done = list(map(_lint_page, *args))
+    for (path, _), (result, parsed) in zip(pending, done):
+        linted[path] = result
+        results.put(path, result)
+        if parsed is not None:
+            docs.put(path, parsed)
+    results.save()
+    docs.save()
+
+    return [
+        FileResult(str(p), linted[p]["errors"], linted[p]["infos"], linted[p]["compliant"])
+        for p in paths
+    ]
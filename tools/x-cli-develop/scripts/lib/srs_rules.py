@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+"""SRS page rules evaluated on :class:`scripts.lib.srs.SrsDoc`.
+
+Each checker script applies one of these; ``scripts/srs_check.py`` applies
+them all in a single pass over the corpus.  Messages are returned without
+the page path so callers can format locations their own way.
+"""
+
+from pathlib import Path
+import re
+
+from scripts.lib.srs import SrsDoc
+
+DEFAULT_REQUIRED_SECTIONS = ["Statement(s)", "Rationale", "Verification", "Attributes"]
+RQ_BULLET = re.compile(r"^- +RQ\d+\.\s")
+AC_BULLET = re.compile(r"^- +AC\d+\.\s")
+STRICT_AC_BULLET = re.compile(r"^- AC\d+\. ")
+_SHALL = re.compile(r"\bshall\b", re.I)
+_SHALL_NOT = re.compile(r"\bshall\s+not\b", re.I)
+_AND_OR = re.compile(r"\band/or\b", re.I)
+_IMPL_PATH = re.compile(r"\b(\.github/|\.ya?ml|\.py|/src/|/scripts/|/tests/)\b")
+_RATIONALE_PLACEHOLDER = re.compile(r"<why this requirement|<filled by author>", re.I)
+_TRACE_PLACEHOLDER = re.compile(r"^<add (paths|evidence)[^>]*>", re.I)
+_COMPLIANCE_ATTRS = ("priority", "owner", "status", "trace")
+
+
+def load_schema(srs_dir: str | Path) -> dict:
+    """Return ``attributes.yaml`` of ``srs_dir`` (empty when missing)."""
+    path = Path(srs_dir) / "attributes.yaml"
+    if not path.exists():
+        return {}
+    from ruamel.yaml import YAML  # type: ignore
+
+    return YAML(typ="safe").load(path.read_text()) or {}
+
+
+def prohibited_terms(doc: SrsDoc) -> list[str]:
+    """``<line>: contains prohibited term '<term>'`` for should/must/will."""
+    return [f"{n}: contains prohibited term '{term}'" for n, term in doc.prohibited]
+
+
+def acceptance_errors(doc: SrsDoc) -> list[str]:
+    """The page needs an Acceptance Criteria block with an ``- AC<n>. `` bullet."""
+    if doc.acceptance is None:
+        return ["missing Acceptance Criteria section"]
+    if not any(STRICT_AC_BULLET.match(ln) for ln in doc.acceptance):
+        return ["missing AC bullet"]
+    return []
+
+
+def consistency_errors(doc: SrsDoc) -> list[str]:
+    """Statement(s) must not mix 'shall' and 'shall not'."""
+    part = doc.sections.get("Statement(s)")
+    if part and _SHALL.search(part) and _SHALL_NOT.search(part):
+        return ["contains both 'shall' and 'shall not' in Statement(s) (split/clarify)."]
+    return []
+
+
+def is_compliant(doc: SrsDoc) -> bool:
+    """Whether the page counts as fully ISO/IEC/IEEE 29148 compliant."""
+    return all(
+        [
+            "Statement(s)" in doc.sections,
+            any(RQ_BULLET.match(ln) for ln in doc.statements),
+            doc.has_shall,
+            "Verification" in doc.sections,
+            bool(doc.acceptance) and AC_BULLET.match(doc.acceptance[0]) is not None,
+            "Attributes" in doc.sections
+            and all(k in doc.attributes for k in _COMPLIANCE_ATTRS),
+            not doc.vague and not doc.placeholder,
+        ]
+    )
+
+
+def lint_29148(doc: SrsDoc, schema: dict) -> tuple[list[str], list[str]]:
+    """Return the 29148 lint errors and infos of ``doc``."""
+    errs: list[str] = []
+    infos: list[str] = []
+    attrs = doc.attributes
+    is_deprecated = doc.deprecated
+    if is_deprecated:
+        infos.append(
+            "Deprecated requirement detected; relaxed checks applied (shall/AC/vague terms)."
+        )
+    # Required sections
+    for sec in schema.get("required_sections", DEFAULT_REQUIRED_SECTIONS):
+        if sec not in doc.sections:
+            errs.append(f"missing '## {sec}' section")
+    # ID present & language
+    if not doc.req_id:
+        errs.append("no requirement ID found in file header")
+    # Allow Deprecated requirements to omit normative 'shall' language
+    if not is_deprecated and not doc.has_shall:
+        errs.append("no 'shall' in normative statements")
+    if not is_deprecated and doc.vague:
+        errs.append("vague terms present (avoid easy/robust/sufficient/etc.)")
+    if doc.placeholder:
+        errs.append("contains TBD/TBS/TBR placeholder(s)")
+    # Statements: atomic and numbered
+    if not doc.statements:
+        errs.append("no RQ bullets in Statement(s)")
+    for i, ln in enumerate(doc.statements, 1):
+        if not RQ_BULLET.match(ln):
+            errs.append(f"Statement(s) line {i}: expected '- RQ<i>. <shall...>' numbering")
+        if len(_SHALL.findall(ln)) > 1:
+            errs.append(f"Statement(s) line {i}: multiple 'shall' (split to atomic)")
+        if _AND_OR.search(ln):
+            errs.append(f"Statement(s) line {i}: contains 'and/or'")
+        if _IMPL_PATH.search(ln):
+            errs.append(f"Statement(s) line {i}: implementation path detected (move to Trace)")
+    # Verification: AC numbering; Deprecated requirements may omit AC details
+    if doc.acceptance is None:
+        if not is_deprecated:
+            errs.append("missing 'Acceptance Criteria' under Verification")
+    else:
+        if not doc.acceptance and not is_deprecated:
+            errs.append("no AC bullets under Acceptance Criteria")
+        for i, ln in enumerate(doc.acceptance, 1):
+            if not AC_BULLET.match(ln):
+                errs.append(f"AC line {i}: expected '- AC<i>. ...' numbering")
+    # Attributes enums
+    for key in ["priority", "owner", "status"]:
+        if key not in attrs:
+            errs.append(f"Attributes: missing {key}")
+        else:
+            enum = schema.get(key, {}).get("enum")
+            if enum and attrs[key] not in enum:
+                errs.append(f"Attributes: '{key}' value '{attrs[key]}' not in schema enum")
+    # Rationale & Trace placeholders
+    rat = doc.sections.get("Rationale", "")
+    if not rat or _RATIONALE_PLACEHOLDER.search(rat):
+        errs.append("Rationale: must be substantive (no placeholder)")
+    if _TRACE_PLACEHOLDER.search(attrs.get("trace", "")):
+        errs.append("Attributes: Trace must list real evidence paths (not placeholder)")
+    return errs, infos
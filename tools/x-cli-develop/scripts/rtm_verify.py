@@ -7,15 +7,23 @@ RTM gate: verify Req→Test→Code links for changed requirements or touched src
   * ID must match ^FGC-REQ-[A-Z]+-\\d{3,}$
   * `tests` and `code` must list at least 1 existing path each (globs expanded)
 Exits non-zero on gaps and prints a compact table.
+
+Globs are expanded against one listing of the repository (`git ls-files`,
+including untracked files that are not ignored) with `glob.glob` semantics,
+and changed paths are matched to requirements through an index built once
+from all `code` globs.
 """
 from __future__ import annotations
-import os, re, sys, subprocess, glob
+import fnmatch, os, re, sys, subprocess
 from pathlib import Path
 from ruamel.yaml import YAML
 
 ROOT = Path(__file__).resolve().parents[1]
 
 ID_RE = re.compile(r"^FGC-REQ-[A-Z]+-\d{3,}$")
+_MAGIC = re.compile(r"[*?[]")
+# A non-hidden path segment, as `*`/`**` match them in glob.glob.
+_SEG = r"[^/.][^/]*"
 
 def git_changed_files() -> list[str]:
     # Prefer PR base/head if available
@@ -35,6 +43,126 @@ def git_changed_files() -> list[str]:
     except Exception:
         return []
 
+def repo_paths(root: Path = ROOT) -> tuple[set[str], set[str]]:
+    """Return the files of ``root`` and their parent directories, as posix
+    paths relative to ``root``: ``(files | dirs, dirs)``."""
+    try:
+        out = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=root, capture_output=True, text=True, check=True,
+        ).stdout
+        files = [f for f in out.split("\0") if f]
+    except (OSError, subprocess.CalledProcessError):
+        files = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d != ".git"]
+            rel = Path(dirpath).relative_to(root).as_posix()
+            files += [f if rel == "." else f"{rel}/{f}" for f in filenames]
+    dirs: set[str] = set()
+    for f in files:
+        parts = f.split("/")[:-1]
+        for i in range(len(parts), 0, -1):
+            d = "/".join(parts[:i])
+            if d in dirs:
+                break
+            dirs.add(d)
+    return set(files) | dirs, dirs
+
+def _segment_regex(seg: str) -> str:
+    out = [] if seg.startswith(".") else [r"(?!\.)"]
+    i = 0
+    while i < len(seg):
+        c = seg[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = seg.find("]", i + 2 if seg[i + 1:i + 2] in ("!", "]") else i + 1)
+            if j < 0:
+                out.append(re.escape(c))
+            else:
+                body = seg[i + 1:j].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"(?!/)[{body}]")
+                i = j
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+def compile_glob(pattern: str) -> re.Pattern[str]:
+    """Compile a `glob.glob(pattern, recursive=True)` pattern into a regex
+    over the relative paths returned by :func:`repo_paths`."""
+    segs = [s for s in pattern.split("/") if s not in ("", ".")]
+    rx = ""
+    sep = False  # whether the next segment needs a leading "/"
+    for i, seg in enumerate(segs):
+        if seg == "**":
+            if i == len(segs) - 1:
+                rx += f"(?:/{_SEG})*" if rx else f"{_SEG}(?:/{_SEG})*"
+            else:
+                rx += ("/" if sep else "") + f"(?:{_SEG}/)*"
+                sep = False
+            continue
+        rx += ("/" if sep else "") + (_segment_regex(seg) if _MAGIC.search(seg) else re.escape(seg))
+        sep = True
+    return re.compile(rf"(?s:{rx})\Z")
+
+class PathIndex:
+    """Expand globs against one in-memory listing of the repository."""
+
+    def __init__(self, paths: set[str], dirs: set[str]) -> None:
+        self.paths = paths
+        self.dirs = dirs
+        self._sorted = sorted(paths)
+        self._cache: dict[str, list[str]] = {}
+
+    def expand(self, pattern: str) -> list[str]:
+        hit = self._cache.get(pattern)
+        if hit is None:
+            if _MAGIC.search(pattern):
+                rx = compile_glob(pattern)
+                hit = [p for p in self._sorted if rx.match(p)]
+            else:
+                key = "/".join(s for s in pattern.split("/") if s not in ("", "."))
+                hit = [key] if key in self.paths else []
+            if pattern.endswith("/"):
+                hit = [p for p in hit if p in self.dirs]
+            self._cache[pattern] = hit
+        return hit
+
+class ChangeIndex:
+    """Map changed paths to the requirements whose `code` globs touch them.
+
+    A path matches a glob when it ``fnmatch``es it or ends with the glob
+    minus its leading ``./`` characters.  Literal globs and suffixes are
+    dict lookups; wildcard globs are compiled once and shared by every
+    requirement listing them.
+    """
+
+    def __init__(self, reqs: list[dict]) -> None:
+        self.exact: dict[str, set[int]] = {}
+        self.suffix: dict[str, set[int]] = {}
+        self.wild: dict[str, set[int]] = {}
+        for n, ent in enumerate(reqs):
+            for g in ent.get("code") or []:
+                self.suffix.setdefault(g.lstrip("./"), set()).add(n)
+                table = self.wild if _MAGIC.search(g) else self.exact
+                table.setdefault(g, set()).add(n)
+        self._wild = [(re.compile(fnmatch.translate(g)), ns) for g, ns in self.wild.items()]
+
+    def match(self, path: str) -> set[int]:
+        """Indexes of the requirements whose `code` globs match ``path``."""
+        hits = set(self.exact.get(path, ()))
+        for i in range(len(path) + 1):
+            hits |= self.suffix.get(path[i:], set())
+        for rx, ns in self._wild:
+            if not ns <= hits and rx.match(path):
+                hits |= ns
+        return hits
+
 def main() -> int:
     mapping_path = ROOT / "docs" / "traceability.yaml"
     if not mapping_path.exists():
@@ -52,31 +180,29 @@ def main() -> int:
     errs = []
 
     reqs = data.get("requirements") or []
-    for ent in reqs:
+    touched: set[int] = set()
+    if code_touched:
+        index = ChangeIndex(reqs)
+        for c in code_touched:
+            touched |= index.match(c)
+    files: PathIndex | None = None
+    for n, ent in enumerate(reqs):
         rid = (ent.get("id") or "").strip()
         src = (ent.get("source") or "").strip()
         code_globs = ent.get("code") or []
         tests = ent.get("tests") or []
 
         # Determine if this entry is in-scope for this PR
-        in_scope = False
-        if req_changed and src:
-            in_scope = True
-        if code_touched:
-            for g in code_globs:
-                for c in code_touched:
-                    # crude glob match
-                    if glob.fnmatch.fnmatch(c, g) or c.endswith(g.lstrip("./")):
-                        in_scope = True
-                        break
-                if in_scope: break
+        in_scope = bool(req_changed and src) or n in touched
         if not in_scope:
             continue
 
+        if files is None:
+            files = PathIndex(*repo_paths())
         rid_ok = bool(ID_RE.fullmatch(rid))
-        code_expanded = sorted({p for g in code_globs for p in glob.glob(g, recursive=True)})
-        tests_expanded = sorted({p for g in tests for p in glob.glob(g, recursive=True)})
-        src_ok = (Path(src).exists()) if src else False
+        code_expanded = sorted({p for g in code_globs for p in files.expand(g)})
+        tests_expanded = sorted({p for g in tests for p in files.expand(g)})
+        src_ok = (ROOT / src).exists() if src else False
         code_ok = len(code_expanded) > 0
         tests_ok = len(tests_expanded) > 0
 
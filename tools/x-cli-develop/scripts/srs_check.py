@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Apply every SRS page rule in one pass over ``docs/srs``.
+
+Runs the checks of ``check_srs_terms.py``, ``check_srs_acceptance.py``,
+``lint_srs_29148.py`` and ``check_srs_consistency.py`` (duplicate IDs are
+taken from the pages rather than ``index.yaml``) on the shared parsed page
+model, and prints the 29148 compliance ratio ``compute_29148_compliance.py``
+reports.  Each page is parsed once, or not at all when the parse cache in
+``.codex/cache/srs_docs.json`` is current.
+
+Exits non-zero when any selected rule fails.  ``--rules`` selects a
+comma-separated subset of: terms, acceptance, lint, consistency.
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import os
+import sys
+from fnmatch import fnmatch
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.lib.srs import SrsDoc, load_corpus  # noqa: E402
+from scripts.lib.srs_rules import (  # noqa: E402
+    acceptance_errors,
+    consistency_errors,
+    is_compliant,
+    lint_29148,
+    load_schema,
+    prohibited_terms,
+)
+
+RULES = ("terms", "acceptance", "lint", "consistency")
+
+
+def _rel(doc: SrsDoc) -> str:
+    path = Path(doc.path)
+    try:
+        return path.resolve().relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def check(srs_dir: Path, rules: tuple[str, ...] = RULES, *, cache: bool = True) -> dict:
+    """Return ``errors`` and ``infos`` (lists of ``[rule] message``) and the
+    compliance counts of the ``FGC-REQ-*.md`` pages in ``srs_dir``."""
+    schema = load_schema(srs_dir) if "lint" in rules else {}
+    errors: list[str] = []
+    infos: list[str] = []
+    ids: collections.Counter[str] = collections.Counter()
+    total = ok = 0
+    for doc in load_corpus(srs_dir, "*.md", cache=cache):
+        rel = _rel(doc)
+        if "terms" in rules:
+            errors += [f"[terms] {rel}:{e}" for e in prohibited_terms(doc)]
+        if not fnmatch(Path(doc.path).name, "FGC-REQ-*.md"):
+            continue
+        total += 1
+        ok += is_compliant(doc)
+        if doc.req_id:
+            ids[doc.req_id] += 1
+        if "acceptance" in rules:
+            errors += [f"[acceptance] {rel}: {e}" for e in acceptance_errors(doc)]
+        if "lint" in rules:
+            errs, notes = lint_29148(doc, schema)
+            errors += [f"[lint] {rel}: {e}" for e in errs]
+            infos += [f"[lint] INFO: {rel} - {note}" for note in notes]
+        if "consistency" in rules and doc.req_id:
+            errors += [f"[consistency] {doc.req_id}: {e}" for e in consistency_errors(doc)]
+    if "consistency" in rules:
+        dups = [k for k, c in ids.items() if c > 1]
+        if dups:
+            errors.append(f"[consistency] Duplicate IDs: {', '.join(dups)}")
+    return {"errors": errors, "infos": infos, "files_total": total, "files_ok": ok}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--srs-dir", type=Path, default=REPO_ROOT / "docs" / "srs")
+    parser.add_argument(
+        "--rules",
+        default=",".join(RULES),
+        help=f"comma-separated rules to apply (default: {','.join(RULES)})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="parse every page afresh")
+    args = parser.parse_args(argv)
+    rules = tuple(r.strip() for r in args.rules.split(",") if r.strip())
+    unknown = sorted(set(rules) - set(RULES))
+    if unknown:
+        parser.error(f"unknown rule(s): {', '.join(unknown)}")
+
+    result = check(args.srs_dir, rules, cache=not args.no_cache)
+    total, ok = result["files_total"], result["files_ok"]
+    pct = round(100.0 * ok / total, 1) if total else 0.0
+    print(f"Compliant SRS pages: {ok}/{total}  ({pct}%)")
+    verbose = os.environ.get("SRS_LINT_VERBOSE", "0") not in ("0", "false", "False", "")
+    if result["infos"] and (verbose or result["errors"]):
+        print("\n".join(result["infos"]))
+    if result["errors"]:
+        for err in result["errors"]:
+            print(err, file=sys.stderr)
+        print(f"{len(result['errors'])} SRS check failure(s)", file=sys.stderr)
+        return 1
+    print("SRS checks: OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
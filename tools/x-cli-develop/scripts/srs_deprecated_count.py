@@ -21,58 +21,31 @@ from pathlib import Path
 import argparse
 import re
 import json
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.lib.srs import SrsDoc, load_corpus  # noqa: E402
 
 SRS_DIR = Path("docs/srs")
 REQ_ID = re.compile(r"\b[A-Z]{3}-REQ-[A-Z-]+-\d{3}\b")
 
-def section(text: str, header: str) -> str:
-    m = re.search(rf"^## {re.escape(header)}\s*(.+?)(?=\n## |\Z)", text, re.S | re.M)
-    return (m.group(1) if m else "").strip()
-
-def is_deprecated(path: Path) -> bool:
-    try:
-        t = path.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        return False
-    attrs = section(t, "Attributes")
-    for ln in attrs.splitlines():
-        if ":" in ln:
-            k, v = ln.split(":", 1)
-            if k.strip().lower() == "status":
-                return v.strip().lower() == "deprecated"
-    return False
-
-def get_req_id(path: Path) -> str:
-    """Return requirement ID by scanning file text; fallback to filename stem."""
-    try:
-        t = path.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        t = ""
-    m = REQ_ID.search(t)
-    if m:
-        return m.group(0)
-    # Fallback: derive from filename like FGC-REQ-XYZ-123.md
-    stem = path.stem
-    return stem if REQ_ID.fullmatch(stem) else stem
+def get_req_id(doc: SrsDoc) -> str:
+    """Return requirement ID found in the page; fallback to filename stem."""
+    return doc.req_id or Path(doc.path).stem
 
-def get_title(path: Path) -> str:
+def get_title(doc: SrsDoc) -> str:
     """Return the human title from the first H1 heading. Fallback to filename stem."""
-    try:
-        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                if line.startswith('# '):
-                    h1 = line[2:].strip()
-                    # Expected: "FGC-REQ-XYZ-123 - Title text"
-                    if ' - ' in h1:
-                        return h1.split(' - ', 1)[1].strip()
-                    # If ID is present but no ' - ', remove ID prefix
-                    m = REQ_ID.search(h1)
-                    if m:
-                        return h1.replace(m.group(0), '').strip(' -\u2014:') or h1
-                    return h1
-    except Exception:
-        pass
-    return path.stem
+    h1 = doc.heading
+    if not h1:
+        return Path(doc.path).stem
+    # Expected: "FGC-REQ-XYZ-123 - Title text"
+    if ' - ' in h1:
+        return h1.split(' - ', 1)[1].strip()
+    # If ID is present but no ' - ', remove ID prefix
+    m = REQ_ID.search(h1)
+    if m:
+        return h1.replace(m.group(0), '').strip(' -\u2014:') or h1
+    return h1
 
 def main() -> int:
     ap = argparse.ArgumentParser()
@@ -95,8 +68,8 @@ def main() -> int:
     )
     args = ap.parse_args()
 
-    pages = sorted(SRS_DIR.glob("FGC-REQ-*.md"))
-    deprecated = [p for p in pages if is_deprecated(p)]
+    pages = load_corpus(SRS_DIR)
+    deprecated = [d for d in pages if d.deprecated]
     items = deprecated
 
     def canon_list(txt: str) -> list[str]:
@@ -125,9 +98,9 @@ def main() -> int:
 
     # Apply sorting
     sort_mode = (args.sort or "id").strip().lower()
-    def _safe_mtime(path: Path) -> float:
+    def _safe_mtime(doc: SrsDoc) -> float:
         try:
-            return path.stat().st_mtime
+            return Path(doc.path).stat().st_mtime
         except Exception:
             return 0.0
     if sort_mode in ("id",):
@@ -170,7 +143,7 @@ def main() -> int:
                 {
                     "id": get_req_id(p),
                     "title": get_title(p),
-                    "path": str(p),
+                    "path": p.path,
                     "mtime": _safe_mtime(p),
                 }
                 for p in items
@@ -199,7 +172,7 @@ def main() -> int:
                 print(get_req_id(p))
         else:
             for p in iter_limited(items):
-                print(str(p))
+                print(p.path)
         return 0
 
     print(f"Deprecated SRS pages detected: {len(deprecated)}")
@@ -0,0 +1,105 @@
+import json
+
+from codex_rules import bench
+
+
+def test_generate_workload_is_deterministic_and_plants_pairs():
+    first = bench.generate_workload(50, 8, 20, seed=7)
+    second = bench.generate_workload(50, 8, 20, seed=7)
+    assert first == second
+    assert first["planted_pairs"] == [
+        ("comp000", "tests/test_0000.py::test_case"),
+        ("comp001", "tests/test_0001.py::test_case"),
+    ]
+    assert len(first["prs"]) == 50
+    assert all(len(pr["results"]) == 20 for pr in first["prs"])
+
+    comp, test_id = first["planted_pairs"][0]
+    touched = failed_when_touched = 0
+    for pr in first["prs"]:
+        status = {r["test_id"]: r["status"] for r in pr["results"]}
+        if any(f["path"].startswith(f"src/{comp}/") for f in pr["files"]):
+            touched += 1
+            failed_when_touched += status[test_id] == "failed"
+    assert touched and failed_when_touched / touched > 0.5
+
+
+def test_run_benchmark_times_every_phase_and_finds_planted_pairs():
+    report = bench.run_benchmark([(60, 6, 12)], seed=1)
+
+    assert report["version"] == bench.REPORT_VERSION
+    by_backend = {r["backend"]: r for r in report["results"]}
+    assert set(by_backend) == set(bench.BACKENDS)
+    for entry in report["results"]:
+        assert entry["events"] == 60 * 12
+        for phase in bench.PHASES:
+            assert entry[f"{phase}_ms"] >= 0
+    assert by_backend["Storage"]["guidance_rules"] == 1
+    assert report["mapping"]["paths"] > 0 and report["mapping"]["compiled_ms"] >= 0
+    json.dumps(report)
+
+
+def test_compare_reports_flags_slowdowns_and_analysis_drift():
+    base = {
+        "results": [
+            {
+                "backend": "Storage",
+                "prs": 10,
+                "components": 2,
+                "tests": 3,
+                "record_pr_ms": 100.0,
+                "ingest_tests_ms": 100.0,
+                "analyze_ms": 1.0,
+                "prune_ms": 1.0,
+                "guidance_rules": 2,
+            }
+        ]
+    }
+    current = json.loads(json.dumps(base))
+    entry = current["results"][0]
+    entry["record_pr_ms"] = 110.0  # within tolerance
+    entry["ingest_tests_ms"] = 200.0
+    entry["analyze_ms"] = 4.0  # relative jump below the absolute floor
+    entry["guidance_rules"] = 1
+
+    regressions = bench.compare_reports(base, current)
+
+    assert len(regressions) == 2
+    assert "ingest_tests 100.0 ms -> 200.0 ms" in regressions[0]
+    assert "guidance_rules 2 -> 1" in regressions[1]
+
+
+def test_compare_reports_flags_mapping_slowdowns():
+    base = {"results": [], "mapping": {"paths": 10, "fnmatch_ms": 100.0, "compiled_ms": 10.0}}
+    current = {"results": [], "mapping": {"paths": 10, "fnmatch_ms": 100.0, "compiled_ms": 12.0}}
+    assert bench.compare_reports(base, current) == []
+
+    current["mapping"]["compiled_ms"] = 120.0
+    regressions = bench.compare_reports(base, current)
+    assert regressions == [
+        "mapping: compiled 10.0 ms -> 120.0 ms",
+        "mapping: compiled 120.0 ms is no faster than fnmatch 100.0 ms",
+    ]
+
+
+def test_main_writes_report_and_fails_on_regression(tmp_path, capsys):
+    out = tmp_path / "report.json"
+    assert bench.main(["--size", "20:3:5", "--backend", "Storage", "--out", str(out)]) == 0
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert [r["backend"] for r in report["results"]] == ["Storage"]
+
+    # A baseline no real run can match.
+    for entry in report["results"]:
+        entry["ingest_tests_ms"] = -1000.0
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report), encoding="utf-8")
+    code = bench.main(
+        [
+            "--size", "20:3:5",
+            "--backend", "Storage",
+            "--out", str(tmp_path / "new.json"),
+            "--baseline", str(baseline),
+        ]
+    )
+    assert code == 1
+    assert "regression: Storage prs=20" in capsys.readouterr().err
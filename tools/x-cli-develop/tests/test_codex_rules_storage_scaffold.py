@@ -1,7 +1,63 @@
-import pytest
+from datetime import datetime, UTC
 
+from codex_rules.storage import Storage
 
-@pytest.mark.skip(reason="Scaffold: add focused tests for codex_rules.storage prune_guidance paths")
-def test_prune_guidance_scaffold():
-    pass
 
+def _rule(rule_id: str, component: str, test_id: str) -> dict:
+    return {
+        "rule_id": rule_id,
+        "component": component,
+        "test_id": test_id,
+        "support_prs": 1,
+        "confidence": 1.0,
+        "baseline": 0.0,
+        "lift": 5.0,
+        "p_value": 0.01,
+        "template": "template",
+        "command": f"run {component}",
+    }
+
+
+def test_prune_guidance_reports_and_deactivates_in_one_pass(tmp_path):
+    store = Storage(str(tmp_path / "rules.sqlite"))
+    ts = datetime.now(UTC).isoformat()
+    touched = {1: "core", 2: "core", 3: "ui", 4: "ui", 5: "docs"}
+    for pr_id, component in touched.items():
+        store.record_pr(pr_id=pr_id, branch="", base="", labels=[], files=[{"path": f"src/{pr_id}", "component": component}])
+    events = [
+        # core -> suite#core fails only when core is touched: strong lift
+        (1, "failed", "core", "suite#core"),
+        (2, "failed", "core", "suite#core"),
+        (3, "passed", "ui", "suite#core"),
+        # ui -> suite#flaky fails everywhere: lift below 1.5
+        (1, "failed", "ui", "suite#flaky"),
+        (3, "failed", "ui", "suite#flaky"),
+        (5, "failed", "ui", "suite#flaky"),
+    ]
+    store.record_test_events(
+        {
+            "run_id": "r",
+            "pr_id": pr_id,
+            "commit_sha": "",
+            "test_id": test_id,
+            "suite": "suite",
+            "status": status,
+            "duration_ms": 0,
+            "component": component,
+            "file_hint": "",
+            "ts": ts,
+        }
+        for pr_id, status, component, test_id in events
+    )
+    store.upsert_guidance(_rule("keep", "core", "suite#core"))
+    store.upsert_guidance(_rule("low-lift", "ui", "suite#flaky"))
+    store.upsert_guidance(_rule("stale", "docs", "suite#gone"))
+
+    report = store.prune_guidance(window_days=30, last_n=None)
+
+    assert report["evaluated"] == 3
+    assert report["deactivated"] == 2
+    assert report["duration_ms"] >= 0
+    assert [r["rule_id"] for r in store.get_active_guidance()] == ["keep"]
+    assert store.prune_guidance(window_days=30, last_n=None)["evaluated"] == 1
+    store.conn.close()
@@ -0,0 +1,119 @@
+import json
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+from itertools import compress
+
+import pytest
+
+from codex_rules.bench import generate_workload
+from codex_rules.columnar import TIME_NULL, export_columnar, read_columnar
+from codex_rules.storage import InMemoryStorage, Storage
+
+NOW = datetime(2026, 3, 1, tzinfo=UTC)
+
+
+def _fill(store):
+    for pr in generate_workload(30, 4, 10, noise=0.1, seed=2)["prs"]:
+        files = [{"path": f["path"], "status": f["status"], "component": f["path"].split("/")[1]} for f in pr["files"]]
+        store.record_pr(pr_id=pr["pr_id"], branch="", base="", labels=[], files=files)
+        store.record_test_events(
+            {
+                "run_id": f"run-{pr['pr_id']}",
+                "pr_id": pr["pr_id"],
+                "commit_sha": "",
+                "test_id": r["test_id"],
+                "suite": r["suite"],
+                "status": r["status"],
+                "duration_ms": r["duration_ms"],
+                "component": r["file"].split("/")[1],
+                "file_hint": r["file"],
+                "ts": (NOW - timedelta(hours=pr["pr_id"])).isoformat(),
+            }
+            for r in pr["results"]
+        )
+    store.upsert_guidance(
+        {
+            "rule_id": "comp000->t",
+            "component": "comp000",
+            "test_id": "t",
+            "support_prs": 3,
+            "confidence": 0.5,
+            "baseline": 0.1,
+            "lift": None,
+            "p_value": 0.01,
+            "template": "tpl",
+            "command": "pytest",
+        }
+    )
+
+
+def test_columnar_export_round_trips_and_aggregates_on_codes(tmp_path):
+    store = Storage(str(tmp_path / "rules.sqlite"))
+    _fill(store)
+
+    manifest = export_columnar(store, tmp_path / "history")
+
+    assert manifest["tables"]["test_events"]["rows"] == store.export_stats()["events_total"] == 300
+    events = read_columnar(tmp_path / "history", "test_events")
+    rows = store.conn.execute("SELECT test_id, status, pr_id, ts FROM test_events ORDER BY id").fetchall()
+    assert events["test_id"].decode() == [r[0] for r in rows]
+    assert list(events["pr_id"]) == [r[2] for r in rows]
+    assert events["ts"][0] == int(datetime.fromisoformat(rows[0][3]).timestamp()) * 1_000_000
+
+    # Failures per test, computed on the integer codes only.
+    status = events["status"]
+    failed_code = status.values.index("failed")
+    is_failed = [code == failed_code for code in status.codes]
+    per_code = Counter(compress(events["test_id"].codes, is_failed))
+    per_test = {events["test_id"].values[code]: n for code, n in per_code.items()}
+    expected = dict(
+        store.conn.execute(
+            "SELECT test_id, COUNT(*) FROM test_events WHERE status = 'failed' GROUP BY test_id"
+        ).fetchall()
+    )
+    assert per_test == expected
+
+    guidance = read_columnar(tmp_path / "history", "guidance", ["rule_id", "lift", "last_seen"])
+    assert guidance["rule_id"].decode() == ["comp000->t"]
+    assert guidance["lift"][0] != guidance["lift"][0]  # NULL is NaN
+    assert guidance["last_seen"][0] != TIME_NULL
+    store.conn.close()
+
+
+def test_columnar_export_matches_between_backends(tmp_path):
+    sqlite_store = Storage(str(tmp_path / "rules.sqlite"))
+    memory_store = InMemoryStorage()
+    for store, name in ((sqlite_store, "sqlite"), (memory_store, "memory")):
+        _fill(store)
+        export_columnar(store, tmp_path / name, ["test_events", "pr_files"])
+    for table in ("test_events", "pr_files"):
+        exported = [read_columnar(tmp_path / name, table) for name in ("sqlite", "memory")]
+        decoded = [
+            {k: v.decode() if hasattr(v, "decode") else list(v) for k, v in cols.items()}
+            for cols in exported
+        ]
+        assert decoded[0] == decoded[1]
+    with pytest.raises(ValueError):
+        read_columnar(tmp_path / "memory", "guidance")
+    sqlite_store.conn.close()
+
+
+def test_cli_export_columnar(tmp_path, monkeypatch, capsys):
+    from codex_rules import cli
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".codex").mkdir()
+    (tmp_path / ".codex" / "rules.yml").write_text(
+        json.dumps({"storage": {"sqlite_path": "rules.sqlite"}}), encoding="utf-8"
+    )
+    store = Storage("rules.sqlite")
+    _fill(store)
+    store.conn.close()
+
+    cli.main(["export", "--format", "columnar", "--out", "history"])
+
+    assert "test_events 300" in capsys.readouterr().out
+    manifest = json.loads((tmp_path / "history" / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest["tables"]["pr_files"]["rows"] > 0
+    with pytest.raises(SystemExit):
+        cli.main(["export", "--out", "out.json"])
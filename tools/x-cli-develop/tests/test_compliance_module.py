@@ -1,4 +1,6 @@
 import json
+import random
+from pathlib import Path
 
 from codex_rules import compliance
 
@@ -42,3 +44,51 @@ def test_check_all_and_any_modes():
     compliant_any, missing_any = compliance.check(required, ["npm ci"], mode="any")
     assert compliant_any is False
     assert missing_any == required
+
+
+def test_command_index_matches_naive_prefix_scan():
+    rng = random.Random(5)
+    words = ["dotnet", "build", "test", "npm", "ci", "pytest", "-q", "run"]
+    executed = [" ".join(rng.choices(words, k=rng.randint(1, 4))) for _ in range(200)]
+    required = [" ".join(rng.choices(words, k=rng.randint(1, 3))) for _ in range(100)]
+    required += ["DotNet  Build", "npm", "zzz", "pytest -q run test ci npm"]
+
+    index = compliance.CommandIndex(executed)
+    for r in required:
+        norm = compliance._norm(r)
+        naive = any(compliance._norm(e).startswith(norm) for e in executed)
+        assert index.satisfies(norm) is naive
+    for mode in ("all", "any"):
+        assert compliance.check(required, index, mode=mode) == compliance.check(
+            required, executed, mode=mode
+        )
+
+
+def test_load_manifest_streams_ndjson(tmp_path, monkeypatch):
+    manifest = tmp_path / "session.ndjson"
+    with manifest.open("w", encoding="utf-8") as fh:
+        for i in range(5000):
+            fh.write(json.dumps({"cmd": f"pytest tests/test_{i % 50}.py"}) + "\n")
+
+    def no_read_text(*args, **kwargs):
+        raise AssertionError("NDJSON manifests must be streamed")
+
+    monkeypatch.setattr(Path, "read_text", no_read_text)
+    index = compliance.load_manifest_index(str(manifest))
+
+    assert len(index) == 50
+    assert compliance.check(["pytest tests/test_4"], index) == (True, [])
+    assert compliance.check(["pytest tests/test_99"], index) == (False, ["pytest tests/test_99"])
+
+
+def test_check_with_index_matches_linear_scan():
+    executed = [f"pytest tests/unit/test_{i}.py -q" for i in range(2000)]
+    required = [f"pytest tests/unit/test_{i}.py" for i in range(0, 4000, 10)]
+    required += ["pytest tests/unit/test_1", "pytest tests/unit/test_19.py -q -x"]
+
+    naive_missing = [r for r in required if not any(e.startswith(r) for e in executed)]
+    index = compliance.CommandIndex(executed)
+
+    assert compliance.check(required, index) == (False, naive_missing)
+    assert compliance.check(required, executed) == (False, naive_missing)
+    assert compliance.check(required, index, mode="any") == (True, naive_missing)
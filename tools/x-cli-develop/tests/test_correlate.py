@@ -1,4 +1,5 @@
 import math
+import random
 from typing import Dict, Iterable, List, Tuple
 
 import pytest
@@ -64,3 +65,39 @@ def test_fisher_exact_right_tail_matches_manual_values(table, expected):
     assert pytest.approx(calculated, rel=1e-9) == expected
     assert 0.0 <= calculated <= 1.0
 
+
+
+def test_compute_candidates_prefers_batched_tables():
+    class BatchedStorage(FakeStorage):
+        def distinct_pairs(self, window_days: int) -> Iterable[Tuple[str, str]]:
+            raise AssertionError("per-pair path should not be used")
+
+        def contingency_tables(self, window_days: int) -> Dict[Tuple[str, str], Tuple[int, int, int, int]]:
+            self.window_days_calls.append(window_days)
+            return dict(self._tables)
+
+    storage = BatchedStorage({("compA", "testA"): (4, 1, 2, 30)})
+
+    results = correlate.compute_candidates(storage, {"window_days": 7, "min_occurrences": 2, "alpha": 0.05})
+
+    assert storage.window_days_calls == [7]
+    assert [(r["component"], r["test_id"]) for r in results] == [("compA", "testA")]
+
+
+def test_fisher_exact_right_tail_matches_exact_reference_and_caches():
+    rng = random.Random(1234)
+    tables = [
+        (rng.randint(0, 40), rng.randint(0, 400), rng.randint(0, 200), rng.randint(0, 4000))
+        for _ in range(200)
+    ]
+
+    exact = [correlate._exact_right_tail(*t) for t in tables]
+    correlate._right_tail.cache_clear()
+    fast = [correlate.fisher_exact_right_tail(*t) for t in tables]
+
+    for expected, calculated in zip(exact, fast):
+        assert calculated == pytest.approx(expected, rel=1e-9, abs=1e-12)
+    # Repeated marginals are served from the cache.
+    assert correlate._right_tail.cache_info().currsize <= len(tables)
+    correlate.fisher_exact_right_tail(*tables[0])
+    assert correlate._right_tail.cache_info().hits >= 1
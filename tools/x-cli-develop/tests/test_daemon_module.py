@@ -0,0 +1,184 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import pytest
+
+from codex_rules import client, daemon
+from codex_rules.config import load_config
+from codex_rules.storage import Storage
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(__import__("socket"), "AF_UNIX"), reason="requires Unix sockets"
+)
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".codex").mkdir()
+    (tmp_path / ".codex" / "components.yml").write_text(
+        json.dumps({"components": {"core": {"globs": ["src/**"]}}}), encoding="utf-8"
+    )
+    config = load_config()
+    config["storage"] = {"sqlite_path": str(tmp_path / "rules.sqlite")}
+    # AF_UNIX paths are limited to ~100 bytes, so keep the socket out of tmp_path.
+    sock_dir = tempfile.mkdtemp(prefix="cxr-")
+    path = os.path.join(sock_dir, "d.sock")
+    thread = threading.Thread(target=daemon.serve, args=(path, config), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            client.request({"op": "ping"}, path)
+            break
+        except client.DaemonUnavailable:
+            assert time.monotonic() < deadline, "daemon did not start"
+            time.sleep(0.01)
+    yield path, tmp_path
+    try:
+        client.request({"op": "shutdown"}, path)
+    except client.DaemonUnavailable:
+        pass
+    thread.join(timeout=5)
+    shutil.rmtree(sock_dir, ignore_errors=True)
+
+
+def _fail_in_process(argv):
+    raise AssertionError(f"expected the daemon to serve {argv}")
+
+
+def test_daemon_serves_record_pr_and_emit_warnings(running_daemon, monkeypatch, capsys):
+    path, root = running_daemon
+    monkeypatch.setattr(client, "_run_in_process", _fail_in_process)
+    files = root / "files.json"
+    files.write_text(json.dumps([{"path": "src/a.py", "status": "added"}]), encoding="utf-8")
+
+    assert client.run(["record-pr", "--pr", "5", "--files-json", str(files)], path) == 0
+    assert Storage(str(root / "rules.sqlite")).get_components_for_pr(5) == ["core"]
+
+    code = client.run(["emit-warnings", "--pr", "5", "--stdout"], path)
+    assert code == 0
+    capsys.readouterr()
+
+
+def test_daemon_declines_unserved_commands(running_daemon, monkeypatch):
+    path, _ = running_daemon
+    calls = []
+    monkeypatch.setattr(client, "_run_in_process", lambda argv: calls.append(argv) or 0)
+
+    assert client.run(["analyze"], path) == 0
+    assert calls == [["analyze"]]
+
+
+def test_daemon_declines_requests_from_another_directory(running_daemon):
+    path, root = running_daemon
+    response = client.request(
+        {"argv": ["emit-warnings", "--pr", "1"], "cwd": str(root / "elsewhere")}, path
+    )
+    assert "error" in response
+
+
+def test_client_runs_in_process_without_daemon(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(client, "_run_in_process", lambda argv: calls.append(argv) or 3)
+
+    assert client.run(["emit-warnings", "--pr", "1"], str(tmp_path / "none.sock")) == 3
+    assert calls == [["emit-warnings", "--pr", "1"]]
+
+
+def test_shutdown_stops_daemon_and_removes_socket(running_daemon):
+    path, _ = running_daemon
+    assert client.request({"op": "shutdown"}, path) == {"ok": True}
+    deadline = time.monotonic() + 5
+    while os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(path)
+
+
+def test_socket_is_created_owner_only():
+    sock_dir = tempfile.mkdtemp(prefix="cxr-")
+    path = os.path.join(sock_dir, "d.sock")
+    previous = os.umask(0o022)
+    try:
+        server = daemon.RulesServer(path, rules=None)
+        try:
+            assert os.stat(path).st_mode & 0o777 == 0o600
+            assert os.umask(0o022) == 0o022  # the process umask is restored
+        finally:
+            server.server_close()
+    finally:
+        os.umask(previous)
+        shutil.rmtree(sock_dir, ignore_errors=True)
+
+
+def test_memory_daemon_reloads_snapshot_written_outside(tmp_path, monkeypatch):
+    from codex_rules import cli
+    from codex_rules.storage import InMemoryStorage
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".codex").mkdir()
+    (tmp_path / ".codex" / "components.yml").write_text(
+        json.dumps({"components": {"core": {"globs": ["src/core/**"]}, "ui": {"globs": ["src/ui/**"]}}}),
+        encoding="utf-8",
+    )
+    (tmp_path / ".codex" / "rules.yml").write_text(
+        json.dumps({"storage": {"sqlite_path": "rules.sqlite", "backend": "memory"}}),
+        encoding="utf-8",
+    )
+    snapshot = tmp_path / cli.DEFAULT_SNAPSHOT_PATH
+    # History where suite#t fails whenever core is touched.
+    seeded = InMemoryStorage()
+    for pr_id in range(1, 31):
+        component = "core" if pr_id <= 10 else "ui"
+        seeded.record_pr(
+            pr_id=pr_id, branch="", base="", labels=[],
+            files=[{"path": f"src/{component}/x.py", "status": "modified", "component": component}],
+        )
+        seeded.record_test_event(
+            run_id="r", pr_id=pr_id, commit_sha="", test_id="suite#t", suite="suite",
+            status="failed" if component == "core" else "passed", duration_ms=1,
+            component=component, file_hint="", ts=time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime()),
+        )
+    seeded.snapshot(snapshot)
+
+    sock_dir = tempfile.mkdtemp(prefix="cxr-")
+    path = os.path.join(sock_dir, "d.sock")
+    thread = threading.Thread(target=daemon.serve, args=(path, load_config()), daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                client.request({"op": "ping"}, path)
+                break
+            except client.DaemonUnavailable:
+                assert time.monotonic() < deadline, "daemon did not start"
+                time.sleep(0.01)
+        monkeypatch.setattr(client, "_run_in_process", _fail_in_process)
+        files = tmp_path / "files.json"
+        files.write_text(json.dumps([{"path": "src/core/y.py", "status": "added"}]), encoding="utf-8")
+
+        # analyze runs outside the daemon and writes guidance to the snapshot.
+        cli.main(["analyze"])
+        assert InMemoryStorage.restore(snapshot).get_active_guidance()
+
+        assert client.run(["record-pr", "--pr", "31", "--files-json", str(files)], path) == 0
+        restored = InMemoryStorage.restore(snapshot)
+        assert restored.get_active_guidance(), "daemon overwrote guidance written outside"
+        assert restored.get_components_for_pr(31) == ["core"]
+
+        response = client.request(
+            {"argv": ["emit-warnings", "--pr", "31", "--stdout"], "cwd": str(tmp_path)}, path
+        )
+        assert "suite#t" in response["stdout"]
+    finally:
+        try:
+            client.request({"op": "shutdown"}, path)
+        except client.DaemonUnavailable:
+            pass
+        thread.join(timeout=5)
+        shutil.rmtree(sock_dir, ignore_errors=True)
@@ -0,0 +1,131 @@
+import json
+import random
+import statistics
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from codex_rules.durations import P2Quantile, analyze_durations
+from codex_rules.storage import InMemoryStorage, Storage
+
+NOW = datetime.now(UTC)
+
+
+def _event(pr_id: int, test_id: str, component: str, duration_ms, days_ago: float) -> dict:
+    return {
+        "run_id": f"run-{pr_id}",
+        "pr_id": pr_id,
+        "commit_sha": "",
+        "test_id": test_id,
+        "suite": "suite",
+        "status": "passed",
+        "duration_ms": duration_ms,
+        "component": component,
+        "file_hint": f"src/{component}/x.py",
+        "ts": (NOW - timedelta(days=days_ago)).isoformat(),
+    }
+
+
+def _fill(store) -> None:
+    # One run per test and PR, one PR per day, so daily rollups keep every sample.
+    rng = random.Random(5)
+    events = []
+    for pr_id in range(1, 21):
+        days_ago = 21 - pr_id
+        events.append(_event(pr_id, "core::slow", "core", 900 + rng.randint(0, 100), days_ago))
+        events.append(_event(pr_id, "core::fast", "core", 10 + rng.randint(0, 5), days_ago))
+        events.append(_event(pr_id, "ui::render", "ui", 200 + rng.randint(0, 20), days_ago))
+    events.append(_event(21, "ui::render", "ui", 700, 0.5))  # the regression
+    events.append(_event(21, "core::fast", "core", 40, 0.5))  # slower, but under min_delta_ms
+    events.append(_event(22, "core::slow", "core", None, 0.4))  # no duration recorded
+    store.record_test_events(events)
+
+
+def test_p2_quantile_tracks_exact_percentiles():
+    rng = random.Random(1)
+    xs = [rng.lognormvariate(4, 0.6) for _ in range(20000)]
+    exact = statistics.quantiles(xs, n=100)
+    for p in (0.5, 0.95):
+        sketch = P2Quantile(p)
+        for x in xs:
+            sketch.add(x)
+        assert sketch.value() == pytest.approx(exact[int(p * 100) - 1], rel=0.02)
+    small = P2Quantile(0.5)
+    for x in (3, 1, 2):
+        small.add(x)
+    assert small.value() == 2
+    assert P2Quantile(0.95).value() is None
+
+
+def test_durations_rank_slow_tests_and_flag_regressions(tmp_path):
+    results = []
+    for store in (Storage(str(tmp_path / "rules.sqlite")), InMemoryStorage()):
+        _fill(store)
+        results.append(analyze_durations(store.duration_samples(30), top=1))
+    sqlite_report, memory_report = results
+    assert sqlite_report == memory_report
+
+    assert sqlite_report["samples"] == 62
+    assert [t["test_id"] for t in sqlite_report["slowest"]["core"]] == ["core::slow"]
+    render = sqlite_report["tests"]["ui::render"]
+    assert render["count"] == 21 and render["max_ms"] == 700
+    assert 200 <= render["p50_ms"] <= 220
+    assert [(r["pr_id"], r["test_id"]) for r in sqlite_report["regressions"]] == [
+        (21, "ui::render")
+    ]
+    assert sqlite_report["regressions"][0]["ratio"] > 3
+
+
+def test_durations_survive_compaction(tmp_path):
+    store = Storage(str(tmp_path / "rules.sqlite"))
+    _fill(store)
+    before = analyze_durations(store.duration_samples(30))
+
+    assert store.compact(7, 30)["compacted"] > 0
+
+    assert analyze_durations(store.duration_samples(30)) == before
+    store.conn.close()
+
+
+def test_compacted_days_keep_run_counts_totals_and_maxima(tmp_path):
+    durations = [100, 100, 100, 100, 100, 100, 100, 100, 100, 250]
+    events = [_event(1, "core::t", "core", ms, 10 + i / 100) for i, ms in enumerate(durations)]
+    store = Storage(str(tmp_path / "rules.sqlite"))
+    memory = InMemoryStorage()
+    for s in (store, memory):
+        s.record_test_events(events)
+    before = analyze_durations(store.duration_samples(30), min_samples=1)["tests"]["core::t"]
+    assert (before["count"], before["total_ms"], before["max_ms"]) == (10, 1150, 250)
+
+    assert store.compact(7, 30)["rollup_rows"] == 1
+    for s in (store, memory):
+        s.compact(7, 30)
+        report = analyze_durations(s.duration_samples(30), min_samples=1)
+        after = report["tests"]["core::t"]
+        assert report["samples"] == 10
+        assert (after["count"], after["total_ms"], after["max_ms"]) == (10, 1150, 250)
+    store.conn.close()
+
+
+def test_cli_durations_reports_and_writes_json(tmp_path, monkeypatch, capsys):
+    from codex_rules import cli
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".codex").mkdir()
+    (tmp_path / ".codex" / "rules.yml").write_text(
+        json.dumps({"storage": {"sqlite_path": "rules.sqlite"}}), encoding="utf-8"
+    )
+    store = Storage("rules.sqlite")
+    _fill(store)
+    store.conn.close()
+
+    cli.main(["durations", "--pr", "21", "--rank-by", "total", "--out", "durations.json"])
+
+    out = capsys.readouterr().out
+    assert "PR 21: ui::render took 700.0 ms" in out
+    report = json.loads((tmp_path / "durations.json").read_text(encoding="utf-8"))
+    assert report["window_days"] == 30
+    assert report["slowest"]["core"][0]["test_id"] == "core::slow"
+
+    cli.main(["durations", "--pr", "20"])
+    assert "No duration regressions." in capsys.readouterr().out
@@ -0,0 +1,95 @@
+"""Cold-start import budget for the codex_rules hook subcommands.
+
+Hooks run ``python -m codex_rules`` on every invocation, so the modules a
+subcommand imports are paid for each time.  These tests run the hook
+subcommands under ``python -X importtime`` and check the modules that must
+stay lazy.  The total import time depends on the machine, so it is only
+checked against a budget when ``CODEX_IMPORT_BUDGET_MS`` is set, e.g. on a
+dedicated benchmark runner.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+# Opt-in budget for the total import time of the package and everything it
+# pulls in, in ms.
+COLD_START_BUDGET_MS = float(os.environ.get("CODEX_IMPORT_BUDGET_MS") or 0) or None
+# Modules the hook subcommands must not import.
+LAZY_MODULES = (
+    "concurrent.futures.process",
+    "xml.etree.ElementTree",
+    "codex_rules.correlate",
+    "codex_rules.guidance",
+    "codex_rules.ingest.junit",
+    "codex_rules.memory",
+    "codex_rules.telemetry",
+)
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _importtime(argv: List[str], cwd: Path) -> Tuple[int, Dict[str, int]]:
+    """Run ``python -m codex_rules`` with *argv* under ``-X importtime``.
+
+    Returns the exit code and the cumulative import time in µs of every
+    module, plus ``"__total__"``: the sum over the top-level imports made
+    after interpreter start-up (``site``) completed.
+    """
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "codex_rules", *argv],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    modules: Dict[str, int] = {"__total__": 0}
+    after_startup = False
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match[2]), match[3], match[4]
+        modules[name] = cumulative
+        if len(indent) == 1:
+            if after_startup:
+                modules["__total__"] += cumulative
+            elif name == "site":
+                after_startup = True
+    return proc.returncode, modules
+
+
+@pytest.fixture
+def hook_repo(tmp_path):
+    (tmp_path / ".codex").mkdir()
+    (tmp_path / "files.json").write_text(
+        json.dumps([{"path": "src/a.py", "status": "modified"}]), encoding="utf-8"
+    )
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--help"],
+        ["record-pr", "--pr", "1", "--files-json", "files.json"],
+        ["emit-warnings", "--pr", "1", "--stdout"],
+        ["check-compliance", "--pr", "1"],
+    ],
+    ids=lambda argv: argv[0],
+)
+def test_hook_subcommands_stay_within_import_budget(hook_repo, argv):
+    code, modules = _importtime(argv, hook_repo)
+    assert code == 0
+    eager = [name for name in LAZY_MODULES if name in modules]
+    assert not eager, f"{argv[0]} imported {eager}"
+    if COLD_START_BUDGET_MS is not None:
+        total_ms = modules["__total__"] / 1000.0
+        assert total_ms < COLD_START_BUDGET_MS, f"{argv[0]} imports took {total_ms:.1f} ms"
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from codex_rules.ingest.junit import parse_junit
+from codex_rules.ingest.junit import iter_junit, parse_junit
 
 
 def _write(tmp_path, text: str) -> Path:
@@ -38,3 +38,90 @@ def test_parse_junit_handles_failures_and_duration(tmp_path):
             "file": "beta.py",
         },
     ]
+
+
+def test_iter_junit_streams_nested_suites(tmp_path):
+    xml = """
+    <testsuites>
+      <testsuite name="outer">
+        <properties><property name="k" value="v" /></properties>
+        <testsuite name="inner">
+          <testcase classname="suite.Gamma" name="test_err" time="1.5"><error /></testcase>
+        </testsuite>
+        <testcase classname="suite.Alpha" name="test_ok" time="0.2" file="alpha.py" />
+      </testsuite>
+    </testsuites>
+    """
+    report = _write(tmp_path, xml)
+
+    events = iter_junit(str(report))
+
+    assert iter(events) is events
+    records = list(events)
+    assert records == parse_junit(str(report))
+    assert [(r["test_id"], r["status"], r["duration_ms"]) for r in records] == [
+        ("suite.Gamma#test_err", "failed", 1500),
+        ("suite.Alpha#test_ok", "passed", 200),
+    ]
+
+
+def test_ingest_tests_streams_events_in_chunks(tmp_path, monkeypatch):
+    import argparse
+
+    from codex_rules import cli
+    from codex_rules.mapping import ComponentMapping
+
+    cases = "".join(
+        f'<testcase classname="suite.Alpha" name="test_{i}" file="alpha.py" />' for i in range(5)
+    )
+    report = _write(tmp_path, f"<testsuite>{cases}</testsuite>")
+
+    class RecordingStorage:
+        def __init__(self):
+            self.batches = []
+
+        def record_test_events(self, events):
+            self.batches.append(list(events))
+
+    monkeypatch.setattr(cli, "INGEST_CHUNK_SIZE", 2)
+    storage = RecordingStorage()
+    args = argparse.Namespace(pr_id=7, format="junit", path=str(report), commit="abc", run_id="r1")
+
+    cli.ingest_tests(args, storage, ComponentMapping(tmp_path / "missing.yml"))
+
+    assert [len(batch) for batch in storage.batches] == [2, 2, 1]
+    first = storage.batches[0][0]
+    assert first["pr_id"] == 7 and first["run_id"] == "r1" and first["component"] == "unknown"
+
+
+def test_ingest_tests_parses_files_in_parallel_with_single_writer(tmp_path):
+    import argparse
+
+    from codex_rules import cli
+    from codex_rules.mapping import ComponentMapping
+
+    for shard in range(3):
+        cases = "".join(
+            f'<testcase classname="shard{shard}" name="test_{i}"><failure /></testcase>' for i in range(4)
+        )
+        (tmp_path / f"shard{shard}.xml").write_text(f"<testsuite>{cases}</testsuite>", encoding="utf-8")
+
+    class RecordingStorage:
+        def __init__(self):
+            self.events = []
+
+        def record_test_events(self, events):
+            self.events.extend(events)
+
+    def ingest(jobs):
+        storage = RecordingStorage()
+        args = argparse.Namespace(
+            pr_id=1, format="junit", path=str(tmp_path / "shard*.xml"), commit="", run_id="r", jobs=jobs
+        )
+        cli.ingest_tests(args, storage, ComponentMapping(tmp_path / "missing.yml"))
+        return sorted((e["test_id"], e["status"]) for e in storage.events)
+
+    parallel = ingest(jobs=3)
+
+    assert len(parallel) == 12
+    assert parallel == ingest(jobs=1)
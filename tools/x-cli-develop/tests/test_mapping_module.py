@@ -54,3 +54,36 @@ def test_component_mapping_json_fallback(tmp_path, monkeypatch):
 
     assert mapping.component_for_path("src/core/main.c") == "core"
     assert mapping.default_command_for("core") is None
+
+
+def _fnmatch_reference(components, path):
+    import fnmatch
+
+    norm = path.replace("\\", "/")
+    for comp, spec in components.items():
+        for pat in spec.get("globs", []):
+            if fnmatch.fnmatch(norm, pat):
+                return comp
+    return "unknown"
+
+
+def test_component_mapping_compiled_matcher_matches_fnmatch(tmp_path, monkeypatch):
+    monkeypatch.delitem(sys.modules, "yaml", raising=False)
+    components = {
+        f"comp{i}": {"globs": [f"src/comp{i}/**", f"lib/comp{i}/*.py", f"tests/*comp{i}_*.py"]}
+        for i in range(60)
+    }
+    # Overlapping globs: the first declared component must keep winning.
+    components["vendor"] = {"globs": ["src/*/vendor/**", "third_party/**"]}
+    mapping_path = tmp_path / "components.yml"
+    mapping_path.write_text(json.dumps({"components": components}), encoding="utf-8")
+    mapping = ComponentMapping(mapping_path)
+    paths = [f"src/comp{i % 70}/vendor/file{i}.c" for i in range(1500)]
+    paths += [f"lib\\comp{i % 60}\\mod{i}.py" for i in range(500)]
+    paths += [f"tests/test_comp{i % 60}_x.py" for i in range(500)] + ["third_party/a/b.h", "README.md"]
+
+    expected = [_fnmatch_reference(components, p) for p in paths]
+    actual = [mapping.component_for_path(p) for p in paths]
+
+    assert actual == expected
+    assert actual[0] == "comp0" and actual[65] == "vendor" and actual[-1] == "unknown"
@@ -1,7 +1,9 @@
 """Tests for codex_rules.memory path resolution."""
 
+import importlib
 from pathlib import Path
 import unittest
+from unittest.mock import patch
 
 from codex_rules import memory
 
@@ -14,6 +16,17 @@ class MemoryPathTests(unittest.TestCase):
             memory.MEMORY_PATH, repo_root / ".codex" / "memory.json"
         )
 
+    def test_repo_root_is_detected_lazily_once(self) -> None:
+        importlib.reload(memory)
+        self.addCleanup(importlib.reload, memory)
+        with patch.object(
+            memory, "_detect_repo_root", return_value=Path("/repo")
+        ) as detect:
+            self.assertNotIn("REPO_ROOT", vars(memory))
+            self.assertEqual(memory.MEMORY_PATH, Path("/repo/.codex/memory.json"))
+            self.assertEqual(memory.REPO_ROOT, Path("/repo"))
+        detect.assert_called_once_with()
+
 
 if __name__ == "__main__":
     unittest.main()
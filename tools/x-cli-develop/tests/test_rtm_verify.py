@@ -0,0 +1,59 @@
+import fnmatch
+import glob
+import importlib.util
+import subprocess
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "rtm_verify.py"
+spec = importlib.util.spec_from_file_location("rtm_verify", SCRIPT)
+rv = importlib.util.module_from_spec(spec)
+assert spec.loader
+spec.loader.exec_module(rv)
+
+
+def test_glob_expansion_matches_glob_glob(tmp_path, monkeypatch):
+    for rel in [
+        "src/App/Program.cs",
+        "src/App/Cli/Run.cs",
+        "src/App/.hidden.cs",
+        "src/.cache/x.cs",
+        "tests/AppTests.cs",
+        "tests/sub/deep/CliTests.cs",
+    ]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("", encoding="utf-8")
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "add", "src"], cwd=tmp_path, check=True)
+    files = rv.PathIndex(*rv.repo_paths(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    for pattern in [
+        "src/App/*",
+        "src/**",
+        "src/**/*.cs",
+        "**/*Tests.cs",
+        "tests/*/",
+        "tests/[a-z]*/**/C?iTests.cs",
+        "./src/App/Program.cs",
+        "src/App/Missing.cs",
+    ]:
+        expected = sorted(p.rstrip("/").removeprefix("./") for p in glob.glob(pattern, recursive=True))
+        assert files.expand(pattern) == expected, pattern
+
+
+def test_change_index_matches_fnmatch_and_suffix_rule():
+    reqs = [
+        {"code": ["src/App/Cli/*", "src/App/Program.cs"]},
+        {"code": ["./App/Program.cs"]},
+        {"code": ["src/Other/*"]},
+        {},
+    ]
+    index = rv.ChangeIndex(reqs)
+    for path in ["src/App/Program.cs", "src/App/Cli/sub/Run.cs", "src/Other/x.cs", "src/None.cs"]:
+        expected = {
+            n
+            for n, ent in enumerate(reqs)
+            for g in ent.get("code") or []
+            if fnmatch.fnmatch(path, g) or path.endswith(g.lstrip("./"))
+        }
+        assert index.match(path) == expected, path
+    assert index.match("src/App/Program.cs") == {0, 1}
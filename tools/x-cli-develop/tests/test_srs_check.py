@@ -0,0 +1,107 @@
+"""Tests for the shared SRS page model, its parse cache and ``srs_check.py``."""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import scripts.lib.srs as srs
+from scripts.lib.srs_rules import acceptance_errors, is_compliant, lint_29148
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = REPO_ROOT / "scripts" / "srs_check.py"
+
+PAGE = """# FGC-REQ-DEV-901 - Sample requirement
+Version: 1.0
+
+## Statement(s)
+- RQ1. The CLI shall print its version.
+
+## Rationale
+Users need to report the version they run.
+
+## Verification
+Method(s): Test | Inspection
+Acceptance Criteria:
+- AC1. `x-cli --version` prints the version.
+
+## Attributes
+Priority: High
+Owner: DevOps
+Status: Proposed
+Trace: `src/XCli/Program.cs`
+"""
+
+
+def test_parse_builds_the_page_model():
+    doc = srs.parse("FGC-REQ-DEV-901.md", PAGE)
+    assert (doc.req_id, doc.domain, doc.number) == ("FGC-REQ-DEV-901", "DEV", 901)
+    assert doc.heading == "FGC-REQ-DEV-901 - Sample requirement"
+    assert doc.meta == {"Version": "1.0", "Priority": "High", "Owner": "DevOps", "Status": "Proposed"}
+    assert doc.methods == ["Test", "Inspection"]
+    assert doc.statements == ["- RQ1. The CLI shall print its version."]
+    assert doc.acceptance == ["- AC1. `x-cli --version` prints the version."]
+    assert doc.status == "Proposed" and not doc.deprecated
+    assert is_compliant(doc)
+    assert lint_29148(doc, {}) == ([], [])
+
+    bad = srs.parse("p.md", PAGE.replace("shall print", "will print").replace("Acceptance", "Accept"))
+    assert bad.prohibited == [(5, "will")]
+    assert acceptance_errors(bad) == ["missing Acceptance Criteria section"]
+    assert not is_compliant(bad)
+
+
+def test_cache_reuses_unchanged_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(srs, "CACHE_PATH", tmp_path / "cache" / "srs_docs.json")
+    monkeypatch.delenv("SRS_DOC_CACHE", raising=False)
+    same = tmp_path / "FGC-REQ-DEV-901.md"
+    edited = tmp_path / "FGC-REQ-DEV-902.md"
+    same.write_text(PAGE, encoding="utf-8")
+    edited.write_text(PAGE.replace("901", "902"), encoding="utf-8")
+    srs.load_corpus(tmp_path)
+
+    # Poison the cached models: only re-parsed pages lose the marker.
+    data = json.loads(srs.CACHE_PATH.read_text(encoding="utf-8"))
+    for entry in data["files"].values():
+        entry["value"]["heading"] = "cached"
+    srs.CACHE_PATH.write_text(json.dumps(data), encoding="utf-8")
+    edited.write_text(PAGE.replace("901", "902") + "\n", encoding="utf-8")
+
+    docs = srs.load_corpus(tmp_path)
+    assert [d.heading for d in docs] == ["cached", "FGC-REQ-DEV-902 - Sample requirement"]
+    assert [d.path for d in srs.load_corpus(tmp_path, cache=False)] == [str(same), str(edited)]
+    assert srs.load_corpus(tmp_path, cache=False)[0].heading != "cached"
+
+
+def test_srs_check_applies_every_rule_in_one_run(tmp_path):
+    srs_dir = tmp_path / "srs"
+    srs_dir.mkdir()
+    (srs_dir / "FGC-REQ-DEV-901.md").write_text(PAGE, encoding="utf-8")
+    (srs_dir / "FGC-REQ-DEV-902.md").write_text(
+        PAGE.replace("901", "902").replace("- AC1.", "- AC 1:").replace("High", "should be high"),
+        encoding="utf-8",
+    )
+    (srs_dir / "FGC-REQ-DEV-903.md").write_text(PAGE, encoding="utf-8")  # duplicate ID 901
+    env = dict(os.environ, SRS_DOC_CACHE="0")
+    proc = subprocess.run(
+        [sys.executable, str(SCRIPT), "--srs-dir", str(srs_dir)],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert proc.returncode == 1
+    assert "Compliant SRS pages: 2/3" in proc.stdout
+    rules = {line.split("]")[0] + "]" for line in proc.stderr.splitlines() if line.startswith("[")}
+    assert rules == {"[terms]", "[acceptance]", "[lint]", "[consistency]"}
+    assert "[consistency] Duplicate IDs: FGC-REQ-DEV-901" in proc.stderr
+
+    terms_only = subprocess.run(
+        [sys.executable, str(SCRIPT), "--srs-dir", str(srs_dir), "--rules", "terms"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert terms_only.returncode == 1
+    assert "[terms]" in terms_only.stderr and "[lint]" not in terms_only.stderr
@@ -0,0 +1,82 @@
+"""Tests for the parallel, cached 29148 corpus linter."""
+from __future__ import annotations
+
+import json
+
+import scripts.lib.srs as srs
+import scripts.lib.srs_lint as srs_lint
+from scripts.lib.srs import parse
+from scripts.lib.srs_rules import is_compliant, lint_29148
+from tests.test_srs_check import PAGE
+
+
+def _write_pages(srs_dir, count):
+    for n in range(901, 901 + count):
+        page = PAGE.replace("901", str(n))
+        if n % 2:
+            page = page.replace("High", "Urgent").replace("- AC1.", "- AC 1:")
+        (srs_dir / f"FGC-REQ-DEV-{n}.md").write_text(page, encoding="utf-8")
+
+
+def test_lint_corpus_matches_the_rules_serial_and_parallel(tmp_path, monkeypatch):
+    monkeypatch.setenv("SRS_DOC_CACHE", "0")
+    monkeypatch.setattr(srs_lint, "PARALLEL_MIN_FILES", 2)
+    _write_pages(tmp_path, 4)
+    schema = {"priority": {"enum": ["High", "Medium", "Low"]}}
+
+    serial = srs_lint.lint_corpus(tmp_path, schema, jobs=1)
+    expected = []
+    for path in sorted(tmp_path.glob("FGC-REQ-*.md")):
+        doc = parse(path, path.read_text(encoding="utf-8"))
+        errors, infos = lint_29148(doc, schema)
+        expected.append((str(path), errors, infos, is_compliant(doc)))
+    assert [tuple(r) for r in serial] == expected
+    assert [r.compliant for r in serial] == [False, True, False, True]
+    assert srs_lint.lint_corpus(tmp_path, schema, jobs=2) == serial
+
+
+def test_lint_corpus_reuses_results_of_unchanged_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(srs_lint, "CACHE_PATH", tmp_path / "cache" / "srs_lint.json")
+    monkeypatch.setattr(srs, "CACHE_PATH", tmp_path / "cache" / "srs_docs.json")
+    monkeypatch.delenv("SRS_DOC_CACHE", raising=False)
+    srs_dir = tmp_path / "srs"
+    srs_dir.mkdir()
+    _write_pages(srs_dir, 2)
+    srs_lint.lint_corpus(srs_dir, {}, jobs=1)
+
+    # Poison the cached results: only re-linted pages lose the marker.
+    data = json.loads(srs_lint.CACHE_PATH.read_text(encoding="utf-8"))
+    for entry in data["files"].values():
+        entry["value"]["infos"] = ["cached"]
+    srs_lint.CACHE_PATH.write_text(json.dumps(data), encoding="utf-8")
+    edited = srs_dir / "FGC-REQ-DEV-902.md"
+    edited.write_text(edited.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+
+    results = srs_lint.lint_corpus(srs_dir, {}, jobs=1)
+    assert [r.infos for r in results] == [["cached"], []]
+    # A different schema invalidates every cached result.
+    assert [r.infos for r in srs_lint.lint_corpus(srs_dir, {"owner": {}}, jobs=1)] == [[], []]
+    # Pages parsed for linting are shared with the other checkers.
+    assert len(json.loads(srs.CACHE_PATH.read_text(encoding="utf-8"))["files"]) == 2
+
+
+def test_lint_corpus_relints_when_the_rules_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(srs_lint, "CACHE_PATH", tmp_path / "cache" / "srs_lint.json")
+    monkeypatch.setattr(srs, "CACHE_PATH", tmp_path / "cache" / "srs_docs.json")
+    monkeypatch.delenv("SRS_DOC_CACHE", raising=False)
+    rules = tmp_path / "rules.py"
+    rules.write_text("# v1\n", encoding="utf-8")
+    monkeypatch.setattr(srs_lint, "RULE_SOURCES", (rules,))
+    srs_dir = tmp_path / "srs"
+    srs_dir.mkdir()
+    _write_pages(srs_dir, 1)
+    srs_lint.lint_corpus(srs_dir, {}, jobs=1)
+
+    data = json.loads(srs_lint.CACHE_PATH.read_text(encoding="utf-8"))
+    for entry in data["files"].values():
+        entry["value"]["infos"] = ["cached"]
+    srs_lint.CACHE_PATH.write_text(json.dumps(data), encoding="utf-8")
+    assert srs_lint.lint_corpus(srs_dir, {}, jobs=1)[0].infos == ["cached"]
+
+    rules.write_text("# v2\n", encoding="utf-8")
+    assert srs_lint.lint_corpus(srs_dir, {}, jobs=1)[0].infos == []
@@ -48,3 +48,72 @@ def test_migrates_commit_column_and_inserts(temp_dir: Path) -> None:
     assert cur.fetchone()[0] == "abc"
     storage.conn.close()
 
+
+
+def test_migrates_text_events_to_interned_schema(temp_dir: Path) -> None:
+    db_path = temp_dir / "legacy.sqlite"
+    conn = sqlite3.connect(db_path.as_posix())
+    conn.executescript(
+        """
+        CREATE TABLE test_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT,
+            pr_id INTEGER,
+            commit_sha TEXT,
+            test_id TEXT,
+            suite TEXT,
+            status TEXT,
+            duration_ms INTEGER,
+            component TEXT,
+            file_hint TEXT,
+            ts TEXT
+        );
+        CREATE TABLE pr_files (pr_id INTEGER, path TEXT, status TEXT, component TEXT, PRIMARY KEY (pr_id, path));
+        INSERT INTO pr_files VALUES (1, 'src/a', 'added', 'core');
+        INSERT INTO test_events VALUES (1, 'r', 1, 'a', 'suite#t', 'suite', 'failed', 5, 'core', 'f', '2999-01-01');
+        INSERT INTO test_events VALUES (2, 'r', 2, 'b', 'suite#t', 'suite', 'skipped', 7, 'ui', '', '2999-01-01');
+        """
+    )
+    legacy_rows = conn.execute("SELECT * FROM test_events ORDER BY id").fetchall()
+    conn.commit()
+    conn.close()
+
+    storage = Storage(db_path.as_posix())
+    cur = storage.conn.cursor()
+    assert cur.execute("PRAGMA user_version").fetchone()[0] == 3
+    assert cur.execute("SELECT type FROM sqlite_master WHERE name = 'test_events'").fetchone()[0] == "view"
+    assert cur.execute("SELECT * FROM test_events ORDER BY id").fetchall() == legacy_rows
+    assert cur.execute("SELECT COUNT(*) FROM dim_test").fetchone()[0] == 1
+    assert storage.distinct_pairs(30) == [("core", "suite#t")]
+    assert storage.contingency_tables(30) == {("core", "suite#t"): (1, 0, 0, 1)}
+    storage.conn.close()
+
+    # Reopening an already-migrated database is a no-op.
+    storage = Storage(db_path.as_posix())
+    assert storage.export_stats()["events_total"] == 2
+    storage.conn.close()
+
+
+def test_adds_rollup_maximum_to_schema_2_databases(temp_dir: Path) -> None:
+    db_path = temp_dir / "db.sqlite"
+    conn = sqlite3.connect(db_path.as_posix())
+    conn.executescript(
+        """
+        CREATE TABLE test_event_days (
+            day TEXT, pr_id INTEGER, test_key INTEGER, component_key INTEGER,
+            runs INTEGER, failed INTEGER, duration_ms INTEGER, ts TEXT, failed_ts TEXT,
+            PRIMARY KEY (day, pr_id, test_key, component_key)
+        );
+        CREATE TABLE dim_test (id INTEGER PRIMARY KEY, name TEXT UNIQUE);
+        INSERT INTO dim_test VALUES (1, 'suite#t');
+        INSERT INTO test_event_days VALUES ('2999-01-01', 1, 1, NULL, 4, 0, 400, '2999-01-01', NULL);
+        PRAGMA user_version = 2;
+        """
+    )
+    conn.close()
+
+    storage = Storage(db_path.as_posix())
+    assert storage.conn.execute("PRAGMA user_version").fetchone()[0] == 3
+    # Old rollups report their mean as the maximum.
+    assert list(storage.duration_samples(30)) == [("2999-01-01", 1, "suite#t", None, 100.0, 4, 100.0)]
+    storage.conn.close()
@@ -1,6 +1,10 @@
+import os
 from datetime import datetime, UTC
+from pathlib import Path
 
-from codex_rules.storage import Storage
+import pytest
+
+from codex_rules.storage import InMemoryStorage, Storage
 
 
 DEFAULT_TS = datetime.now(UTC).isoformat()
@@ -94,3 +98,487 @@ def test_storage_records_and_queries(tmp_path):
     assert stats == {"events_total": 3, "events_failed": 2, "guidance_active": 0}
 
     store.conn.close()
+
+
+def test_contingency_tables_match_per_pair_contingency(tmp_path):
+    store = Storage(str(tmp_path / "rules.sqlite"))
+    touched = {1: "core", 2: "core", 3: "ui", 4: "core", 5: "ui", 6: "docs"}
+    for pr_id, component in touched.items():
+        store.record_pr(
+            pr_id=pr_id,
+            branch="",
+            base="",
+            labels=[],
+            files=[{"path": f"src/{pr_id}", "component": component}],
+        )
+    # PR 6 touched docs but has no events, so it is outside the universe.
+    for pr_id, status, component, test_id in [
+        (1, "failed", "core", "suite#a"),
+        (1, "failed", "core", "suite#b"),
+        (2, "failed", "core", "suite#a"),
+        (3, "failed", "ui", "suite#a"),
+        (4, "passed", "core", "suite#a"),
+        (5, "failed", "unknown", "suite#b"),
+        (7, "failed", "docs", "suite#c"),
+        (2, "failed", None, "suite#d"),  # no component recorded
+    ]:
+        store.record_test_event(**make_event(pr_id, status=status, component=component, test_id=test_id))
+
+    tables = store.contingency_tables(30)
+
+    assert (None, "suite#d") in tables
+    assert set(tables) == set(store.distinct_pairs(30))
+    for (component, test_id), counts in tables.items():
+        assert counts == store.contingency(component, test_id, 30)
+    store.conn.close()
+
+
+def test_contingency_tables_track_new_events_and_window_expiry(tmp_path, monkeypatch):
+    from datetime import timedelta
+
+    from codex_rules import storage as storage_module
+
+    now = datetime(2026, 1, 31, tzinfo=UTC)
+    monkeypatch.setattr(
+        storage_module, "_cutoff", lambda days: (now - timedelta(days=days)).isoformat()
+    )
+    store = Storage(str(tmp_path / "rules.sqlite"))
+
+    def fail(pr_id: int, component: str, days_ago: float) -> None:
+        event = make_event(pr_id, status="failed", component=component, test_id="suite#a")
+        store.record_test_event(**{**event, "ts": (now - timedelta(days=days_ago)).isoformat()})
+
+    for pr_id in (1, 2, 3):
+        store.record_pr(pr_id=pr_id, branch="", base="", labels=[], files=[{"path": "src/x", "component": "core"}])
+    fail(1, "core", 5)
+    fail(3, "ui", 1)
+    assert store.contingency_tables(7)[("core", "suite#a")] == (2, 1, 0, 0)
+
+    # New events and PRs update the materialized counters in place.
+    fail(2, "core", 0)
+    store.record_pr(pr_id=3, branch="", base="", labels=[], files=[{"path": "src/y", "component": "ui"}])
+    tables = store.contingency_tables(7)
+    assert tables[("core", "suite#a")] == store.contingency("core", "suite#a", 7) == (3, 0, 0, 0)
+
+    # Sliding the window forward decrements the events that expired.
+    now += timedelta(days=3)
+    tables = store.contingency_tables(7)
+    assert set(tables) == set(store.distinct_pairs(7))
+    for (component, test_id), counts in tables.items():
+        assert counts == store.contingency(component, test_id, 7)
+    assert tables[("core", "suite#a")] == (2, 1, 0, 0)
+    store.conn.close()
+
+
+def test_record_test_events_bulk_matches_single_inserts(tmp_path):
+    single = Storage(str(tmp_path / "single.sqlite"))
+    bulk = Storage(str(tmp_path / "bulk.sqlite"))
+    events = [
+        make_event(pr_id, status=status, component="core", test_id=f"suite#{pr_id % 3}")
+        for pr_id in range(1, 40)
+        for status in ("failed", "passed")
+    ]
+    for store in (single, bulk):
+        store.record_pr(pr_id=1, branch="", base="", labels=[], files=[{"path": "src/a", "component": "core"}])
+        store.contingency_tables(30)  # materialize before the events arrive
+    for event in events:
+        single.record_test_event(**event)
+    bulk.record_test_events(events)
+    bulk.record_test_events([])
+
+    assert bulk.export_stats() == single.export_stats()
+    assert bulk.contingency_tables(30) == single.contingency_tables(30)
+    assert not bulk.conn.in_transaction
+    single.conn.close()
+    bulk.conn.close()
+
+
+def test_write_queue_merges_spooled_batches_once(tmp_path):
+    store = Storage(str(tmp_path / "rules.sqlite"))
+    store.record_pr(pr_id=1, branch="", base="", labels=[], files=[{"path": "src/a", "component": "core"}])
+    queue = store._queue
+    spooled = [
+        queue._spool([make_event(pr_id, status="failed", component="core", test_id="t")])
+        for pr_id in (1, 2)
+    ]
+    # A batch whose committer died after COMMIT but before cleaning up.
+    store.conn.execute("INSERT INTO ingest_batches (batch_id) VALUES (?)", (spooled[1].stem,))
+
+    assert queue.submit([make_event(3, status="passed", component="core", test_id="t")]) == 3
+
+    assert store.export_stats()["events_total"] == 2
+    assert not any(path.exists() for path in spooled)
+    assert store.conn.execute("SELECT COUNT(*) FROM ingest_batches").fetchone()[0] == 0
+    store.conn.close()
+
+
+def test_concurrent_ingest_processes_lose_no_events(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    path = tmp_path / "rules.sqlite"
+    store = Storage(str(path))
+    store.record_pr(pr_id=1, branch="", base="", labels=[], files=[{"path": "src/a", "component": "core"}])
+    store.contingency_tables(30)  # counters are then maintained by every writer
+    script = (
+        "import sys\n"
+        "from datetime import datetime, UTC\n"
+        "from codex_rules.storage import Storage\n"
+        "store = Storage(sys.argv[1])\n"
+        "writer = int(sys.argv[2])\n"
+        "for batch in range(15):\n"
+        "    store.record_test_events(\n"
+        "        {'run_id': f'w{writer}-b{batch}', 'pr_id': writer * 100 + batch % 3,\n"
+        "         'commit_sha': '', 'test_id': f'suite#{n % 7}', 'suite': 'suite',\n"
+        "         'status': 'failed' if n % 5 == 0 else 'passed', 'duration_ms': n,\n"
+        "         'component': 'core', 'file_hint': '', 'ts': datetime.now(UTC).isoformat()}\n"
+        "        for n in range(40)\n"
+        "    )\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parents[1]))
+    procs = [
+        subprocess.Popen([sys.executable, "-c", script, str(path), str(writer)], env=env)
+        for writer in range(8)
+    ]
+    assert all(p.wait(timeout=120) == 0 for p in procs)
+
+    rows = store.conn.execute(
+        "SELECT run_id, COUNT(*) FROM test_events GROUP BY run_id"
+    ).fetchall()
+    assert len(rows) == 8 * 15
+    assert {n for _, n in rows} == {40}
+    assert not list(Path(f"{path}.queue").glob("*.json"))
+    tables = store.contingency_tables(30)
+    for (component, test_id), counts in tables.items():
+        assert counts == store.contingency(component, test_id, 30)
+    store.conn.close()
+
+
+def _replay(store, workload, now):
+    from datetime import timedelta
+
+    for pr in workload["prs"]:
+        files = [
+            {"path": f["path"], "status": f["status"], "component": f["path"].split("/")[1]}
+            for f in pr["files"]
+        ]
+        store.record_pr(pr_id=pr["pr_id"], branch="", base="", labels=[], files=files)
+        ts = (now - timedelta(days=pr["pr_id"] % 20)).isoformat()
+        store.record_test_events(
+            {
+                **make_event(pr["pr_id"], status=r["status"], component=r["file"].split("/")[1], test_id=r["test_id"]),
+                "ts": ts,
+            }
+            for r in pr["results"]
+        )
+
+
+def test_in_memory_storage_matches_sqlite_storage(tmp_path):
+    from codex_rules.bench import generate_workload
+    from codex_rules.correlate import compute_candidates
+    from codex_rules.guidance import create_guidance_entries
+
+    workload = generate_workload(120, 8, 24, noise=0.05, seed=3)
+    now = datetime.now(UTC)
+    sqlite_store = Storage(str(tmp_path / "rules.sqlite"))
+    memory_store = InMemoryStorage()
+    for store in (sqlite_store, memory_store):
+        _replay(store, workload, now)
+
+    for window in (7, 30):
+        assert sorted(memory_store.distinct_pairs(window)) == sorted(sqlite_store.distinct_pairs(window))
+        tables = memory_store.contingency_tables(window)
+        assert tables == sqlite_store.contingency_tables(window)
+        for (component, test_id), counts in tables.items():
+            assert memory_store.contingency(component, test_id, window) == counts
+    for pr_id in (1, 2, 3):
+        assert memory_store.get_components_for_pr(pr_id) == sorted(sqlite_store.get_components_for_pr(pr_id))
+
+    thresholds = {"min_occurrences": 2, "min_lift": 1.0, "flaky_threshold": 1.0}
+    stale = {"component": "comp007", "test_id": "tests/gone.py::test_case"}
+    for store in (sqlite_store, memory_store):
+        candidates = compute_candidates(store, thresholds)
+        stale_rule = {**candidates[0], **stale}
+        for rule in create_guidance_entries([*candidates, stale_rule], {}):
+            store.upsert_guidance(rule)
+    assert memory_store.get_active_guidance() == sqlite_store.get_active_guidance()
+    assert memory_store.get_active_guidance_by_component(["comp000"]) == (
+        sqlite_store.get_active_guidance_by_component(["comp000"])
+    )
+    pruned = [store.prune_guidance(7, None) for store in (sqlite_store, memory_store)]
+    assert pruned[0]["deactivated"] == pruned[1]["deactivated"] == 1
+    assert memory_store.get_active_guidance() == sqlite_store.get_active_guidance()
+    assert memory_store.export_stats() == sqlite_store.export_stats()
+    sqlite_store.conn.close()
+
+
+def test_in_memory_storage_snapshot_round_trip(tmp_path):
+    import pytest
+
+    from codex_rules.bench import generate_workload
+
+    store = InMemoryStorage()
+    _replay(store, generate_workload(40, 5, 10, seed=1), datetime.now(UTC))
+    store.upsert_guidance(
+        {
+            "rule_id": "comp000->t",
+            "component": "comp000",
+            "test_id": "t",
+            "support_prs": 3,
+            "confidence": 0.5,
+            "baseline": 0.1,
+            "lift": 5.0,
+            "p_value": 0.01,
+            "template": "tpl",
+            "command": "pytest",
+        }
+    )
+    path = tmp_path / "cache" / "rules.snapshot"
+
+    store.snapshot(path)
+    restored = InMemoryStorage.restore(path)
+
+    assert restored.contingency_tables(30) == store.contingency_tables(30)
+    assert restored.get_active_guidance() == store.get_active_guidance()
+    assert restored.export_stats() == store.export_stats()
+    assert restored.get_components_for_pr(1) == store.get_components_for_pr(1)
+    # Interned strings and columnar events keep the file small.
+    assert path.stat().st_size < 40 * 10 * 20
+
+    path.write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError):
+        InMemoryStorage.restore(path)
+
+
+def test_compact_rolls_up_and_expires_without_changing_analysis(tmp_path, monkeypatch):
+    from datetime import timedelta
+
+    from codex_rules import storage as storage_module
+    from codex_rules.bench import generate_workload
+    from codex_rules.correlate import compute_candidates
+
+    now = datetime(2026, 1, 31, 12, tzinfo=UTC)
+    monkeypatch.setattr(
+        storage_module, "_cutoff", lambda days: (now - timedelta(days=days)).isoformat()
+    )
+    store = Storage(str(tmp_path / "rules.sqlite"))
+    for pr in generate_workload(90, 6, 12, noise=0.05, seed=5)["prs"]:
+        files = [{"path": f["path"], "component": f["path"].split("/")[1]} for f in pr["files"]]
+        store.record_pr(pr_id=pr["pr_id"], branch="", base="", labels=[], files=files)
+        for hours in (0, 5):  # two runs per PR on the same day
+            ts = (now - timedelta(days=pr["pr_id"] % 45, hours=hours)).isoformat()
+            store.record_test_events(
+                {
+                    **make_event(pr["pr_id"], status=r["status"], component=r["file"].split("/")[1], test_id=r["test_id"]),
+                    "ts": ts,
+                }
+                for r in pr["results"]
+            )
+    thresholds = {"min_occurrences": 2, "min_lift": 1.0, "flaky_threshold": 1.0}
+
+    def analysis():
+        return [
+            (
+                store.contingency_tables(window),
+                sorted(store.distinct_pairs(window)),
+                {p: store.contingency(*p, window) for p in store.distinct_pairs(window)},
+                compute_candidates(store, {**thresholds, "window_days": window}),
+            )
+            for window in (7, 30)
+        ]
+
+    before = analysis()
+    horizon = (now - timedelta(days=30)).isoformat()
+    kept = store.conn.execute(
+        "SELECT COUNT(*) FROM test_event_rows WHERE ts >= ?", (horizon,)
+    ).fetchone()[0]
+
+    report = store.compact(raw_days=3, window_days=7)
+
+    assert analysis() == before
+    assert report["compacted"] > report["rollup_rows"] > 0
+    assert report["expired"] > 0
+    assert report["bytes_after"] < report["bytes_before"]
+    # The 30-day window analysed above is the largest one, so it sets the horizon.
+    assert store.conn.execute("SELECT MIN(ts) FROM test_event_days").fetchone()[0] >= horizon
+    raw_from = (now - timedelta(days=3)).isoformat()[:10]
+    assert store.conn.execute("SELECT MIN(ts) FROM test_event_rows").fetchone()[0] >= raw_from
+    assert store.export_stats()["events_total"] == kept
+    assert store.compact(raw_days=3, window_days=7)["compacted"] == 0
+
+    # Windows keep sliding consistently over rolled-up days.
+    now += timedelta(days=2)
+    tables = store.contingency_tables(7)
+    assert set(tables) == set(store.distinct_pairs(7))
+    for (component, test_id), counts in tables.items():
+        assert counts == store.contingency(component, test_id, 7)
+    store.conn.close()
+
+
+def test_cli_compact_reports_reclaimed_space(tmp_path, monkeypatch, capsys):
+    import json
+
+    from codex_rules import cli
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".codex").mkdir()
+    (tmp_path / ".codex" / "rules.yml").write_text(
+        json.dumps({"storage": {"sqlite_path": "rules.sqlite"}}), encoding="utf-8"
+    )
+    store = Storage("rules.sqlite")
+    store.record_test_event(**{**make_event(1, status="failed", component="core", test_id="t"), "ts": "2000-01-01T00:00:00+00:00"})
+    store.conn.close()
+
+    cli.main(["compact", "--raw-days", "1"])
+
+    out = capsys.readouterr().out
+    assert "expired 1 rows" in out
+    assert "reclaimed" in out
+
+
+def test_cli_memory_backend_persists_through_snapshot(tmp_path, monkeypatch):
+    import json
+
+    from codex_rules import cli
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".codex").mkdir()
+    (tmp_path / ".codex" / "rules.yml").write_text(
+        json.dumps({"storage": {"sqlite_path": "rules.sqlite", "backend": "memory"}}),
+        encoding="utf-8",
+    )
+    files = tmp_path / "files.json"
+    files.write_text(json.dumps([{"path": "src/a.py", "status": "added"}]), encoding="utf-8")
+
+    cli.main(["record-pr", "--pr", "7", "--files-json", str(files)])
+    cli.main(["record-pr", "--pr", "8", "--files-json", str(files)])
+
+    assert not (tmp_path / "rules.sqlite").exists()
+    restored = InMemoryStorage.restore(tmp_path / cli.DEFAULT_SNAPSHOT_PATH)
+    assert set(restored._prs) == {7, 8}
+
+    # Read-only commands do not rewrite the snapshot.
+    snapshot = tmp_path / cli.DEFAULT_SNAPSHOT_PATH
+    os.utime(snapshot, ns=(0, 0))
+    cli.main(["export", "--what", "stats", "--out", str(tmp_path / "stats.json")])
+    cli.main(["durations"])
+    assert snapshot.stat().st_mtime_ns == 0
+    cli.main(["record-pr", "--pr", "9", "--files-json", str(files)])
+    assert snapshot.stat().st_mtime_ns > 0
+
+
+def test_cli_memory_backend_saves_snapshot_when_a_command_exits(tmp_path, monkeypatch):
+    import json
+
+    from codex_rules import cli
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".codex").mkdir()
+    (tmp_path / ".codex" / "rules.yml").write_text(
+        json.dumps({"storage": {"sqlite_path": "rules.sqlite", "backend": "memory"}}),
+        encoding="utf-8",
+    )
+    (tmp_path / ".codex" / "components.yml").write_text(
+        json.dumps({"components": {"core": {"globs": ["src/**"]}}}), encoding="utf-8"
+    )
+    seeded = InMemoryStorage()
+    seeded.upsert_guidance(_rule("r1", "core", 5.0))
+    seeded.snapshot(tmp_path / cli.DEFAULT_SNAPSHOT_PATH)
+    files = tmp_path / "files.json"
+    files.write_text(json.dumps([{"path": "src/a.py", "status": "modified"}]), encoding="utf-8")
+    results = tmp_path / "results.xml"
+    results.write_text(
+        '<testsuite name="s"><testcase classname="s" name="t" time="0.1"/></testsuite>',
+        encoding="utf-8",
+    )
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("echo nothing\n", encoding="utf-8")
+
+    # The required command of rule r1 did not run: the gate exits 2 after
+    # the PR and its test events were recorded.
+    with pytest.raises(SystemExit) as exc:
+        cli.main(
+            [
+                "run-workflow", "--pr", "3", "--files-json", str(files),
+                "--results-path", str(results), "--manifest", str(manifest),
+                "--fail-on-violation",
+            ]
+        )
+    assert exc.value.code == 2
+
+    restored = InMemoryStorage.restore(tmp_path / cli.DEFAULT_SNAPSHOT_PATH)
+    assert restored.get_components_for_pr(3) == ["core"]
+    assert restored.export_stats()["events_total"] == 1
+
+
+def _rule(rule_id: str, component: str, lift: float | None) -> dict:
+    return {
+        "rule_id": rule_id,
+        "component": component,
+        "test_id": f"suite#{rule_id}",
+        "support_prs": 3,
+        "confidence": 0.5,
+        "baseline": 0.1,
+        "lift": lift,
+        "p_value": 0.01,
+        "template": "tpl",
+        "command": f"pytest -k {rule_id}",
+    }
+
+
+def test_in_memory_guidance_orders_null_lift_last_like_sqlite(tmp_path):
+    sqlite_store = Storage(str(tmp_path / "rules.sqlite"))
+    memory_store = InMemoryStorage()
+    rules = [_rule("r1", "core", None), _rule("r2", "core", 2.0), _rule("r3", "api", 5.0), _rule("r4", "core", 7.0)]
+    for store in (sqlite_store, memory_store):
+        for rule in rules:
+            store.upsert_guidance(rule)
+
+    expected = ["r3", "r4", "r2", "r1"]
+    assert [g["rule_id"] for g in sqlite_store.get_active_guidance()] == expected
+    assert memory_store.get_active_guidance() == sqlite_store.get_active_guidance()
+    sqlite_store.conn.close()
+
+
+def test_guidance_snapshot_is_cached_until_guidance_changes(tmp_path):
+    from codex_rules import storage as storage_module
+
+    path = str(tmp_path / "rules.sqlite")
+    writer = Storage(path)
+    writer.upsert_guidance(_rule("a", "core", 2.0))
+    writer.upsert_guidance(_rule("b", "core", 5.0))
+    writer.upsert_guidance(_rule("c", "ui", 3.0))
+
+    reader = Storage(path)
+    assert [r["rule_id"] for r in reader.get_active_guidance()] == ["b", "a", "c"]
+    snapshot = storage_module._GUIDANCE_SNAPSHOTS[str((tmp_path / "rules.sqlite").resolve())]
+
+    # A second connection in the same process reuses the snapshot.
+    again = Storage(path)
+    statements = []
+    again.conn.set_trace_callback(statements.append)
+    assert again.get_active_guidance_by_component(["ui", "core"]) == [
+        {"component": "core", "test_id": "suite#a", "command": "pytest -k a"},
+        {"component": "core", "test_id": "suite#b", "command": "pytest -k b"},
+        {"component": "ui", "test_id": "suite#c", "command": "pytest -k c"},
+    ]
+    assert not any("FROM guidance\n" in s or "FROM guidance " in s for s in statements)
+    assert storage_module._GUIDANCE_SNAPSHOTS[str((tmp_path / "rules.sqlite").resolve())] is snapshot
+
+    # Writes from any connection invalidate it.
+    writer.prune_guidance(30, None)
+    assert again.get_active_guidance() == []
+    writer.upsert_guidance(_rule("d", "docs", 4.0))
+    assert again.get_active_guidance_by_component(["docs"]) == [
+        {"component": "docs", "test_id": "suite#d", "command": "pytest -k d"}
+    ]
+
+    # A database recreated at the same path is not served from the cache.
+    for store in (writer, reader, again):
+        store.conn.close()
+    for suffix in ("", "-wal", "-shm"):
+        Path(path + suffix).unlink(missing_ok=True)
+    fresh = Storage(path)
+    assert fresh.get_active_guidance() == []
+    fresh.conn.close()
@@ -1,9 +1,15 @@
 import json
+import os
+import subprocess
+import sys
+from pathlib import Path
 
 import pytest
 
 from codex_rules import telemetry
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
 
 @pytest.fixture
 def telemetry_cwd(tmp_path, monkeypatch):
@@ -80,3 +86,97 @@ def test_record_telemetry_entry_updates_summary(telemetry_cwd):
     assert summary["total_entries"] == 1
     assert summary["srs_omitted_count"] == 0
     assert summary["srs_ids"] == ["REQ-1", "REQ-2"]
+
+
+def test_append_migrates_legacy_json_and_appends_lines(telemetry_cwd):
+    legacy = [{"modules_inspected": ["a"], "checks_skipped": [], "srs_ids": []}]
+    telemetry.TELEMETRY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    telemetry.TELEMETRY_PATH.write_text(
+        json.dumps({"entries": legacy}, indent=2), encoding="utf-8"
+    )
+
+    for i in range(3):
+        telemetry.append_telemetry_entry(
+            {"modules_inspected": [f"m{i}"], "checks_skipped": []}
+        )
+
+    text = telemetry.TELEMETRY_PATH.read_text(encoding="utf-8")
+    entries = json.loads(text)["entries"]
+    assert [e["modules_inspected"] for e in entries] == [["a"], ["m0"], ["m1"], ["m2"]]
+    # One entry per line between the envelope lines.
+    assert len(text.splitlines()) == len(entries) + 2
+
+
+def test_load_telemetry_salvages_torn_append(telemetry_cwd, capsys):
+    for i in range(2):
+        telemetry.append_telemetry_entry(
+            {"modules_inspected": [f"m{i}"], "checks_skipped": []}
+        )
+    raw = telemetry.TELEMETRY_PATH.read_bytes()
+    telemetry.TELEMETRY_PATH.write_bytes(raw[:-4] + b',\n{"modules_insp')
+
+    entries = telemetry.load_telemetry()
+
+    assert [e["modules_inspected"] for e in entries] == [["m0"], ["m1"]]
+    assert "failed to load telemetry" in capsys.readouterr().err.lower()
+
+
+def test_record_telemetry_entry_folds_summary_incrementally(
+    telemetry_cwd, monkeypatch
+):
+    telemetry.record_telemetry_entry(
+        {"modules_inspected": ["cli"], "checks_skipped": []}, srs_ids=["REQ-1"]
+    )
+
+    def fail():
+        raise AssertionError("history should not be re-read")
+
+    with monkeypatch.context() as m:
+        m.setattr(telemetry, "load_telemetry", fail)
+        telemetry.record_telemetry_entry(
+            {"modules_inspected": ["cli"], "checks_skipped": []}
+        )
+        telemetry.record_telemetry_entry(
+            {"modules_inspected": ["cli"], "checks_skipped": []}, srs_ids=["REQ-0"]
+        )
+
+    summary = json.loads(telemetry.SUMMARY_PATH.read_text(encoding="utf-8"))
+    assert summary["total_entries"] == 3
+    assert summary["srs_omitted_count"] == 1
+    assert summary["srs_ids"] == ["REQ-0", "REQ-1"]
+    assert len(telemetry.load_telemetry()) == 3
+
+
+def test_record_telemetry_entry_rebuilds_stale_summary(telemetry_cwd):
+    telemetry.record_telemetry_entry({"modules_inspected": ["cli"], "checks_skipped": []})
+    # A writer that bypasses the summary leaves the sidecar behind.
+    telemetry.append_telemetry_entry({"modules_inspected": ["cli"], "checks_skipped": []})
+    telemetry.record_telemetry_entry(
+        {"modules_inspected": ["cli"], "checks_skipped": []}, srs_ids=["REQ-9"]
+    )
+
+    summary = json.loads(telemetry.SUMMARY_PATH.read_text(encoding="utf-8"))
+    assert summary["total_entries"] == 3
+    assert summary["srs_omitted_count"] == 2
+
+
+def test_concurrent_writers_do_not_lose_entries(telemetry_cwd):
+    script = (
+        "import sys\n"
+        "from codex_rules import telemetry\n"
+        "for i in range(20):\n"
+        "    telemetry.record_telemetry_entry(\n"
+        "        {'modules_inspected': [sys.argv[1]], 'checks_skipped': []}\n"
+        "    )\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    procs = [
+        subprocess.Popen([sys.executable, "-c", script, f"w{n}"], env=env)
+        for n in range(4)
+    ]
+    assert all(p.wait(timeout=60) == 0 for p in procs)
+
+    entries = json.loads(telemetry.TELEMETRY_PATH.read_text(encoding="utf-8"))["entries"]
+    assert len(entries) == 80
+    summary = json.loads(telemetry.SUMMARY_PATH.read_text(encoding="utf-8"))
+    assert summary["total_entries"] == 80
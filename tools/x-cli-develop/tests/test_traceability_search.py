@@ -1,3 +1,4 @@
+import os
 import time
 from pathlib import Path
 import importlib.util
@@ -93,3 +94,97 @@ def test_respects_gitignore(tmp_path):
     run(["git", "commit", "-m", "init"], cwd=repo)
     result = _tests_for(repo, REQ)
     assert result == ["tests/keep.txt"]
+
+
+def test_index_maps_every_requirement_in_one_pass(tmp_path):
+    repo = tmp_path / "repo"
+    tests_dir = repo / "tests"
+    tests_dir.mkdir(parents=True)
+    (tests_dir / "a.txt").write_text(f"{REQ} FGC-REQ-CLI-002 {REQ}\n", encoding="utf-8")
+    (tests_dir / "b.txt").write_text("FGC-REQ-CLI-002\n", encoding="utf-8")
+    run(["git", "init"], cwd=repo)
+    run(["git", "config", "user.email", "test@example.com"], cwd=repo)
+    run(["git", "config", "user.name", "Tester"], cwd=repo)
+    run(["git", "add", "."], cwd=repo)
+    run(["git", "commit", "-m", "init", "-m", f"Covers {REQ}"], cwd=repo)
+    run(["git", "commit", "--allow-empty", "-m", f"{REQ} and FGC-REQ-CLI-002"], cwd=repo)
+    shas = run(["git", "log", "--format=%H"], cwd=repo).stdout.split()
+
+    assert gt._index_tests(repo) == {
+        REQ: ["tests/a.txt"],
+        "FGC-REQ-CLI-002": ["tests/a.txt", "tests/b.txt"],
+    }
+    assert gt._index_commits(repo) == {REQ: shas, "FGC-REQ-CLI-002": shas[:1]}
+    assert gt._index_commits(tmp_path / "missing") == {}
+
+
+def test_cache_rereads_only_changed_files_and_new_commits(tmp_path):
+    repo = tmp_path / "repo"
+    tests_dir = repo / "tests"
+    tests_dir.mkdir(parents=True)
+    (tests_dir / "same.txt").write_text(f"{REQ}\n", encoding="utf-8")
+    (tests_dir / "edited.txt").write_text(f"{REQ}\n", encoding="utf-8")
+    run(["git", "init"], cwd=repo)
+    run(["git", "config", "user.email", "test@example.com"], cwd=repo)
+    run(["git", "config", "user.name", "Tester"], cwd=repo)
+    run(["git", "add", "."], cwd=repo)
+    run(["git", "commit", "-m", f"init {REQ}"], cwd=repo)
+
+    cache = {"version": gt.CACHE_VERSION}
+    file_ids = gt._FileIds(repo)
+    gt._index_tests(repo, file_ids=file_ids)
+    gt._index_commits(repo, cache)
+    cache["files"] = file_ids.files
+    # Poison the cached entries: only re-read files and new commits can undo it.
+    cache["files"]["tests/same.txt"]["ids"] = ["FGC-REQ-OLD-001"]
+    cache["files"]["tests/edited.txt"]["ids"] = ["FGC-REQ-OLD-001"]
+    cache["commits"]["ids"] = {"FGC-REQ-OLD-001": ["0" * 40]}
+
+    (tests_dir / "edited.txt").write_text("// FGC-REQ-NEW-002\n", encoding="utf-8")
+    run(["git", "commit", "--allow-empty", "-m", "FGC-REQ-NEW-002"], cwd=repo)
+    head = run(["git", "rev-parse", "HEAD"], cwd=repo).stdout.strip()
+
+    file_ids = gt._FileIds(repo, cache["files"])
+    assert gt._index_tests(repo, file_ids=file_ids) == {
+        "FGC-REQ-OLD-001": ["tests/same.txt"],
+        "FGC-REQ-NEW-002": ["tests/edited.txt"],
+    }
+    assert gt._index_commits(repo, cache) == {
+        "FGC-REQ-NEW-002": [head],
+        "FGC-REQ-OLD-001": ["0" * 40],
+    }
+    assert cache["commits"]["head"] == head
+
+    # A rewritten history is rescanned in full.
+    run(["git", "commit", "--amend", "--allow-empty", "-m", "reworded"], cwd=repo)
+    init = run(["git", "rev-parse", "HEAD~1"], cwd=repo).stdout.strip()
+    assert gt._index_commits(repo, cache) == {REQ: [init]}
+
+
+def test_cache_keeps_git_log_order_across_merges(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    run(["git", "init", "-b", "main"], cwd=repo)
+    run(["git", "config", "user.email", "test@example.com"], cwd=repo)
+    run(["git", "config", "user.name", "Tester"], cwd=repo)
+
+    def commit(message: str, date: str) -> None:
+        env = dict(os.environ, GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+        run(["git", "commit", "--allow-empty", "-m", message], cwd=repo, env=env)
+
+    commit(f"init {REQ}", "2024-01-01T00:00:00Z")
+    run(["git", "branch", "side"], cwd=repo)
+    run(["git", "checkout", "side"], cwd=repo)
+    commit(f"side {REQ}", "2024-01-02T00:00:00Z")
+    run(["git", "checkout", "main"], cwd=repo)
+    commit(f"main {REQ}", "2024-01-03T00:00:00Z")
+    cache = {"version": gt.CACHE_VERSION}
+    gt._index_commits(repo, cache)
+
+    # The merge brings in a commit older than the cached HEAD.
+    date = "2024-01-04T00:00:00Z"
+    env = dict(os.environ, GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+    run(["git", "merge", "--no-ff", "-m", "merge side", "side"], cwd=repo, env=env)
+    assert gt._index_commits(repo, cache) == gt._index_commits(repo)
+    log = run(["git", "log", "--format=%H", f"--grep={REQ}"], cwd=repo).stdout.split()
+    assert cache["commits"]["ids"][REQ] == log
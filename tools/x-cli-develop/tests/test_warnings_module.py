@@ -1,4 +1,4 @@
-from codex_rules.warnings import build_warnings
+from codex_rules.warnings import build_warnings, index_guidance
 
 
 def test_build_warnings_matches_components():
@@ -13,3 +13,21 @@ def test_build_warnings_matches_components():
     assert "codex-rules" in warnings[0]
     assert "dotnet test" in warnings[0]
     assert "pytest" in warnings[1]
+
+
+def test_build_warnings_accepts_prebuilt_index_and_keeps_order():
+    guidance = [
+        {"component": "api", "command": "pytest api", "test_id": "A"},
+        {"component": "cli", "command": "dotnet test", "test_id": "C"},
+        {"component": "api", "command": "pytest contract", "test_id": "B"},
+    ]
+    index = index_guidance(guidance)
+
+    assert list(index) == ["api", "cli"]
+    expected = build_warnings(["api", "cli"], guidance)
+    assert build_warnings(["api", "cli"], index) == expected
+    assert [w.split("Run: ")[1].split("  ")[0] for w in expected] == [
+        "pytest api",
+        "pytest contract",
+        "dotnet test",
+    ]